@@ -10,8 +10,9 @@ setup(
     author="Hannes Kneiding",
     author_email="hannes.kneiding@outlook.com",
     license="MIT",
-    python_requires=">=3.0",
+    python_requires=">=3.9",
     install_requires=[],
+    extras_require={"numpy": ["numpy"], "scipy": ["numpy", "scipy"]},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
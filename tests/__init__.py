@@ -1,3 +1,6 @@
 SEROTONIN_XYZ = "./tests/files/serotonin.xyz"
 SEROTONIN_XTB_STDOUT = "./tests/files/serotonin.xtb.stdout"
 SEROTONIN_STDA_STDOUT = "./tests/files/serotonin.stda.stdout"
+SEROTONIN_XTB_SIDECARS = "./tests/files/serotonin_sidecars"
+WATER_HESSIAN_FILES = "./tests/files/water_hessian"
+WATER_GRADIENT_FILES = "./tests/files/water_gradient"
@@ -0,0 +1,101 @@
+import asyncio
+import unittest
+from parameterized import parameterized
+
+from . import SEROTONIN_XYZ
+from uxtbpy.file_handler import FileHandler
+from uxtbpy.async_stda_runner import AsyncStdaRunner
+from uxtbpy.subprocess_error import SubprocessError
+
+
+class TestAsyncStdaRunner(unittest.IsolatedAsyncioTestCase):
+
+    @parameterized.expand(
+        [
+            [SEROTONIN_XYZ, dict],
+        ]
+    )
+    async def test_run_from_file(self, file_path, expected_output_format):
+
+        stda_runner = AsyncStdaRunner()
+        self.assertEqual(
+            type(await stda_runner.run_from_file(file_path)), expected_output_format
+        )
+
+    @parameterized.expand(
+        [
+            ["./this/path/does/not/exist", FileNotFoundError],
+        ]
+    )
+    async def test_run_from_file_with_missing_file(self, file_path, expected_error):
+
+        stda_runner = AsyncStdaRunner()
+        with self.assertRaises(expected_error):
+            await stda_runner.run_from_file(file_path)
+
+    @parameterized.expand(
+        [
+            ["O 0 0 0\nO 0 0 1", SubprocessError],
+            ["\n\nO 0 0 0\nO 0 0 1", SubprocessError],
+            ["2\n\nO 0 0 0\nO 0 0", SubprocessError],
+        ]
+    )
+    async def test_run_from_xyz_with_invalid_input(self, input, expected_error):
+
+        stda_runner = AsyncStdaRunner()
+        with self.assertRaises(expected_error):
+            await stda_runner.run_from_xyz(input)
+
+    @parameterized.expand(
+        [
+            [
+                [FileHandler.read_file(SEROTONIN_XYZ), "O 0 0 0\nO 0 0 1"],
+                [dict, None],
+                [None, SubprocessError],
+            ],
+        ]
+    )
+    async def test_run_batch(
+        self, structures, expected_output_formats, expected_errors
+    ):
+
+        stda_runner = AsyncStdaRunner(max_concurrency=2)
+        results = await stda_runner.run_batch(structures)
+
+        self.assertEqual(
+            [result.index for result in results], list(range(len(structures)))
+        )
+        for result, expected_output_format, expected_error in zip(
+            results, expected_output_formats, expected_errors
+        ):
+            if expected_error is None:
+                self.assertEqual(type(result.output), expected_output_format)
+            else:
+                self.assertIsInstance(result.error, expected_error)
+
+    @parameterized.expand(
+        [
+            [[FileHandler.read_file(SEROTONIN_XYZ)] * 3],
+        ]
+    )
+    async def test_iter_batch(self, structures):
+
+        stda_runner = AsyncStdaRunner(max_concurrency=2)
+        indices = [result.index async for result in stda_runner.iter_batch(structures)]
+
+        self.assertEqual(sorted(indices), list(range(len(structures))))
+
+    @parameterized.expand(
+        [
+            [FileHandler.read_file(SEROTONIN_XYZ)],
+        ]
+    )
+    async def test_run_from_xyz_cancellation(self, xyz):
+
+        stda_runner = AsyncStdaRunner()
+        task = asyncio.ensure_future(stda_runner.run_from_xyz(xyz))
+        await asyncio.sleep(0)
+        task.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await task
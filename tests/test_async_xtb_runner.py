@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import unittest
+from parameterized import parameterized
+
+from . import SEROTONIN_XYZ
+from uxtbpy.file_handler import FileHandler
+from uxtbpy import async_xtb_runner
+from uxtbpy.async_xtb_runner import AsyncXtbRunner
+from uxtbpy.xtb_output_parser import XtbOutputParser
+from uxtbpy.subprocess_error import SubprocessError
+
+
+class TestAsyncXtbRunner(unittest.IsolatedAsyncioTestCase):
+
+    @parameterized.expand(
+        [
+            [SEROTONIN_XYZ, dict],
+        ]
+    )
+    async def test_run_from_file(self, file_path, expected_output_format):
+
+        xtb_runner = AsyncXtbRunner()
+        self.assertEqual(
+            type(await xtb_runner.run_from_file(file_path)), expected_output_format
+        )
+
+    @parameterized.expand(
+        [
+            ["./this/path/does/not/exist", FileNotFoundError],
+        ]
+    )
+    async def test_run_from_file_with_missing_file(self, file_path, expected_error):
+
+        xtb_runner = AsyncXtbRunner()
+        with self.assertRaises(expected_error):
+            await xtb_runner.run_from_file(file_path)
+
+    @parameterized.expand(
+        [
+            ["O 0 0 0\nO 0 0 1", SubprocessError],
+            ["\n\nO 0 0 0\nO 0 0 1", SubprocessError],
+            ["2\n\nO 0 0 0\nO 0 0", SubprocessError],
+        ]
+    )
+    async def test_run_from_xyz_with_invalid_input(self, input, expected_error):
+
+        xtb_runner = AsyncXtbRunner()
+        with self.assertRaises(expected_error):
+            await xtb_runner.run_from_xyz(input)
+
+    @parameterized.expand(
+        [
+            [
+                [FileHandler.read_file(SEROTONIN_XYZ), "O 0 0 0\nO 0 0 1"],
+                [dict, None],
+                [None, SubprocessError],
+            ],
+        ]
+    )
+    async def test_run_batch(
+        self, structures, expected_output_formats, expected_errors
+    ):
+
+        xtb_runner = AsyncXtbRunner(max_concurrency=2)
+        results = await xtb_runner.run_batch(structures)
+
+        self.assertEqual(
+            [result.index for result in results], list(range(len(structures)))
+        )
+        for result, expected_output_format, expected_error in zip(
+            results, expected_output_formats, expected_errors
+        ):
+            if expected_error is None:
+                self.assertEqual(type(result.output), expected_output_format)
+            else:
+                self.assertIsInstance(result.error, expected_error)
+
+    @parameterized.expand(
+        [
+            [[FileHandler.read_file(SEROTONIN_XYZ)] * 3],
+        ]
+    )
+    async def test_iter_batch(self, structures):
+
+        xtb_runner = AsyncXtbRunner(max_concurrency=2)
+        indices = [result.index async for result in xtb_runner.iter_batch(structures)]
+
+        self.assertEqual(sorted(indices), list(range(len(structures))))
+
+    @parameterized.expand(
+        [
+            [FileHandler.read_file(SEROTONIN_XYZ)],
+        ]
+    )
+    async def test_run_from_xyz_cancellation(self, xyz):
+
+        xtb_runner = AsyncXtbRunner()
+        task = asyncio.ensure_future(xtb_runner.run_from_xyz(xyz))
+        await asyncio.sleep(0)
+        task.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+    @parameterized.expand([[FileHandler.read_file(SEROTONIN_XYZ)]])
+    async def test_run_from_xyz_parses_in_worker_thread(self, xyz):
+
+        parsing_threads = []
+
+        class RecordingParser(XtbOutputParser):
+            def parse_file(self, file_path, fields=None):
+                parsing_threads.append(threading.get_ident())
+                return super().parse_file(file_path, fields=fields)
+
+        async_xtb_runner.XtbOutputParser = RecordingParser
+        try:
+            result = await AsyncXtbRunner().run_from_xyz(xyz, fields=["energy"])
+        finally:
+            async_xtb_runner.XtbOutputParser = XtbOutputParser
+
+        self.assertIn("energy", result)
+        self.assertEqual(len(parsing_threads), 1)
+        self.assertNotEqual(parsing_threads[0], threading.get_ident())
@@ -0,0 +1,64 @@
+import time
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from parameterized import parameterized
+
+from uxtbpy.core_scheduler import CoreScheduler
+
+
+class TestCoreScheduler(unittest.TestCase):
+
+    @parameterized.expand(
+        [
+            [8, 2, None, 4, "2"],
+            [8, 3, 1, 2, "1"],
+            [2, 4, None, 1, "2"],
+        ]
+    )
+    def test_reserve(
+        self, total_cores, threads_per_job, threads, expected_max_jobs, expected_threads
+    ):
+
+        scheduler = CoreScheduler(
+            total_cores=total_cores, threads_per_job=threads_per_job
+        )
+        self.assertEqual(scheduler.max_jobs, expected_max_jobs)
+
+        with scheduler.reserve(threads) as environment:
+            self.assertEqual(environment["OMP_NUM_THREADS"], expected_threads)
+            self.assertEqual(environment["MKL_NUM_THREADS"], expected_threads)
+            self.assertEqual(environment["OMP_STACKSIZE"], "4G")
+            self.assertEqual(scheduler.free_cores, total_cores - int(expected_threads))
+
+        self.assertEqual(scheduler.free_cores, total_cores)
+
+    @parameterized.expand([[4, 2, 16]])
+    def test_reserve_respects_budget(self, total_cores, threads_per_job, n_jobs):
+
+        scheduler = CoreScheduler(
+            total_cores=total_cores, threads_per_job=threads_per_job
+        )
+        lock = threading.Lock()
+        used_cores = [0]
+        peak_cores = [0]
+
+        def job():
+            with scheduler.reserve():
+                with lock:
+                    used_cores[0] += threads_per_job
+                    peak_cores[0] = max(peak_cores[0], used_cores[0])
+                time.sleep(0.01)
+                with lock:
+                    used_cores[0] -= threads_per_job
+
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            list(executor.map(lambda _: job(), range(n_jobs)))
+
+        self.assertLessEqual(peak_cores[0], total_cores)
+        self.assertEqual(scheduler.free_cores, total_cores)
+
+    @parameterized.expand([[-1, 1], [4, 0]])
+    def test_invalid_budget(self, total_cores, threads_per_job):
+
+        self.assertRaises(ValueError, CoreScheduler, total_cores, threads_per_job)
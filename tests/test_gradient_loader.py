@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+import unittest
+from parameterized import parameterized
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from . import WATER_GRADIENT_FILES
+from uxtbpy.gradient_loader import GradientLoader
+
+
+@unittest.skipIf(np is None, "NumPy is not installed.")
+class TestGradientLoader(unittest.TestCase):
+
+    @parameterized.expand(
+        [
+            [
+                os.path.join(WATER_GRADIENT_FILES, "gradient"),
+                -5.07054421356,
+                [2.3451274718421e-04, 0.0, -2.3065361406170e-04],
+            ]
+        ]
+    )
+    def test_load_gradient(self, file_path, expected_energy, expected_row):
+
+        energy, gradient = GradientLoader.load_gradient(file_path)
+        self.assertEqual(energy, expected_energy)
+        self.assertEqual(gradient.shape, (3, 3))
+        self.assertEqual(gradient.dtype, np.float64)
+        self.assertEqual(gradient[1].tolist(), expected_row)
+
+    @parameterized.expand(
+        [[os.path.join(WATER_GRADIENT_FILES, "energy"), -5.070544213562]]
+    )
+    def test_load_energy(self, file_path, expected_energy):
+
+        self.assertEqual(GradientLoader.load_energy(file_path), expected_energy)
+
+    @parameterized.expand(
+        [
+            [
+                os.path.join(WATER_GRADIENT_FILES, "xtbin.engrad"),
+                os.path.join(WATER_GRADIENT_FILES, "gradient"),
+            ]
+        ]
+    )
+    def test_load_engrad(self, file_path, gradient_file_path):
+
+        energy, gradient = GradientLoader.load_engrad(file_path)
+        expected_energy, expected_gradient = GradientLoader.load_gradient(
+            gradient_file_path
+        )
+        self.assertAlmostEqual(energy, expected_energy, places=10)
+        self.assertTrue(np.allclose(gradient, expected_gradient, atol=1e-12))
+
+    @parameterized.expand(
+        [
+            [None, ["energy", "gradient"]],
+            [["energy", "homo_energy"], ["energy"]],
+            [["homo_energy"], []],
+        ]
+    )
+    def test_load(self, fields, expected_fields):
+
+        result = GradientLoader().load(WATER_GRADIENT_FILES, fields=fields)
+        self.assertEqual(sorted(result), expected_fields)
+        if "energy" in result:
+            # the energy file holds more digits than the gradient header
+            self.assertEqual(result["energy"], -5.070544213562)
+
+    def test_load_with_engrad_only(self):
+
+        directory = tempfile.mkdtemp()
+        try:
+            shutil.copy(os.path.join(WATER_GRADIENT_FILES, "xtbin.engrad"), directory)
+
+            result = GradientLoader().load(directory)
+            self.assertEqual(result["gradient"].shape, (3, 3))
+            self.assertEqual(result["energy"], -5.070544213562)
+
+            os.remove(os.path.join(directory, "xtbin.engrad"))
+            self.assertEqual(GradientLoader().load(directory), {})
+        finally:
+            shutil.rmtree(directory)
@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+from parameterized import parameterized
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from . import WATER_HESSIAN_FILES
+from uxtbpy.hessian_loader import HessianLoader
+
+
+@unittest.skipIf(np is None, "NumPy is not installed.")
+class TestHessianLoader(unittest.TestCase):
+
+    @parameterized.expand([[os.path.join(WATER_HESSIAN_FILES, "hessian"), (9, 9)]])
+    def test_load_hessian(self, file_path, expected_shape):
+
+        hessian = HessianLoader.load_hessian(file_path)
+        self.assertEqual(hessian.shape, expected_shape)
+        self.assertEqual(hessian.dtype, np.float64)
+        self.assertTrue(np.array_equal(hessian, hessian.T))
+
+    @parameterized.expand(
+        [
+            [
+                os.path.join(WATER_HESSIAN_FILES, "g98.out"),
+                [1539.4563, 3642.4381, 3651.5291],
+                [[0.00, 0.07, 0.00], [0.00, -0.56, -0.43], [0.00, -0.56, 0.43]],
+            ]
+        ]
+    )
+    def test_load_normal_modes(self, file_path, expected_frequencies, expected_mode):
+
+        frequencies, normal_modes = HessianLoader.load_normal_modes(file_path)
+        self.assertEqual(frequencies.tolist(), expected_frequencies)
+        self.assertEqual(normal_modes.shape, (3, 3, 3))
+        self.assertEqual(normal_modes[2].tolist(), expected_mode)
+
+    @parameterized.expand(
+        [
+            [None, ["hessian", "normal_mode_frequencies", "normal_modes"]],
+            [["energy", "normal_modes"], ["normal_modes"]],
+        ]
+    )
+    def test_load(self, fields, expected_fields):
+
+        result = HessianLoader().load(WATER_HESSIAN_FILES, fields=fields)
+        self.assertEqual(sorted(result), expected_fields)
+
+    def test_load_with_invalid_hessian(self):
+
+        directory = tempfile.mkdtemp()
+        try:
+            file_path = os.path.join(directory, "hessian")
+            with open(file_path, "w") as file:
+                file.write(" $hessian\n 1.0 2.0 3.0\n $end\n")
+
+            self.assertRaises(ValueError, HessianLoader.load_hessian, file_path)
+        finally:
+            shutil.rmtree(directory)
@@ -0,0 +1,87 @@
+import pickle
+import unittest
+from parameterized import parameterized
+
+from uxtbpy.memo_cache import MemoCache
+
+
+class TestMemoCache(unittest.TestCase):
+
+    @parameterized.expand(
+        [
+            [
+                {
+                    "energy": -37.44,
+                    "atomic_numbers": [6, 6, 8],
+                    "tensor": [[1.0, 0.0], [0.0, 1.0]],
+                }
+            ],
+        ]
+    )
+    def test_put_get(self, value):
+
+        memo = MemoCache()
+        memo.put("key", value)
+        result = memo.get("key")
+
+        self.assertEqual(result["energy"], value["energy"])
+        self.assertEqual(result["atomic_numbers"], tuple(value["atomic_numbers"]))
+        self.assertEqual(result["tensor"], ((1.0, 0.0), (0.0, 1.0)))
+        with self.assertRaises(TypeError):
+            result["energy"] = 0.0
+        self.assertIsNone(memo.get("missing-key"))
+        self.assertEqual(memo.info()["hits"], 1)
+        self.assertEqual(memo.info()["misses"], 1)
+
+    @parameterized.expand(
+        [[2, ["first", "second", "third"], ["first", "third"], ["second"]]]
+    )
+    def test_max_entries(self, max_entries, keys, expected_keys, expected_evicted_keys):
+
+        memo = MemoCache(max_entries=max_entries)
+        memo.put(keys[0], {"index": 0})
+        memo.put(keys[1], {"index": 1})
+        memo.get(keys[0])
+        memo.put(keys[2], {"index": 2})
+
+        for key in expected_keys:
+            self.assertIn(key, memo)
+        for key in expected_evicted_keys:
+            self.assertNotIn(key, memo)
+
+    @parameterized.expand([[list(range(1000))]])
+    def test_max_bytes(self, value):
+
+        memo = MemoCache(max_bytes=MemoCache._size_of(MemoCache.freeze(value)) + 1)
+        memo.put("first", value)
+        memo.put("second", value)
+
+        self.assertEqual(len(memo), 1)
+        self.assertIn("second", memo)
+        self.assertLessEqual(memo.info()["bytes"], memo.max_bytes)
+
+    def test_clear(self):
+
+        memo = MemoCache()
+        memo.put("key", {"energy": 1.0})
+        memo.get("key")
+        memo.clear()
+
+        self.assertEqual(
+            memo.info(), {"hits": 0, "misses": 0, "entries": 0, "bytes": 0}
+        )
+
+    @parameterized.expand([[{"energy": -37.44, "charges": [0.1, -0.1]}]])
+    def test_pickle(self, value):
+
+        memo = MemoCache()
+        memo.put("key", value)
+        copy = pickle.loads(pickle.dumps(memo))
+
+        result = copy.get("key")
+        self.assertEqual(result["charges"], tuple(value["charges"]))
+        with self.assertRaises(TypeError):
+            result["energy"] = 0.0
+
+        copy.put("other_key", value)
+        self.assertNotIn("other_key", memo)
@@ -0,0 +1,84 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from parameterized import parameterized
+
+from uxtbpy.restart_store import RestartStore
+
+
+class TestRestartStore(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.mkdtemp()
+        self.restart_path = os.path.join(self.directory, "xtbrestart")
+        with open(self.restart_path, "wb") as file:
+            file.write(b"wavefunction")
+
+        self.job_directory = os.path.join(self.directory, "job")
+        os.makedirs(self.job_directory)
+
+    def tearDown(self):
+
+        shutil.rmtree(self.directory)
+
+    @parameterized.expand(
+        [
+            [[(0.0, 0.0, 0.0), (0.0, 0.0, 0.74)], 0, 0, True],
+            # translated and slightly stretched
+            [[(1.0, 0.0, 0.0), (1.0, 0.0, 0.80)], 0, 0, True],
+            [[(0.0, 0.0, 0.0), (0.0, 0.0, 2.0)], 0, 0, False],
+            [[(0.0, 0.0, 0.0), (0.0, 0.0, 0.74)], 1, 1, False],
+        ]
+    )
+    def test_seed(self, positions, charge, uhf, expected_seeded):
+
+        store = RestartStore(os.path.join(self.directory, "store"))
+        store.put(self.restart_path, ["H", "H"], [(0.0, 0.0, 0.0), (0.0, 0.0, 0.74)])
+
+        seeded = store.seed(
+            self.job_directory, ["H", "H"], positions, charge=charge, uhf=uhf
+        )
+        self.assertEqual(seeded, expected_seeded)
+        self.assertEqual(
+            os.path.isfile(os.path.join(self.job_directory, "xtbrestart")),
+            expected_seeded,
+        )
+        self.assertEqual(store.info()["hits"], int(expected_seeded))
+
+    def test_put_replaces_matching_entry(self):
+
+        store = RestartStore(os.path.join(self.directory, "store"))
+        store.put(self.restart_path, ["H", "H"], [(0.0, 0.0, 0.0), (0.0, 0.0, 0.74)])
+        store.put(self.restart_path, ["H", "H"], [(0.0, 0.0, 0.0), (0.0, 0.0, 0.76)])
+        self.assertEqual(len(store), 1)
+        self.assertEqual(len(os.listdir(store.directory)), 1)
+
+        store.put(self.restart_path, ["H", "H"], [(0.0, 0.0, 0.0), (0.0, 0.0, 3.0)])
+        self.assertEqual(len(store), 2)
+
+    @parameterized.expand([[1, None], [8, 0.01]])
+    def test_eviction(self, max_entries, max_age):
+
+        store = RestartStore(
+            os.path.join(self.directory, "store"),
+            max_entries=max_entries,
+            max_age=max_age,
+        )
+        for distance in [1.0, 2.0, 3.0]:
+            store.put(
+                self.restart_path, ["H", "H"], [(0.0, 0.0, 0.0), (0.0, 0.0, distance)]
+            )
+        self.assertEqual(len(store), 3 if max_age else 1)
+
+        if max_age:
+            time.sleep(2 * max_age)
+
+        seeded = store.seed(
+            self.job_directory, ["H", "H"], [(0.0, 0.0, 0.0), (0.0, 0.0, 3.0)]
+        )
+        self.assertEqual(seeded, max_age is None)
+        self.assertEqual(len(store), 0 if max_age else 1)
+        self.assertEqual(len(os.listdir(store.directory)), len(store))
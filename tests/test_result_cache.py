@@ -0,0 +1,101 @@
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from parameterized import parameterized
+
+from uxtbpy.result_cache import ResultCache
+
+
+def _put_entry(path, index):
+
+    ResultCache(path).put(str(index), {"index": index})
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "cache.sqlite")
+
+    def tearDown(self):
+
+        shutil.rmtree(self.directory)
+
+    @parameterized.expand(
+        [
+            [
+                {"energy": -37.441567112416, "atomic_numbers": [6, 6, 8]},
+                "stdout",
+                True,
+                "stdout",
+            ],
+            [{"energy": -37.441567112416}, "stdout", False, None],
+        ]
+    )
+    def test_put_get(self, value, stdout, store_stdout, expected_stdout):
+
+        cache = ResultCache(self.path, store_stdout=store_stdout)
+        cache.put("key", value, stdout=stdout)
+
+        self.assertEqual(cache.get("key"), value)
+        self.assertIsNot(cache.get("key"), cache.get("key"))
+        self.assertEqual(cache.get_stdout("key"), expected_stdout)
+        self.assertIsNone(cache.get("missing-key"))
+
+    @parameterized.expand(
+        [
+            ["2\n\nO 0 0 0\nO 0 0 1", "2\n\nO 0 0 0   \r\nO 0 0 1\n\n"],
+        ]
+    )
+    def test_normalize_molecule_data(self, molecule_data, equivalent_molecule_data):
+
+        self.assertEqual(
+            ResultCache.make_key(
+                ResultCache.normalize_molecule_data(molecule_data), ["--opt"]
+            ),
+            ResultCache.make_key(
+                ResultCache.normalize_molecule_data(equivalent_molecule_data), ["--opt"]
+            ),
+        )
+        self.assertNotEqual(
+            ResultCache.make_key(
+                ResultCache.normalize_molecule_data(molecule_data), ["--opt"]
+            ),
+            ResultCache.make_key(
+                ResultCache.normalize_molecule_data(molecule_data), ["--ohess"]
+            ),
+        )
+
+    def test_max_age(self):
+
+        cache = ResultCache(self.path, max_age=-1)
+        cache.put("key", {"energy": 1.0})
+
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(len(cache), 0)
+
+    @parameterized.expand([[b"x" * 400, 1000]])
+    def test_max_size(self, value, max_size):
+
+        cache = ResultCache(self.path, max_size=max_size)
+        cache.put("first", value)
+        cache.put("second", value)
+        cache.get("first")
+        cache.put("third", value)
+
+        self.assertIn("first", cache)
+        self.assertNotIn("second", cache)
+        self.assertIn("third", cache)
+
+    @parameterized.expand([[16]])
+    def test_concurrent_processes(self, n_entries):
+
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            list(executor.map(_put_entry, [self.path] * n_entries, range(n_entries)))
+
+        cache = ResultCache(self.path)
+        self.assertEqual(len(cache), n_entries)
+        self.assertEqual(cache.get("3"), {"index": 3})
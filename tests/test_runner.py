@@ -0,0 +1,277 @@
+import os
+import sys
+import hashlib
+import shutil
+import time
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from parameterized import parameterized
+
+from uxtbpy.runner import Runner
+from uxtbpy.subprocess_error import SubprocessError, SubprocessTimeoutError
+
+
+def is_running(pid):
+
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as stat_file:
+            stat = stat_file.read()
+    except OSError:
+        return False
+
+    # zombies are not reaped by the init process of every container
+    return stat.rpartition(b")")[2].split()[0] != b"Z"
+
+
+class TestRunner(unittest.TestCase):
+
+    @parameterized.expand([["this-binary-does-not-exist", RuntimeError]])
+    def test_resolve_binary_with_missing_binary(self, binary_name, expected_error):
+
+        self.assertRaises(expected_error, Runner.resolve_binary, binary_name)
+
+    @parameterized.expand([[sys.executable]])
+    def test_resolve_binary(self, binary_name):
+
+        self.assertEqual(Runner.resolve_binary(binary_name), binary_name)
+        self.assertIs(
+            Runner.resolve_binary(binary_name), Runner.resolve_binary(binary_name)
+        )
+
+    @parameterized.expand(
+        [
+            ["print('fake version 1.2.3 (abcdef)')", "1.2.3"],
+            ["print('usage: fake_binary [options]')", None],
+        ]
+    )
+    def test_binary_version(self, script, expected_version):
+
+        directory = tempfile.mkdtemp()
+        cwd = os.getcwd()
+        try:
+            binary_path = os.path.join(directory, "fake_binary")
+            with open(binary_path, "w") as binary_file:
+                binary_file.write(
+                    f"#!{sys.executable}\nopen('probe', 'w').close()\n{script}\n"
+                )
+            os.chmod(binary_path, 0o755)
+
+            os.chdir(directory)
+            version = Runner.binary_version(binary_path)
+            self.assertFalse(os.path.exists(os.path.join(directory, "probe")))
+
+            if expected_version is None:
+                with open(binary_path, "rb") as binary_file:
+                    expected_version = (
+                        "sha256:" + hashlib.sha256(binary_file.read()).hexdigest()
+                    )
+            self.assertEqual(version, expected_version)
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(directory)
+
+    @parameterized.expand(
+        [
+            [
+                ["-c", "import sys; print(sys.argv[1])", "path with spaces"],
+                "path with spaces\n",
+            ],
+            [["-c", "import sys; print(len(sys.argv))", "a b", "c"], "3\n"],
+        ]
+    )
+    def test_run_binary_passes_arguments_verbatim(self, parameters, expected):
+
+        result = Runner.run_binary(sys.executable, parameters)
+        self.assertEqual(result.stdout.decode("utf-8"), expected)
+
+    @parameterized.expand(
+        [
+            [
+                [
+                    "-c",
+                    "import os, time; open('marker', 'w').close(); time.sleep(0.1); print(os.getcwd())",
+                ],
+                8,
+            ],
+        ]
+    )
+    def test_run_binary_concurrently_in_different_directories(self, parameters, n_jobs):
+
+        cwd = os.getcwd()
+        directories = [tempfile.mkdtemp() for _ in range(n_jobs)]
+        try:
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                results = list(
+                    executor.map(
+                        lambda directory: Runner.run_binary(
+                            sys.executable, parameters, working_directory=directory
+                        ),
+                        directories,
+                    )
+                )
+
+            self.assertEqual(os.getcwd(), cwd)
+            for directory, result in zip(directories, results):
+                self.assertEqual(
+                    os.path.realpath(result.stdout.decode("utf-8").strip()),
+                    os.path.realpath(directory),
+                )
+                self.assertEqual(os.listdir(directory), ["marker"])
+        finally:
+            for directory in directories:
+                shutil.rmtree(directory)
+
+    @parameterized.expand([[["-c", "import sys; sys.exit(3)"], SubprocessError]])
+    def test_run_binary_with_failing_binary(self, parameters, expected_error):
+
+        self.assertRaises(expected_error, Runner.run_binary, sys.executable, parameters)
+
+    @parameterized.expand(
+        [
+            [
+                ["-c", "import sys; print('out'); sys.stderr.write('err')"],
+                b"out\n",
+                b"err",
+            ],
+        ]
+    )
+    def test_run_binary_with_redirected_output(
+        self, parameters, expected_stdout, expected_stderr
+    ):
+
+        binary_name = os.path.basename(sys.executable)
+        if shutil.which(binary_name) is None:
+            self.skipTest(f"{binary_name} is not on the PATH.")
+
+        working_directory = tempfile.mkdtemp()
+        try:
+            result = Runner.run_binary(
+                binary_name,
+                parameters,
+                working_directory=working_directory,
+                redirect_output=True,
+            )
+
+            with open(
+                os.path.join(working_directory, f"{binary_name}.stdout"), "rb"
+            ) as stdout_file:
+                self.assertEqual(stdout_file.read(), expected_stdout)
+            self.assertIsNone(result.stdout)
+            self.assertEqual(result.stderr, expected_stderr)
+        finally:
+            shutil.rmtree(working_directory)
+
+    @parameterized.expand(
+        [
+            [
+                ["-c", "import time; print('partial', flush=True); time.sleep(30)"],
+                {"timeout": 0.5},
+                "wall-clock",
+            ],
+            [
+                [
+                    "-c",
+                    "import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); "
+                    "print('partial', flush=True); time.sleep(30)",
+                ],
+                {"timeout": 0.5, "grace_period": 0.5},
+                "wall-clock",
+            ],
+            [
+                ["-c", "print('partial', flush=True)\nwhile True: pass"],
+                {"cpu_timeout": 0.5},
+                "CPU",
+            ],
+        ]
+    )
+    def test_run_binary_with_timeout(self, parameters, limits, expected_reason):
+
+        start_time = time.monotonic()
+        with self.assertRaises(SubprocessTimeoutError) as context:
+            Runner.run_binary(sys.executable, parameters, **limits)
+
+        self.assertLess(time.monotonic() - start_time, 15)
+        self.assertIn(expected_reason, str(context.exception))
+        self.assertEqual(context.exception.stdout, "partial\n")
+
+    @parameterized.expand(
+        [
+            [
+                [
+                    "-c",
+                    "import subprocess, sys, time; "
+                    "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)']); "
+                    "print(child.pid, flush=True); time.sleep(30)",
+                ],
+            ],
+        ]
+    )
+    def test_run_binary_with_timeout_kills_process_group(self, parameters):
+
+        binary_name = os.path.basename(sys.executable)
+        if shutil.which(binary_name) is None:
+            self.skipTest(f"{binary_name} is not on the PATH.")
+
+        working_directory = tempfile.mkdtemp()
+        try:
+            with self.assertRaises(SubprocessTimeoutError) as context:
+                Runner.run_binary(
+                    binary_name,
+                    parameters,
+                    working_directory=working_directory,
+                    redirect_output=True,
+                    timeout=1.0,
+                )
+        finally:
+            shutil.rmtree(working_directory)
+
+        child_pid = int(context.exception.stdout)
+        for _ in range(100):
+            if not is_running(child_pid):
+                break
+            time.sleep(0.05)
+        self.assertFalse(is_running(child_pid))
+
+    @parameterized.expand(
+        [
+            [
+                [
+                    "-c",
+                    "import subprocess, sys, time; "
+                    "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)']); "
+                    "print(child.pid, flush=True); time.sleep(30)",
+                ],
+            ],
+        ]
+    )
+    def test_run_binary_with_failing_callback_kills_process_group(self, parameters):
+
+        binary_name = os.path.basename(sys.executable)
+        if shutil.which(binary_name) is None:
+            self.skipTest(f"{binary_name} is not on the PATH.")
+
+        child_pids = []
+
+        def callback(chunk):
+            child_pids.append(int(chunk))
+            raise KeyboardInterrupt()
+
+        working_directory = tempfile.mkdtemp()
+        try:
+            with self.assertRaises(KeyboardInterrupt):
+                Runner.run_binary(
+                    binary_name,
+                    parameters,
+                    working_directory=working_directory,
+                    stdout_callback=callback,
+                    timeout=60.0,
+                )
+        finally:
+            shutil.rmtree(working_directory)
+
+        for _ in range(100):
+            if not is_running(child_pids[0]):
+                break
+            time.sleep(0.05)
+        self.assertFalse(is_running(child_pids[0]))
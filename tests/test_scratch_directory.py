@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+import unittest
+from parameterized import parameterized
+
+from uxtbpy.scratch_directory import ScratchDirectory
+
+
+class TestScratchDirectory(unittest.TestCase):
+
+    def setUp(self):
+
+        self.root_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+
+        shutil.rmtree(self.root_directory)
+
+    @parameterized.expand(
+        [
+            ["keep", False, True],
+            ["keep", True, True],
+            ["delete", False, False],
+            ["delete", True, False],
+            ["keep_on_failure", False, False],
+            ["keep_on_failure", True, True],
+        ]
+    )
+    def test_cleanup(self, cleanup, fail, expected_exists):
+
+        try:
+            with ScratchDirectory(self.root_directory, cleanup=cleanup) as path:
+                if fail:
+                    raise RuntimeError()
+        except RuntimeError:
+            pass
+
+        self.assertEqual(os.path.isdir(path), expected_exists)
+
+    def test_isolation(self):
+
+        with ScratchDirectory(self.root_directory) as first_path:
+            with ScratchDirectory(self.root_directory) as second_path:
+                self.assertNotEqual(first_path, second_path)
+                self.assertEqual(os.path.dirname(first_path), self.root_directory)
+
+    @parameterized.expand([["remove"], [""]])
+    def test_invalid_cleanup(self, cleanup):
+
+        self.assertRaises(ValueError, ScratchDirectory, self.root_directory, cleanup)
+
+    @parameterized.expand([["keep_on_failure", True], ["delete", False]])
+    def test_cleanup_with_failed_flag(self, cleanup, expected_exists):
+
+        scratch_directory = ScratchDirectory(self.root_directory, cleanup=cleanup)
+        with scratch_directory as path:
+            scratch_directory.failed = True
+
+        self.assertEqual(os.path.isdir(path), expected_exists)
@@ -0,0 +1,112 @@
+import unittest
+from parameterized import parameterized
+
+from . import SEROTONIN_XYZ
+from uxtbpy.file_handler import FileHandler
+from uxtbpy.subprocess_error import SubprocessError
+from uxtbpy.watchdog import MaxOptimizationCycles
+from uxtbpy.screening_funnel import (
+    EnergyWindow,
+    TopK,
+    XtbStage,
+    StdaStage,
+    ScreeningFunnel,
+)
+
+
+class TestScreeningFunnel(unittest.TestCase):
+
+    @parameterized.expand(
+        [
+            [{0: -1.0, 1: -1.02, 2: -0.9}, 0.05, [0, 1]],
+            [{0: -1.0}, 0.0, [0]],
+            [{}, 0.05, []],
+        ]
+    )
+    def test_energy_window(self, values, window, expected_indices):
+
+        self.assertEqual(EnergyWindow(window)(values), expected_indices)
+
+    @parameterized.expand(
+        [
+            [{0: -1.0, 1: -1.02, 2: -0.9}, 2, False, [1, 0]],
+            [{0: -1.0, 1: -1.02, 2: -0.9}, 1, True, [2]],
+            [{0: -1.0}, 3, False, [0]],
+        ]
+    )
+    def test_top_k(self, values, k, largest, expected_indices):
+
+        self.assertEqual(TopK(k, largest=largest)(values), expected_indices)
+
+    @parameterized.expand(
+        [
+            [[FileHandler.read_file(SEROTONIN_XYZ), "O 0 0 0\nO 0 0 1"] * 2],
+        ]
+    )
+    def test_run(self, structures):
+
+        funnel = ScreeningFunnel(
+            [
+                XtbStage(["--gfnff", "--opt"], fields=["energy"]),
+                XtbStage(["--gfn 2"], fields=["energy"], candidate_filter=TopK(1)),
+                StdaStage(fields=["excitation_wavelenghts"]),
+            ],
+            max_workers=2,
+        )
+        candidates = funnel.run(structures)
+
+        self.assertEqual([candidate.index for candidate in candidates], [0, 1, 2, 3])
+        self.assertEqual(
+            [candidate.stages_completed for candidate in candidates], [3, 0, 2, 0]
+        )
+        self.assertIsInstance(candidates[1].error, SubprocessError)
+
+        # the optimized geometry of the first stage is passed on
+        self.assertEqual(candidates[0].xyz, candidates[0].outputs[0]["optimized_xyz"])
+        self.assertEqual(sorted(candidates[0].outputs[1]), ["energy", "optimized_xyz"])
+        self.assertIn("excitation_wavelenghts", candidates[0].outputs[2])
+
+    @parameterized.expand([[[FileHandler.read_file(SEROTONIN_XYZ)] * 2]])
+    def test_run_with_plain_callable_filter(self, structures):
+
+        funnel = ScreeningFunnel(
+            [
+                XtbStage(
+                    ["--gfnff"],
+                    fields=["homo_lumo_gap"],
+                    candidate_filter=lambda values: [min(values)],
+                ),
+                XtbStage(["--gfn 2"], fields=["energy"]),
+            ],
+            max_workers=2,
+        )
+        candidates = funnel.run(structures)
+
+        self.assertEqual(
+            [candidate.stages_completed for candidate in candidates], [2, 1]
+        )
+        self.assertEqual(
+            sorted(candidates[1].outputs[0]),
+            ["energy", "homo_lumo_gap", "optimized_xyz"],
+        )
+
+    @parameterized.expand(
+        [
+            [[FileHandler.read_file(SEROTONIN_XYZ)] * 2, 1],
+        ]
+    )
+    def test_run_with_aborted_jobs(self, structures, max_cycles):
+
+        funnel = ScreeningFunnel(
+            [
+                XtbStage(["--opt"], watchdogs=[MaxOptimizationCycles(max_cycles)]),
+                StdaStage(),
+            ],
+            max_workers=2,
+        )
+        candidates = funnel.run(structures)
+
+        for candidate in candidates:
+            self.assertEqual(candidate.stages_completed, 0)
+            self.assertIsNone(candidate.error)
+            self.assertIn(str(max_cycles), candidate.abort_reason)
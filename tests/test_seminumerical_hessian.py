@@ -0,0 +1,103 @@
+import os
+import unittest
+from parameterized import parameterized
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from . import SEROTONIN_XYZ
+from uxtbpy.file_handler import FileHandler
+from uxtbpy.xtb_runner import XtbRunner
+from uxtbpy.batch_result import BatchError
+from uxtbpy.subprocess_error import SubprocessTimeoutError
+from uxtbpy.seminumerical_hessian import SeminumericalHessian, BOHR_TO_ANGSTROM
+
+
+class HarmonicRunner:
+    """Gradient runner of a harmonic potential around the given positions."""
+
+    def __init__(self, hessian, positions):
+        self.hessian = hessian
+        self.positions = positions
+
+    def run_gradient_batch(
+        self,
+        structures,
+        parameters=[],
+        max_workers=None,
+        executor=None,
+        raise_on_error=False,
+    ):
+
+        gradients = []
+        for xyz in structures:
+            _, positions = SeminumericalHessian._read_xyz(xyz)
+            displacement = (positions - self.positions).reshape(-1) / BOHR_TO_ANGSTROM
+            gradients.append((self.hessian @ displacement).reshape(positions.shape))
+
+        return np.zeros(len(structures)), np.array(gradients)
+
+
+@unittest.skipIf(np is None, "NumPy is not installed.")
+class TestSeminumericalHessian(unittest.TestCase):
+
+    @parameterized.expand([[np.zeros((2, 3)) if np else None, 0.01]])
+    def test_displace(self, positions, step):
+
+        displaced = SeminumericalHessian.displace(positions, step)
+        self.assertEqual(displaced.shape, (12, 2, 3))
+        self.assertEqual(displaced[4].tolist(), [[0.0, 0.0, 0.0], [0.0, step, 0.0]])
+        self.assertEqual(displaced[10].tolist(), [[0.0, 0.0, 0.0], [0.0, -step, 0.0]])
+
+    @parameterized.expand([["H 0 0 0\nH 0 0 0.74", 0.4]])
+    def test_run_from_xyz(self, xyz, force_constant):
+
+        # harmonic bond along z between the two atoms
+        hessian = np.zeros((6, 6))
+        hessian[np.ix_([2, 5], [2, 5])] = force_constant * np.array([[1, -1], [-1, 1]])
+
+        _, positions = SeminumericalHessian._read_xyz(xyz)
+        seminumerical_hessian = SeminumericalHessian(HarmonicRunner(hessian, positions))
+        result = seminumerical_hessian.run_from_xyz(xyz)
+
+        self.assertTrue(np.allclose(result["hessian"], hessian))
+        # a linear molecule has 3n - 5 modes
+        self.assertEqual(result["normal_mode_frequencies"].shape, (1,))
+        self.assertEqual(result["normal_modes"].shape, (1, 2, 3))
+
+        reduced_mass = 1.008 / 2
+        expected_frequency = 5140.48 * np.sqrt(force_constant / reduced_mass)
+        self.assertAlmostEqual(
+            result["normal_mode_frequencies"][0], expected_frequency, delta=0.1
+        )
+        self.assertTrue(
+            np.allclose(np.abs(result["normal_modes"][0, :, 2]), np.sqrt(0.5))
+        )
+
+    @parameterized.expand([[FileHandler.read_file(SEROTONIN_XYZ), (75, 75)]])
+    def test_run_from_xyz_with_xtb(self, xyz, expected_shape):
+
+        seminumerical_hessian = SeminumericalHessian(max_workers=4)
+        result = seminumerical_hessian.run_from_xyz(xyz)
+        self.assertEqual(result["hessian"].shape, expected_shape)
+        self.assertEqual(result["normal_modes"].shape, (69, 25, 3))
+
+    @parameterized.expand([["H 0 0 0\nH 0 0 0.74"]])
+    def test_run_from_xyz_with_failed_gradients(self, xyz):
+
+        # every displaced job exceeds the time limit
+        os.environ["FAKE_XTB_DELAY"] = "5"
+        try:
+            seminumerical_hessian = SeminumericalHessian(
+                XtbRunner(timeout=0.2), max_workers=12
+            )
+            with self.assertRaises(BatchError) as context:
+                seminumerical_hessian.run_from_xyz(xyz)
+        finally:
+            del os.environ["FAKE_XTB_DELAY"]
+
+        self.assertIn("12 of 12", str(context.exception))
+        self.assertEqual(sorted(context.exception.errors), list(range(12)))
+        self.assertIsInstance(context.exception.__cause__, SubprocessTimeoutError)
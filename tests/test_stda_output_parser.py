@@ -97,3 +97,28 @@ class TestStdaOutputParser(unittest.TestCase):
         result = StdaOutputParser().parse(output_data)
         self.assertEqual(result["excitation_wavelenghts"], expected[0])
         self.assertEqual(result["excitation_oscillator_strengths"], expected[1])
+
+    @parameterized.expand(
+        [
+            [SEROTONIN_STDA_STDOUT, ["polarizability_tensor"]],
+            [SEROTONIN_STDA_STDOUT, ["excitation_wavelenghts"]],
+        ]
+    )
+    def test_parse_with_fields(self, output_file, fields):
+
+        output_data = FileHandler.read_file(output_file)
+        expected = StdaOutputParser().parse(output_data)
+        result = StdaOutputParser().parse(output_data, fields=fields)
+        self.assertEqual(result, {field: expected[field] for field in fields})
+
+    @parameterized.expand(
+        [
+            [SEROTONIN_STDA_STDOUT],
+        ]
+    )
+    def test_parse_file(self, output_file):
+
+        output_data = FileHandler.read_file(output_file)
+        expected = StdaOutputParser().parse(output_data)
+        result = StdaOutputParser().parse_file(output_file)
+        self.assertEqual(result, expected)
@@ -1,6 +1,13 @@
+import os
+import shutil
+import tempfile
 import unittest
 from parameterized import parameterized
 
+from uxtbpy.file_handler import FileHandler
+from uxtbpy.memo_cache import MemoCache
+from uxtbpy.result_cache import ResultCache
+
 from . import SEROTONIN_XYZ
 from uxtbpy.stda_runner import StdaRunner
 from uxtbpy.subprocess_error import SubprocessError
@@ -41,3 +48,176 @@ class TestStdaRunner(unittest.TestCase):
 
         stda_runner = StdaRunner()
         self.assertRaises(expected_error, stda_runner.run_from_xyz, input)
+
+    @parameterized.expand(
+        [
+            [
+                [FileHandler.read_file(SEROTONIN_XYZ), "O 0 0 0\nO 0 0 1"],
+                [dict, None],
+                [None, SubprocessError],
+            ],
+        ]
+    )
+    def test_run_batch(self, structures, expected_output_formats, expected_errors):
+
+        stda_runner = StdaRunner()
+        results = stda_runner.run_batch(structures, max_workers=2)
+
+        self.assertEqual(
+            [result.index for result in results], list(range(len(structures)))
+        )
+        for result, expected_output_format, expected_error in zip(
+            results, expected_output_formats, expected_errors
+        ):
+            if expected_error is None:
+                self.assertEqual(type(result.output), expected_output_format)
+                self.assertIsNone(result.error)
+            else:
+                self.assertIsNone(result.output)
+                self.assertIsInstance(result.error, expected_error)
+
+    @parameterized.expand(
+        [
+            [SEROTONIN_XYZ],
+        ]
+    )
+    def test_run_from_file_with_cache(self, file_path):
+
+        cache_directory = tempfile.mkdtemp()
+        cache = ResultCache(
+            os.path.join(cache_directory, "cache.sqlite"), store_stdout=True
+        )
+
+        try:
+            stda_runner = StdaRunner(cache=cache)
+            first_result = stda_runner.run_from_file(file_path)
+            second_result = stda_runner.run_from_file(file_path)
+
+            self.assertEqual(first_result, second_result)
+            self.assertEqual(len(cache), 1)
+        finally:
+            shutil.rmtree(cache_directory)
+
+    @parameterized.expand(
+        [
+            [FileHandler.read_file(SEROTONIN_XYZ)],
+        ]
+    )
+    def test_run_from_xyz_with_memo(self, xyz):
+
+        memo = MemoCache()
+        stda_runner = StdaRunner(memo=memo)
+        first_result = stda_runner.run_from_xyz(xyz)
+        second_result = stda_runner.run_from_xyz(xyz)
+
+        self.assertIs(first_result, second_result)
+        self.assertEqual(memo.info()["hits"], 1)
+
+    @parameterized.expand(
+        [
+            [FileHandler.read_file(SEROTONIN_XYZ), [["-e 8"], ["-e 10"], ["-rpa"]]],
+        ]
+    )
+    def test_run_variants_from_xyz(self, xyz, stda_variants):
+
+        working_directory = tempfile.mkdtemp()
+        try:
+            stda_runner = StdaRunner(working_directory, cleanup="keep")
+            results = stda_runner.run_variants_from_xyz(
+                xyz, stda_variants=stda_variants, max_workers=2
+            )
+
+            self.assertEqual([result.index for result in results], [0, 1, 2])
+            self.assertTrue(all(result.succeeded for result in results))
+            self.assertEqual(results[0].output, stda_runner.run_from_xyz(xyz))
+
+            # one xtb4stda directory for the variants and one for the reference pipeline
+            job_files = [
+                os.listdir(os.path.join(working_directory, job_directory))
+                for job_directory in os.listdir(working_directory)
+            ]
+            self.assertEqual(sum("mol.xyz" in files for files in job_files), 2)
+            self.assertEqual(sum("stda.stdout" in files for files in job_files), 4)
+        finally:
+            shutil.rmtree(working_directory)
+
+    @parameterized.expand(
+        [
+            [FileHandler.read_file(SEROTONIN_XYZ), [["-e 8"], ["-rpa"]]],
+        ]
+    )
+    def test_run_variants_from_xyz_with_cached_variants(self, xyz, stda_variants):
+
+        working_directory = tempfile.mkdtemp()
+        try:
+            stda_runner = StdaRunner(
+                working_directory, cleanup="keep", memo=MemoCache()
+            )
+            first_results = stda_runner.run_variants_from_xyz(
+                xyz, stda_variants=stda_variants
+            )
+            job_directories = os.listdir(working_directory)
+
+            second_results = stda_runner.run_variants_from_xyz(
+                xyz, stda_variants=stda_variants
+            )
+
+            # xtb4stda is not run again when every variant is cached
+            self.assertEqual(os.listdir(working_directory), job_directories)
+            self.assertEqual(
+                [result.output for result in second_results],
+                [result.output for result in first_results],
+            )
+            self.assertTrue(all(result.succeeded for result in second_results))
+        finally:
+            shutil.rmtree(working_directory)
+
+    @parameterized.expand(
+        [
+            ["O 0 0 0\nO 0 0 1", SubprocessError],
+        ]
+    )
+    def test_run_variants_from_xyz_with_invalid_input(self, xyz, expected_error):
+
+        stda_runner = StdaRunner()
+        self.assertRaises(expected_error, stda_runner.run_variants_from_xyz, xyz)
+
+    @parameterized.expand(
+        [
+            [FileHandler.read_file(SEROTONIN_XYZ), None, 1, 1],
+            # the wavefunction exceeds the size cap and is evicted right away
+            [FileHandler.read_file(SEROTONIN_XYZ), 1, 2, 0],
+        ]
+    )
+    def test_run_from_xyz_with_wavefunction_cache(
+        self, xyz, max_size, expected_xtb4stda_runs, expected_entries
+    ):
+
+        working_directory = tempfile.mkdtemp()
+        try:
+            wavefunction_cache = ResultCache(
+                os.path.join(working_directory, "cache", "wfn.sqlite"),
+                max_size=max_size,
+            )
+            stda_runner = StdaRunner(
+                os.path.join(working_directory, "jobs"),
+                cleanup="keep",
+                wavefunction_cache=wavefunction_cache,
+            )
+            first_result = stda_runner.run_from_xyz(xyz, stda_parameters=["-e 8"])
+            second_result = stda_runner.run_from_xyz(xyz, stda_parameters=["-e 10"])
+
+            self.assertEqual(first_result, second_result)
+            self.assertEqual(len(wavefunction_cache), expected_entries)
+
+            job_files = [
+                os.listdir(os.path.join(working_directory, "jobs", job_directory))
+                for job_directory in os.listdir(os.path.join(working_directory, "jobs"))
+            ]
+            self.assertEqual(len(job_files), 2)
+            self.assertEqual(
+                sum("xtb4stda.stdout" in files for files in job_files),
+                expected_xtb4stda_runs,
+            )
+        finally:
+            shutil.rmtree(working_directory)
@@ -0,0 +1,40 @@
+import os
+import unittest
+from parameterized import parameterized
+
+from . import SEROTONIN_XYZ
+from uxtbpy.tools import available_cores, resolve_paths, split_parameters
+
+
+class TestTools(unittest.TestCase):
+
+    @parameterized.expand(
+        [
+            [["--opt", "--chrg 0"], ["--opt", "--chrg", "0"]],
+            [
+                ["'/path with/spaces.xyz'", "--gfn 2"],
+                ["/path with/spaces.xyz", "--gfn", "2"],
+            ],
+            [[], []],
+        ]
+    )
+    def test_split_parameters(self, parameters, expected):
+
+        self.assertEqual(split_parameters(parameters), expected)
+
+    @parameterized.expand(
+        [
+            [
+                [SEROTONIN_XYZ, "--chrg", "0", "does_not_exist.xyz"],
+                [os.path.abspath(SEROTONIN_XYZ), "--chrg", "0", "does_not_exist.xyz"],
+            ],
+            [["/absolute/path.xyz", "--opt"], ["/absolute/path.xyz", "--opt"]],
+        ]
+    )
+    def test_resolve_paths(self, arguments, expected):
+
+        self.assertEqual(resolve_paths(arguments), expected)
+
+    def test_available_cores(self):
+
+        self.assertGreaterEqual(available_cores(), 1)
@@ -0,0 +1,83 @@
+import unittest
+from parameterized import parameterized
+
+from uxtbpy.watchdog import (
+    MaxOptimizationCycles,
+    MaxWallTime,
+    NoEnergyDecrease,
+    ScfNotConverging,
+)
+from uxtbpy.xtb_stream_parser import StreamEvent
+
+
+def cycle_event(cycle, energy):
+    return StreamEvent(
+        "optimization_cycle",
+        {"cycle": cycle, "energy": energy, "energy_change": 0.0, "gradient_norm": 0.1},
+    )
+
+
+def scf_event(iteration):
+    return StreamEvent(
+        "scf_iteration",
+        {
+            "iteration": iteration,
+            "energy": -1.0,
+            "energy_change": 0.0,
+            "optimization_cycle": None,
+        },
+    )
+
+
+class TestWatchdog(unittest.TestCase):
+
+    @parameterized.expand(
+        [
+            [3, 3, False],
+            [3, 4, True],
+            [3, None, False],
+        ]
+    )
+    def test_max_optimization_cycles(self, max_cycles, cycle, expected_abort):
+
+        watchdog = MaxOptimizationCycles(max_cycles)
+        self.assertEqual(bool(watchdog(cycle_event(cycle, -1.0))), expected_abort)
+
+    @parameterized.expand(
+        [
+            [[-1.0, -1.1, -1.2, -1.3], 2, False],
+            [[-1.0, -1.1, -1.05, -1.1], 2, True],
+        ]
+    )
+    def test_no_energy_decrease(self, energies, cycles, expected_abort):
+
+        watchdog = NoEnergyDecrease(cycles)
+        watchdog.start()
+        reasons = [
+            watchdog(cycle_event(cycle, energy))
+            for cycle, energy in enumerate(energies, 1)
+        ]
+        self.assertEqual(any(reasons), expected_abort)
+
+    @parameterized.expand(
+        [
+            [50, 50, False],
+            [50, 51, True],
+        ]
+    )
+    def test_scf_not_converging(self, max_iterations, iteration, expected_abort):
+
+        watchdog = ScfNotConverging(max_iterations)
+        self.assertEqual(bool(watchdog(scf_event(iteration))), expected_abort)
+
+    @parameterized.expand(
+        [
+            [3600.0, False],
+            [-1.0, True],
+        ]
+    )
+    def test_max_wall_time(self, max_seconds, expected_abort):
+
+        watchdog = MaxWallTime(max_seconds)
+        watchdog.start()
+        self.assertEqual(bool(watchdog(scf_event(1))), expected_abort)
@@ -0,0 +1,74 @@
+import unittest
+from array import array
+from parameterized import parameterized
+
+from uxtbpy.wiberg_matrix import WibergMatrix
+
+try:
+    import scipy
+except ImportError:
+    scipy = None
+
+
+TRIPLETS = [(0, 1, 1.5), (1, 0, 1.5), (1, 2, 0.9), (2, 1, 0.9)]
+
+
+def build_matrix(n_atoms: int, triplets: list):
+
+    rows, columns, values = zip(*triplets)
+    return WibergMatrix.from_triplets(
+        n_atoms, array("l", rows), array("l", columns), array("d", values)
+    )
+
+
+class TestWibergMatrix(unittest.TestCase):
+
+    @parameterized.expand(
+        [
+            [3, TRIPLETS, 0, {1: 1.5}],
+            [3, TRIPLETS, 1, {0: 1.5, 2: 0.9}],
+            [4, TRIPLETS, 3, {}],
+        ]
+    )
+    def test_neighbours(self, n_atoms, triplets, atom_index, expected):
+
+        matrix = build_matrix(n_atoms, triplets)
+        self.assertEqual(matrix.neighbours(atom_index), expected)
+
+    @parameterized.expand(
+        [
+            [3, TRIPLETS, (1, 2), 0.9],
+            [3, TRIPLETS, (0, 2), 0.0],
+            [3, TRIPLETS + [(0, 1, 1.2)], (0, 1), 1.2],
+        ]
+    )
+    def test_getitem(self, n_atoms, triplets, key, expected):
+
+        matrix = build_matrix(n_atoms, triplets)
+        self.assertEqual(matrix[key], expected)
+
+    @parameterized.expand(
+        [
+            [
+                3,
+                list(reversed(TRIPLETS)),
+                [[0.0, 1.5, 0.0], [1.5, 0.0, 0.9], [0.0, 0.9, 0.0]],
+            ],
+        ]
+    )
+    def test_to_dense(self, n_atoms, triplets, expected):
+
+        matrix = build_matrix(n_atoms, triplets)
+        self.assertEqual(matrix.nnz, 4)
+        self.assertEqual(matrix.to_dense(), expected)
+
+    @parameterized.expand(
+        [
+            [3, TRIPLETS],
+        ]
+    )
+    @unittest.skipIf(scipy is None, "SciPy is not installed.")
+    def test_to_scipy(self, n_atoms, triplets):
+
+        matrix = build_matrix(n_atoms, triplets)
+        self.assertEqual(matrix.to_scipy().toarray().tolist(), matrix.to_dense())
@@ -1,7 +1,16 @@
+import os
+import shutil
+import tempfile
 import unittest
 from parameterized import parameterized
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from . import SEROTONIN_XTB_STDOUT
+from uxtbpy import output_parser
 from uxtbpy.file_handler import FileHandler
 from uxtbpy.xtb_output_parser import XtbOutputParser
 
@@ -1477,3 +1486,183 @@ class TestXtbOutputParser(unittest.TestCase):
         output_data = FileHandler.read_file(output_file)
         result = XtbOutputParser().parse(output_data)
         self.assertEqual(result["atomic_polarizabilities"], expected)
+
+    @parameterized.expand(
+        [
+            [SEROTONIN_XTB_STDOUT, "TOTAL ENERGY", -37.441567112416],
+        ]
+    )
+    def test_register_extractor(self, output_file, keyword, expected):
+
+        output_data = FileHandler.read_file(output_file)
+        parser = XtbOutputParser()
+        parser.register_extractor(
+            keyword, ["custom_energy"], lambda lines, i: float(lines[i].split()[3])
+        )
+        result = parser.parse(output_data)
+        self.assertEqual(result["custom_energy"], expected)
+        self.assertEqual(result["energy"], expected)
+
+    @parameterized.expand(
+        [
+            [SEROTONIN_XTB_STDOUT, ["energy", "homo_lumo_gap"]],
+            [SEROTONIN_XTB_STDOUT, ["atomic_partial_charges"]],
+            [SEROTONIN_XTB_STDOUT, ["wiberg_index_matrix", "optimized_xyz"]],
+        ]
+    )
+    def test_parse_with_fields(self, output_file, fields):
+
+        output_data = FileHandler.read_file(output_file)
+        expected = XtbOutputParser().parse(output_data)
+        result = XtbOutputParser().parse(output_data, fields=fields)
+        self.assertEqual(result, {field: expected[field] for field in fields})
+
+    @parameterized.expand([[SEROTONIN_XTB_STDOUT, "final structure"]])
+    def test_parse_scans_once(self, output_file, earliest_keyword):
+
+        output_data = FileHandler.read_file(output_file)
+
+        parser = XtbOutputParser()
+        calls = []
+        parser._extractors = [
+            (
+                keyword,
+                fields,
+                lambda start_index, index=index, extract=extract: calls.append(index)
+                or extract(start_index),
+                offset,
+                condition,
+            )
+            for index, (keyword, fields, extract, offset, condition) in enumerate(
+                parser._extractors
+            )
+        ]
+        parser.parse(output_data)
+
+        # only the lines from the earliest keyword, preceded by the context lines, are split and each extractor
+        # is evaluated once
+        first_line_index = output_data[: output_data.rindex(earliest_keyword)].count(
+            "\n"
+        )
+        self.assertEqual(
+            len(parser.lines),
+            output_data.count("\n") + 1 - (first_line_index - parser._context),
+        )
+        self.assertEqual(sorted(calls), list(range(len(parser._extractors))))
+
+    @parameterized.expand(
+        [
+            [SEROTONIN_XTB_STDOUT, ["energy", "homo_lumo_gap"]],
+        ]
+    )
+    def test_parse_with_fields_terminates_early(self, output_file, fields):
+
+        output_data = FileHandler.read_file(output_file)
+        # a long log between the final structure and the properties, only the latter are searched for the fields
+        position = output_data.index(" Bond Distances")
+        filler_line = "  iter      E             dE          RMSdq      gap"
+        long_output_data = (
+            output_data[:position]
+            + (filler_line + "\n") * 10000
+            + output_data[position:]
+        )
+        end_position = len(long_output_data.encode("utf-8")) - len(
+            output_data[position:].encode("utf-8")
+        )
+
+        parser = XtbOutputParser()
+        self.assertEqual(
+            parser.parse(long_output_data, fields=fields),
+            parser.parse(output_data, fields=fields),
+        )
+        self.assertNotIn(filler_line, parser.lines)
+
+        decoded_starts = []
+        line_window = output_parser._LineWindow
+
+        class RecordingLineWindow(line_window):
+            def __getitem__(self, index):
+                line = super().__getitem__(index)
+                decoded_starts.append(self._starts[index - self._context])
+                return line
+
+        directory = tempfile.mkdtemp()
+        output_parser._LineWindow = RecordingLineWindow
+        try:
+            file_path = os.path.join(directory, "xtb.stdout")
+            with open(file_path, "w", encoding="utf-8") as file:
+                file.write(long_output_data)
+
+            result = parser.parse_file(file_path, fields=fields)
+        finally:
+            output_parser._LineWindow = line_window
+            shutil.rmtree(directory)
+
+        self.assertEqual(result, parser.parse(output_data, fields=fields))
+        self.assertGreater(len(decoded_starts), 0)
+        self.assertGreaterEqual(min(decoded_starts), end_position)
+
+    @parameterized.expand(
+        [
+            [SEROTONIN_XTB_STDOUT, ["energy", "does_not_exist"], ValueError],
+        ]
+    )
+    def test_parse_with_unknown_fields(self, output_file, fields, expected_error):
+
+        output_data = FileHandler.read_file(output_file)
+        self.assertRaises(
+            expected_error, XtbOutputParser().parse, output_data, fields=fields
+        )
+
+    @parameterized.expand(
+        [
+            [
+                SEROTONIN_XTB_STDOUT,
+                {
+                    "optimized_atomic_positions": (25, 3),
+                    "atomic_partial_charges": (25,),
+                    "atomic_polarizabilities": (25,),
+                    "vibrational_frequencies": (75,),
+                    "raman_intensities": (75,),
+                    "wiberg_index_matrix": (25, 25),
+                },
+            ],
+        ]
+    )
+    @unittest.skipIf(np is None, "NumPy is not installed.")
+    def test_parse_as_arrays(self, output_file, expected_shapes):
+
+        output_data = FileHandler.read_file(output_file)
+        expected = XtbOutputParser().parse(output_data)
+        result = XtbOutputParser(as_arrays=True).parse(output_data)
+
+        for field, shape in expected_shapes.items():
+            self.assertEqual(result[field].dtype, np.float64)
+            self.assertEqual(result[field].shape, shape)
+            self.assertEqual(result[field].tolist(), expected[field])
+
+    @parameterized.expand(
+        [
+            [SEROTONIN_XTB_STDOUT, 54],
+        ]
+    )
+    def test_parse_with_sparse_wiberg(self, output_file, expected_nnz):
+
+        output_data = FileHandler.read_file(output_file)
+        expected = XtbOutputParser().parse(output_data)["wiberg_index_matrix"]
+        result = XtbOutputParser(sparse_wiberg=True).parse(output_data)
+        self.assertEqual(result["wiberg_index_matrix"].nnz, expected_nnz)
+        self.assertEqual(result["wiberg_index_matrix"].to_dense(), expected)
+
+    @parameterized.expand(
+        [
+            [SEROTONIN_XTB_STDOUT, None],
+            [SEROTONIN_XTB_STDOUT, ["energy", "wiberg_index_matrix"]],
+        ]
+    )
+    def test_parse_file(self, output_file, fields):
+
+        output_data = FileHandler.read_file(output_file)
+        expected = XtbOutputParser().parse(output_data, fields=fields)
+        result = XtbOutputParser().parse_file(output_file, fields=fields)
+        self.assertEqual(result, expected)
@@ -1,9 +1,29 @@
+import os
+import uuid
+import shutil
+import tempfile
 import unittest
+from concurrent.futures import ProcessPoolExecutor
 from parameterized import parameterized
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from uxtbpy.file_handler import FileHandler
+from uxtbpy.memo_cache import MemoCache
+from uxtbpy.result_cache import ResultCache
+from uxtbpy.restart_store import RestartStore
+from uxtbpy.core_scheduler import CoreScheduler
+
 from . import SEROTONIN_XYZ
+from uxtbpy import xtb_runner as xtb_runner_module
 from uxtbpy.xtb_runner import XtbRunner
+from uxtbpy.xtb_output_parser import XtbOutputParser
 from uxtbpy.subprocess_error import SubprocessError
+from uxtbpy.batch_result import BatchError
+from uxtbpy.watchdog import MaxOptimizationCycles, NoEnergyDecrease
 
 
 class TestXtbRunner(unittest.TestCase):
@@ -41,3 +61,342 @@ class TestXtbRunner(unittest.TestCase):
 
         xtb_runner = XtbRunner()
         self.assertRaises(expected_error, xtb_runner.run_from_xyz, input)
+
+    @parameterized.expand(
+        [
+            [
+                [FileHandler.read_file(SEROTONIN_XYZ), "O 0 0 0\nO 0 0 1"],
+                [dict, None],
+                [None, SubprocessError],
+            ],
+        ]
+    )
+    def test_run_batch(self, structures, expected_output_formats, expected_errors):
+
+        xtb_runner = XtbRunner()
+        results = xtb_runner.run_batch(structures, max_workers=2)
+
+        self.assertEqual(
+            [result.index for result in results], list(range(len(structures)))
+        )
+        for result, expected_output_format, expected_error in zip(
+            results, expected_output_formats, expected_errors
+        ):
+            if expected_error is None:
+                self.assertEqual(type(result.output), expected_output_format)
+                self.assertIsNone(result.error)
+            else:
+                self.assertIsNone(result.output)
+                self.assertIsInstance(result.error, expected_error)
+
+    @parameterized.expand([[SEROTONIN_XYZ, ["--opt"]]])
+    def test_run_with_relative_path(self, file_path, parameters):
+
+        self.assertFalse(os.path.isabs(file_path))
+        result = XtbRunner().run([file_path] + parameters)
+        self.assertIn("energy", result)
+
+    @parameterized.expand(
+        [
+            [SEROTONIN_XYZ],
+        ]
+    )
+    def test_run_from_file_with_cache(self, file_path):
+
+        cache_directory = tempfile.mkdtemp()
+        cache = ResultCache(
+            os.path.join(cache_directory, "cache.sqlite"), store_stdout=True
+        )
+
+        try:
+            xtb_runner = XtbRunner(cache=cache)
+            first_result = xtb_runner.run_from_file(file_path)
+            second_result = xtb_runner.run_from_file(file_path)
+
+            self.assertEqual(first_result, second_result)
+            self.assertEqual(len(cache), 1)
+        finally:
+            shutil.rmtree(cache_directory)
+
+    @parameterized.expand(
+        [
+            [FileHandler.read_file(SEROTONIN_XYZ)],
+        ]
+    )
+    def test_run_from_xyz_with_memo(self, xyz):
+
+        memo = MemoCache()
+        xtb_runner = XtbRunner(memo=memo)
+        first_result = xtb_runner.run_from_xyz(xyz)
+        second_result = xtb_runner.run_from_xyz(xyz)
+
+        self.assertIs(first_result, second_result)
+        self.assertEqual(memo.info()["hits"], 1)
+
+    @parameterized.expand(
+        [
+            [FileHandler.read_file(SEROTONIN_XYZ), ["energy", "homo_lumo_gap"]],
+        ]
+    )
+    def test_run_from_xyz_with_fields(self, xyz, fields):
+
+        xtb_runner = XtbRunner()
+        result = xtb_runner.run_from_xyz(xyz, fields=fields)
+        self.assertEqual(sorted(result), sorted(fields))
+
+    @parameterized.expand(
+        [
+            [FileHandler.read_file(SEROTONIN_XYZ)],
+        ]
+    )
+    def test_run_from_xyz_with_on_event(self, xyz):
+
+        events = []
+        xtb_runner = XtbRunner()
+        result = xtb_runner.run_from_xyz(xyz, on_event=events.append)
+
+        kinds = {event.kind for event in events}
+        self.assertIn("scf_iteration", kinds)
+        self.assertIn("optimization_cycle", kinds)
+        self.assertIn("properties", kinds)
+        self.assertEqual(
+            [event.data for event in events if "energy" in event.data][-1]["energy"],
+            result["energy"],
+        )
+
+    @parameterized.expand(
+        [
+            [FileHandler.read_file(SEROTONIN_XYZ), None],
+            [FileHandler.read_file(SEROTONIN_XYZ), ["energy", "polarizability"]],
+        ]
+    )
+    def test_run_from_xyz_with_on_event_uses_stream(self, xyz, fields):
+
+        parsed_fields = []
+
+        class RecordingParser(XtbOutputParser):
+            def parse_file(self, file_path, fields=None):
+                parsed_fields.extend(fields)
+                return super().parse_file(file_path, fields=fields)
+
+        xtb_runner = XtbRunner()
+        expected = xtb_runner.run_from_xyz(xyz, fields=fields)
+
+        xtb_runner_module.XtbOutputParser = RecordingParser
+        try:
+            result = xtb_runner.run_from_xyz(
+                xyz, fields=fields, on_event=lambda event: None
+            )
+        finally:
+            xtb_runner_module.XtbOutputParser = XtbOutputParser
+
+        self.assertEqual(result, expected)
+        # all fields were printed and extracted while xtb was running
+        self.assertEqual(parsed_fields, [])
+
+    @parameterized.expand(
+        [
+            [FileHandler.read_file(SEROTONIN_XYZ), 3],
+        ]
+    )
+    def test_run_from_xyz_with_watchdogs(self, xyz, max_cycles):
+
+        memo = MemoCache()
+        xtb_runner = XtbRunner(memo=memo)
+
+        result = xtb_runner.run_from_xyz(
+            xyz, watchdogs=[MaxOptimizationCycles(max_cycles)]
+        )
+        self.assertTrue(result["aborted"])
+        self.assertIn(str(max_cycles), result["abort_reason"])
+        self.assertEqual(len(memo), 0)
+
+        result = xtb_runner.run_from_xyz(
+            xyz, watchdogs=[lambda event: None, NoEnergyDecrease(max_cycles)]
+        )
+        self.assertNotIn("aborted", result)
+
+    @parameterized.expand(
+        [
+            [FileHandler.read_file(SEROTONIN_XYZ)],
+        ]
+    )
+    def test_run_from_xyz_with_sidecars(self, xyz):
+
+        xtb_runner = XtbRunner(use_sidecars=True)
+        result = xtb_runner.run_from_xyz(xyz)
+
+        # charges written by xtb take precedence over the standard output
+        with_stdout = XtbRunner().run_from_xyz(xyz)
+        self.assertEqual(sorted(result), sorted(with_stdout))
+        self.assertEqual(result["energy"], with_stdout["energy"])
+
+    @unittest.skipIf(np is None, "NumPy is not installed.")
+    @parameterized.expand(
+        [
+            [FileHandler.read_file(SEROTONIN_XYZ), ["--hess"], (75, 75)],
+        ]
+    )
+    def test_run_from_xyz_with_hessian(self, xyz, parameters, expected_shape):
+
+        xtb_runner = XtbRunner()
+        result = xtb_runner.run_from_xyz(xyz, parameters=parameters)
+        self.assertEqual(result["hessian"].shape, expected_shape)
+
+        result = xtb_runner.run_from_xyz(xyz, parameters=parameters, fields=["hessian"])
+        self.assertEqual(list(result), ["hessian"])
+
+    @unittest.skipIf(np is None, "NumPy is not installed.")
+    @parameterized.expand(
+        [
+            [FileHandler.read_file(SEROTONIN_XYZ), (25, 3)],
+        ]
+    )
+    def test_run_from_xyz_with_gradient(self, xyz, expected_shape):
+
+        xtb_runner = XtbRunner()
+        result = xtb_runner.run_from_xyz(xyz, parameters=["--grad"])
+        self.assertEqual(result["gradient"].shape, expected_shape)
+
+        result = xtb_runner.run_from_xyz(
+            xyz, parameters=["--grad"], fields=["energy", "gradient"]
+        )
+        self.assertEqual(sorted(result), ["energy", "gradient"])
+
+    @unittest.skipIf(np is None, "NumPy is not installed.")
+    @parameterized.expand(
+        [
+            [
+                [FileHandler.read_file(SEROTONIN_XYZ), "O 0 0 0\nO 0 0 1"] * 2,
+                (4, 25, 3),
+            ],
+        ]
+    )
+    def test_run_gradient_batch(self, structures, expected_shape):
+
+        xtb_runner = XtbRunner()
+        energies, gradients = xtb_runner.run_gradient_batch(structures, max_workers=2)
+
+        self.assertEqual(gradients.shape, expected_shape)
+        self.assertEqual(energies.shape, expected_shape[:1])
+        # failed jobs are marked by NaN
+        self.assertEqual(np.isnan(energies).tolist(), [False, True, False, True])
+        self.assertTrue(np.isnan(gradients[1]).all())
+        self.assertFalse(np.isnan(gradients[2]).any())
+
+        with self.assertRaises(BatchError) as context:
+            xtb_runner.run_gradient_batch(structures, raise_on_error=True)
+        self.assertEqual(sorted(context.exception.errors), [1, 3])
+        self.assertIsInstance(context.exception.__cause__, SubprocessError)
+
+    @parameterized.expand(
+        [
+            [FileHandler.read_file(SEROTONIN_XYZ)],
+        ]
+    )
+    def test_run_from_xyz_with_restart_store(self, xyz):
+
+        store_directory = tempfile.mkdtemp()
+        try:
+            restart_store = RestartStore(store_directory)
+            xtb_runner = XtbRunner(restart_store=restart_store)
+
+            xtb_runner.run_from_xyz(xyz)
+            self.assertEqual(restart_store.info()["misses"], 1)
+            self.assertEqual(len(restart_store), 1)
+
+            xtb_runner.run_from_xyz(xyz, parameters=["--opt"])
+            self.assertEqual(restart_store.info()["hits"], 1)
+
+            # a different charge state does not reuse the wavefunction
+            xtb_runner.run_from_xyz(xyz, parameters=["--chrg 1"])
+            self.assertEqual(restart_store.info()["misses"], 2)
+            self.assertEqual(len(restart_store), 2)
+        finally:
+            shutil.rmtree(store_directory)
+
+    @parameterized.expand(
+        [
+            [FileHandler.read_file(SEROTONIN_XYZ), "keep_on_failure", 1],
+            [FileHandler.read_file(SEROTONIN_XYZ), "delete", 0],
+        ]
+    )
+    def test_run_from_xyz_with_watchdogs_keeps_partial_output(
+        self, xyz, cleanup, expected_directories
+    ):
+
+        working_directory = tempfile.mkdtemp()
+        try:
+            xtb_runner = XtbRunner(working_directory, cleanup=cleanup)
+            result = xtb_runner.run_from_xyz(xyz, watchdogs=[MaxOptimizationCycles(1)])
+            self.assertTrue(result["aborted"])
+
+            job_directories = os.listdir(working_directory)
+            self.assertEqual(len(job_directories), expected_directories)
+            for job_directory in job_directories:
+                stdout_path = os.path.join(
+                    working_directory, job_directory, "xtb.stdout"
+                )
+                self.assertGreater(os.path.getsize(stdout_path), 0)
+        finally:
+            shutil.rmtree(working_directory)
+
+    @parameterized.expand(
+        [
+            [
+                [FileHandler.read_file(SEROTONIN_XYZ), "O 0 0 0\nO 0 0 1"],
+                [None, SubprocessError],
+            ],
+        ]
+    )
+    def test_run_batch_with_process_pool(self, structures, expected_errors):
+
+        store_directory = tempfile.mkdtemp()
+        try:
+            xtb_runner = XtbRunner(
+                memo=MemoCache(),
+                restart_store=RestartStore(store_directory),
+            )
+            xtb_runner.run_from_xyz(structures[0])
+
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                results = xtb_runner.run_batch(structures, executor=executor)
+        finally:
+            shutil.rmtree(store_directory)
+
+        for result, expected_error in zip(results, expected_errors):
+            if expected_error is None:
+                self.assertIsNone(result.error)
+                self.assertIn("energy", result.output)
+            else:
+                self.assertIsInstance(result.error, expected_error)
+
+    @parameterized.expand([[FileHandler.read_file(SEROTONIN_XYZ)]])
+    def test_run_from_xyz_with_shared_memory(self, xyz):
+
+        if not os.path.isdir("/dev/shm"):
+            self.skipTest("/dev/shm is not available.")
+
+        name = f"test_{uuid.uuid4().hex}"
+        working_directory = os.path.join(tempfile.gettempdir(), name)
+        shared_memory_directory = os.path.join("/dev/shm/uxtbpy", name)
+        try:
+            xtb_runner = XtbRunner(
+                working_directory, cleanup="keep", use_shared_memory=True
+            )
+            xtb_runner.run_from_xyz(xyz)
+
+            self.assertFalse(os.path.exists(working_directory))
+            self.assertEqual(len(os.listdir(shared_memory_directory)), 1)
+        finally:
+            shutil.rmtree(shared_memory_directory, ignore_errors=True)
+
+    @parameterized.expand([[[FileHandler.read_file(SEROTONIN_XYZ)]]])
+    def test_run_batch_with_scheduler_and_process_pool(self, structures):
+
+        xtb_runner = XtbRunner(scheduler=CoreScheduler(total_cores=2))
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            with self.assertRaises(ValueError):
+                xtb_runner.run_batch(structures, executor=executor)
+            with self.assertRaises(ValueError):
+                xtb_runner.iter_batch(structures, executor=executor)
@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+import unittest
+from parameterized import parameterized
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from . import SEROTONIN_XTB_STDOUT, SEROTONIN_XTB_SIDECARS
+from uxtbpy.file_handler import FileHandler
+from uxtbpy.xtb_output_parser import XtbOutputParser
+from uxtbpy.xtb_sidecar_loader import XtbSidecarLoader
+
+
+class TestXtbSidecarLoader(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+
+        shutil.rmtree(self.directory)
+
+    def copy_files(self, sidecar_files, with_stdout=True):
+
+        for file_name in sidecar_files:
+            shutil.copy(os.path.join(SEROTONIN_XTB_SIDECARS, file_name), self.directory)
+
+        if with_stdout:
+            shutil.copy(
+                SEROTONIN_XTB_STDOUT, os.path.join(self.directory, "xtb.stdout")
+            )
+
+    @parameterized.expand(
+        [
+            [
+                [
+                    "energy",
+                    "homo_lumo_gap",
+                    "homo_energy",
+                    "lumo_energy",
+                    "atomic_partial_charges",
+                    "wiberg_index_matrix",
+                    "vibrational_frequencies",
+                    "atomic_numbers",
+                    "optimized_atomic_positions",
+                ]
+            ],
+        ]
+    )
+    def test_load(self, matching_fields):
+
+        self.copy_files(os.listdir(SEROTONIN_XTB_SIDECARS))
+
+        result = XtbSidecarLoader().load(self.directory)
+        expected = XtbOutputParser().parse(FileHandler.read_file(SEROTONIN_XTB_STDOUT))
+
+        self.assertEqual(sorted(result), sorted(expected))
+        for field in matching_fields:
+            self.assertEqual(result[field], expected[field])
+        self.assertAlmostEqual(
+            result["dipole_moment"], expected["dipole_moment"], places=2
+        )
+        self.assertEqual(len(result["ir_intensities"]), 75)
+
+    @parameterized.expand(
+        [
+            [["energy", "atomic_partial_charges", "vibrational_frequencies"]],
+        ]
+    )
+    def test_load_without_stdout(self, fields):
+
+        self.copy_files(os.listdir(SEROTONIN_XTB_SIDECARS), with_stdout=False)
+
+        result = XtbSidecarLoader().load(self.directory, fields=fields + ["zpve"])
+        self.assertEqual(sorted(result), sorted(fields))
+
+    @parameterized.expand(
+        [
+            [["charges"], "energy"],
+            [[], "atomic_partial_charges"],
+        ]
+    )
+    def test_load_with_stdout_fallback(self, sidecar_files, field):
+
+        self.copy_files(sidecar_files)
+
+        result = XtbSidecarLoader().load(self.directory, fields=[field])
+        expected = XtbOutputParser().parse(
+            FileHandler.read_file(SEROTONIN_XTB_STDOUT), fields=[field]
+        )
+        self.assertEqual(result, expected)
+
+    @parameterized.expand([[["wbo", "charges"], 25]])
+    def test_load_with_sparse_wiberg(self, sidecar_files, expected_n_atoms):
+
+        self.copy_files(sidecar_files, with_stdout=False)
+
+        dense = XtbSidecarLoader().load(self.directory)["wiberg_index_matrix"]
+        sparse = XtbSidecarLoader(sparse_wiberg=True).load(self.directory)[
+            "wiberg_index_matrix"
+        ]
+        self.assertEqual(sparse.n_atoms, expected_n_atoms)
+        self.assertEqual(sparse.to_dense(), dense)
+
+    @unittest.skipIf(np is None, "NumPy is not installed.")
+    def test_load_as_arrays(self):
+
+        self.copy_files(os.listdir(SEROTONIN_XTB_SIDECARS), with_stdout=False)
+
+        result = XtbSidecarLoader(as_arrays=True).load(self.directory)
+        self.assertEqual(result["optimized_atomic_positions"].shape, (25, 3))
+        self.assertEqual(result["wiberg_index_matrix"].shape, (25, 25))
+        self.assertEqual(result["vibrational_frequencies"].dtype, np.float64)
@@ -0,0 +1,100 @@
+import unittest
+from parameterized import parameterized
+
+from . import SEROTONIN_XTB_STDOUT
+from uxtbpy.xtb_output_parser import XtbOutputParser
+from uxtbpy.xtb_stream_parser import XtbStreamParser
+
+
+class TestXtbStreamParser(unittest.TestCase):
+
+    @parameterized.expand(
+        [
+            [SEROTONIN_XTB_STDOUT, 1],
+            [SEROTONIN_XTB_STDOUT, 97],
+            [SEROTONIN_XTB_STDOUT, 65536],
+        ]
+    )
+    def test_feed(self, output_file, chunk_size):
+
+        with open(output_file, "rb") as file:
+            data = file.read()
+
+        stream_parser = XtbStreamParser()
+        for start in range(0, len(data), chunk_size):
+            end = start + chunk_size
+            stream_parser.feed(data[start:end])
+        stream_parser.close()
+
+        self.assertEqual(
+            stream_parser.result, XtbOutputParser().parse(data.decode("utf-8"))
+        )
+
+    @parameterized.expand([[SEROTONIN_XTB_STDOUT, 97, 64]])
+    def test_feed_retains_tail(self, output_file, chunk_size, max_retained_lines):
+
+        with open(output_file, "rb") as file:
+            data = file.read()
+
+        stream_parser = XtbStreamParser()
+        for start in range(0, len(data), chunk_size):
+            end = start + chunk_size
+            stream_parser.feed(data[start:end])
+
+            retained_lines = 0
+            for index in range(len(stream_parser.lines) - 1, -1, -1):
+                try:
+                    stream_parser.lines[index]
+                except IndexError:
+                    break
+                retained_lines += 1
+            self.assertLessEqual(retained_lines, max_retained_lines)
+
+        stream_parser.close()
+        self.assertEqual(len(stream_parser.lines), data.decode("utf-8").count("\n") + 1)
+        with self.assertRaises(IndexError):
+            stream_parser.lines[0]
+
+    @parameterized.expand(
+        [
+            [SEROTONIN_XTB_STDOUT, 16, -37.4415671, 0.0004648],
+        ]
+    )
+    def test_optimization_events(
+        self, output_file, expected_cycles, expected_energy, expected_gradient_norm
+    ):
+
+        with open(output_file, "rb") as file:
+            data = file.read()
+
+        events = []
+        stream_parser = XtbStreamParser(callback=events.append)
+        stream_parser.feed(data)
+        stream_parser.close()
+
+        cycles = [event for event in events if event.kind == "optimization_cycle"]
+        self.assertEqual(len(cycles), expected_cycles)
+        self.assertEqual(cycles[-1].data["energy"], expected_energy)
+        self.assertEqual(cycles[-1].data["gradient_norm"], expected_gradient_norm)
+        self.assertTrue(any(event.kind == "optimization_converged" for event in events))
+        self.assertTrue(any(event.kind == "scf_iteration" for event in events))
+
+    @parameterized.expand([[SEROTONIN_XTB_STDOUT, 16]])
+    def test_optimization_events_with_indented_lines(
+        self, output_file, expected_cycles
+    ):
+
+        with open(output_file, "r") as file:
+            data = "".join("   " + line for line in file)
+
+        events = []
+        stream_parser = XtbStreamParser(callback=events.append)
+        stream_parser.feed(data)
+        stream_parser.close()
+
+        cycles = [
+            event.data["cycle"]
+            for event in events
+            if event.kind == "optimization_cycle"
+        ]
+        self.assertEqual(cycles, list(range(1, expected_cycles + 1)))
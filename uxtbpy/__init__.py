@@ -2,3 +2,31 @@ from .xtb_runner import XtbRunner  # noqa: F401
 from .xtb_output_parser import XtbOutputParser  # noqa: F401
 from .stda_runner import StdaRunner  # noqa: F401
 from .stda_output_parser import StdaOutputParser  # noqa: F401
+from .async_xtb_runner import AsyncXtbRunner  # noqa: F401
+from .async_stda_runner import AsyncStdaRunner  # noqa: F401
+from .core_scheduler import CoreScheduler  # noqa: F401
+from .result_cache import ResultCache  # noqa: F401
+from .memo_cache import MemoCache  # noqa: F401
+from .wiberg_matrix import WibergMatrix  # noqa: F401
+from .xtb_stream_parser import XtbStreamParser, StreamEvent  # noqa: F401
+from .xtb_sidecar_loader import XtbSidecarLoader  # noqa: F401
+from .hessian_loader import HessianLoader  # noqa: F401
+from .gradient_loader import GradientLoader  # noqa: F401
+from .seminumerical_hessian import SeminumericalHessian  # noqa: F401
+from .restart_store import RestartStore  # noqa: F401
+from .screening_funnel import (  # noqa: F401
+    ScreeningFunnel,
+    ScreeningCandidate,
+    XtbStage,
+    StdaStage,
+    CandidateFilter,
+    EnergyWindow,
+    TopK,
+)
+from .watchdog import (  # noqa: F401
+    Watchdog,
+    MaxOptimizationCycles,
+    MaxWallTime,
+    NoEnergyDecrease,
+    ScfNotConverging,
+)
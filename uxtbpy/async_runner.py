@@ -0,0 +1,204 @@
+import os
+import asyncio
+import subprocess
+from contextlib import asynccontextmanager
+
+from .runner import Runner
+from .batch_result import BatchResult
+from .scratch_directory import KEEP_ON_FAILURE
+
+
+class AsyncRunner(Runner):
+    """Abstract adapter class for interfacing binaries from asyncio code."""
+
+    def __init__(
+        self,
+        working_directory: str = "./.temp/",
+        cleanup: str = KEEP_ON_FAILURE,
+        use_shared_memory: bool = False,
+        max_concurrency: int = None,
+    ):
+        """Constructor.
+
+        Arguments:
+            working_directory (str): The path to the root directory in which the per-job scratch directories
+             are created.
+            cleanup (str): The cleanup policy for the scratch directories. One of "keep", "delete" and
+             "keep_on_failure".
+            use_shared_memory (bool): Flag indicating whether to create the scratch directories on /dev/shm. Takes
+             precedence over the location of the working directory, whose name is used for the root directory
+             /dev/shm/uxtbpy/<name>. Falls back to the working directory if /dev/shm is not available.
+            max_concurrency (int): The maximum number of concurrently running jobs. Defaults to the number of CPUs.
+        """
+
+        super().__init__(
+            working_directory, cleanup=cleanup, use_shared_memory=use_shared_memory
+        )
+
+        self._max_concurrency = max_concurrency or os.cpu_count() or 1
+        self._semaphore = None
+
+    @asynccontextmanager
+    async def _concurrency_limit(self):
+        """Waits until fewer than the maximum number of jobs are running and occupies a slot for one job."""
+
+        # created lazily so that the semaphore is bound to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async with self._semaphore:
+            yield
+
+    @staticmethod
+    async def run_binary(
+        binary_name: str,
+        parameters: list,
+        working_directory: str = "./",
+        write_stdout: bool = False,
+        write_stderr: bool = False,
+        redirect_output: bool = False,
+    ):
+        """Excutes a given binary with a given list of parameters in a given working directory without blocking
+        the event loop. If the awaiting task is cancelled the child process is killed.
+
+        Arguments:
+            binary_name (str): The binary.
+            parameters (list[str]): The list of arguments to append to the binary call.
+            working_directory (str): The path to the directory from which the interfaced binary will be launched.
+            write_stdout (bool): Flag indicating whether to write stdout to disk.
+            write_stderr (bool): Flag indiating whether to write stderr to disk.
+            redirect_output (bool): Flag indicating whether to connect stdout and stderr of the process directly to
+             <binary>.stdout and <binary>.stderr in the working directory instead of capturing them in memory. The
+             returned stdout is None and the stderr is read back from disk. Overrides write_stdout and write_stderr.
+
+        Returns:
+            CompletedProcess: The CompletedProcess object.
+
+        Raises:
+            SubprocessError: If the execution of the binary failed.
+        """
+
+        working_directory = os.path.abspath(working_directory)
+        arguments = [Runner.resolve_binary(binary_name)] + list(parameters)
+
+        if redirect_output:
+            with Runner._output_files(binary_name, working_directory) as (
+                stdout_file,
+                stderr_file,
+            ):
+                process = await asyncio.create_subprocess_exec(
+                    *arguments,
+                    stdout=stdout_file,
+                    stderr=stderr_file,
+                    cwd=working_directory,
+                )
+                await AsyncRunner._communicate(process)
+
+            return Runner._process_redirected_result(
+                binary_name,
+                subprocess.CompletedProcess(arguments, process.returncode),
+                working_directory,
+            )
+
+        process = await asyncio.create_subprocess_exec(
+            *arguments,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=working_directory,
+        )
+
+        stdout, stderr = await AsyncRunner._communicate(process)
+
+        result = subprocess.CompletedProcess(
+            arguments, process.returncode, stdout, stderr
+        )
+
+        return Runner._process_result(
+            binary_name,
+            result,
+            working_directory,
+            write_stdout=write_stdout,
+            write_stderr=write_stderr,
+        )
+
+    @staticmethod
+    async def _communicate(process: asyncio.subprocess.Process):
+        """Waits for a child process to exit and collects its captured output. If the awaiting task is cancelled
+        the child process is killed.
+
+        Arguments:
+            process (Process): The child process.
+
+        Returns:
+            tuple[bytes]: The captured stdout and stderr or None for streams that are not captured.
+        """
+
+        try:
+            return await process.communicate()
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+
+    async def _run_batch_job(
+        self, index: int, method_name: str, args: tuple, kwargs: dict
+    ):
+        """Executes a single job of a batch and captures its outcome.
+
+        Arguments:
+            index (int): The position of the job in the batch.
+            method_name (str): The name of the runner coroutine method to call.
+            args (tuple): The positional arguments of the call.
+            kwargs (dict): The keyword arguments of the call.
+
+        Returns:
+            BatchResult: The result of the job.
+        """
+
+        try:
+            return BatchResult(
+                index, output=await getattr(self, method_name)(*args, **kwargs)
+            )
+        except Exception as error:
+            return BatchResult(index, error=error)
+
+    async def _iter_batch(self, jobs: list):
+        """Executes a list of jobs concurrently and yields their results as they complete.
+
+        Exceptions raised by individual jobs are collected in the corresponding results instead of
+        aborting the whole batch. Leaving the iteration early cancels the outstanding jobs.
+
+        Arguments:
+            jobs (list[tuple]): The jobs given as (method name, args, kwargs) tuples.
+
+        Yields:
+            BatchResult: The result of each job.
+        """
+
+        tasks = [
+            asyncio.ensure_future(self._run_batch_job(index, *job))
+            for index, job in enumerate(jobs)
+        ]
+
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_batch(self, jobs: list):
+        """Executes a list of jobs concurrently and returns their results in submission order.
+
+        Arguments:
+            jobs (list[tuple]): The jobs given as (method name, args, kwargs) tuples.
+
+        Returns:
+            list[BatchResult]: The result of each job.
+        """
+
+        return await asyncio.gather(
+            *[self._run_batch_job(index, *job) for index, job in enumerate(jobs)]
+        )
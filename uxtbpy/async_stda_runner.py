@@ -0,0 +1,308 @@
+import os
+import asyncio
+
+from .runner import Runner
+from .async_runner import AsyncRunner
+from .tools import split_parameters, resolve_paths
+from .file_handler import FileHandler
+from .subprocess_error import SubprocessError
+from .scratch_directory import KEEP_ON_FAILURE
+from .stda_output_parser import StdaOutputParser
+
+
+class AsyncStdaRunner(AsyncRunner):
+    """Adapter class for running stda jobs from asyncio code."""
+
+    def __init__(
+        self,
+        working_directory: str = "./.temp/",
+        cleanup: str = KEEP_ON_FAILURE,
+        use_shared_memory: bool = False,
+        max_concurrency: int = None,
+    ):
+        """Constructor.
+
+        Arguments:
+            working_directory (str): The path to the root directory in which each stda pipeline is launched in
+             its own new scratch directory. Relative paths in the parameters of run() are resolved against the
+             current directory.
+            cleanup (str): The cleanup policy for the per-job scratch directories. One of "keep", "delete"
+             and "keep_on_failure". With the default, the files written by successful jobs, e.g. xtbopt.xyz and
+             xtbrestart, are deleted together with their scratch directory.
+            use_shared_memory (bool): Flag indicating whether to create the scratch directories on /dev/shm. Takes
+             precedence over the location of the working directory, whose name is used for the root directory
+             /dev/shm/uxtbpy/<name>. Falls back to the working directory if /dev/shm is not available.
+            max_concurrency (int): The maximum number of concurrent stda pipelines. Defaults to the number of CPUs.
+        """
+
+        super().__init__(
+            working_directory,
+            cleanup=cleanup,
+            use_shared_memory=use_shared_memory,
+            max_concurrency=max_concurrency,
+        )
+
+    def check(self):
+        """Checks if xtb4stda and stda are available on the system.
+
+        Raises:
+            RunTimeError: If xtb4stda or stda is not available.
+        """
+
+        Runner.check_binary("xtb4stda")
+        Runner.check_binary("stda")
+
+    async def run(
+        self,
+        xtb4stda_parameters: list = [],
+        stda_parameters: list = [],
+        fields: list = None,
+    ):
+        """Executes the stda pipeline with the given parameters and returns the parsed output.
+
+        Arguments:
+            xtb4stda_parameters (list[str]): The parameters to append to the xtb4stda call.
+            stda_parameters (list[str]): The parameters to append to the stda call.
+            fields (list[str]): The names of the fields to extract from the stda output. If None, all fields are
+             extracted.
+
+        Returns:
+            dict: The parsed stda output.
+
+        Raises:
+            SubprocessError: If the stda job failed.
+        """
+
+        async with self._concurrency_limit():
+            with self._scratch_directory() as directory:
+                return await self._run_in_directory(
+                    directory,
+                    resolve_paths(split_parameters(xtb4stda_parameters)),
+                    resolve_paths(split_parameters(stda_parameters)),
+                    fields=fields,
+                )
+
+    async def _run_in_directory(
+        self,
+        directory: str,
+        xtb4stda_arguments: list,
+        stda_arguments: list,
+        fields: list = None,
+    ):
+        """Executes the stda pipeline with the given arguments in the given directory and returns the parsed output.
+
+        Arguments:
+            directory (str): The path to the directory from which xtb4stda and stda will be launched.
+            xtb4stda_arguments (list[str]): The arguments to pass verbatim to the xtb4stda call.
+            stda_arguments (list[str]): The arguments to pass verbatim to the stda call.
+            fields (list[str]): The names of the fields to extract from the stda output. If None, all fields are
+             extracted.
+
+        Returns:
+            dict: The parsed stda output.
+
+        Raises:
+            SubprocessError: If the stda job failed.
+        """
+
+        result = await AsyncRunner.run_binary(
+            "xtb4stda",
+            xtb4stda_arguments,
+            working_directory=directory,
+            redirect_output=True,
+        )
+
+        if result.stderr.decode("utf-8") != "":
+            raise SubprocessError(
+                f"xtb4stda failed with standard error: {result.returncode}.",
+                result,
+            )
+        await AsyncRunner.run_binary(
+            "stda",
+            ["-xtb"] + stda_arguments,
+            working_directory=directory,
+            redirect_output=True,
+        )
+
+        # parsing is CPU bound and runs in a worker thread to keep the event loop responsive
+        return await asyncio.to_thread(
+            StdaOutputParser().parse_file,
+            os.path.join(directory, "stda.stdout"),
+            fields=fields,
+        )
+
+    async def run_from_file(
+        self,
+        file_path: str,
+        xtb4stda_parameters: list = [],
+        stda_parameters: list = [],
+        fields: list = None,
+    ):
+        """Executes the stda pipeline with the given file and parameters and returns the parsed output.
+
+        Arguments:
+            file_path (str): The (relative/absolute) path to the molecule file.
+            xtb4stda_parameters (list[str]): The parameters to append to the xtb4stda call.
+            stda_parameters (list[str]): The parameters to append to the stda call.
+            fields (list[str]): The names of the fields to extract from the stda output. If None, all fields are
+             extracted.
+
+        Returns:
+            dict: The parsed stda output.
+
+        Raises:
+            FileNotFoundError: If the specified file does not exist.
+        """
+
+        if os.path.exists(file_path):
+            file_path = os.path.abspath(file_path)
+        else:
+            raise FileNotFoundError("The specified file does not exist.")
+
+        async with self._concurrency_limit():
+            with self._scratch_directory() as directory:
+                return await self._run_in_directory(
+                    directory,
+                    [file_path] + split_parameters(xtb4stda_parameters),
+                    split_parameters(stda_parameters),
+                    fields=fields,
+                )
+
+    async def run_from_molecule_data(
+        self,
+        molecule_data: str,
+        file_extension: str,
+        xtb4stda_parameters: list = [],
+        stda_parameters: list = [],
+        fields: list = None,
+    ):
+        """Executes the stda pipeline with the given molecule data and parameters and returns the parsed output.
+
+        Arguments:
+            molecule_data (str): The contents of the molecule file.
+            file_extension (str): The file extension corresponding to the formatting of the molecule file.
+            xtb4stda_parameters (list[str]): The parameters to append to the xtb4stda call.
+            stda_parameters (list[str]): The parameters to append to the stda call.
+            fields (list[str]): The names of the fields to extract from the stda output. If None, all fields are
+             extracted.
+
+        Returns:
+            dict: The parsed stda output.
+
+        Raises:
+            SubprocessError: If stda job failed.
+        """
+
+        async with self._concurrency_limit():
+            with self._scratch_directory() as directory:
+                file_path = os.path.join(directory, "mol." + file_extension)
+                FileHandler.write_file(file_path, molecule_data)
+
+                return await self._run_in_directory(
+                    directory,
+                    [file_path] + split_parameters(xtb4stda_parameters),
+                    split_parameters(stda_parameters),
+                    fields=fields,
+                )
+
+    async def run_from_xyz(
+        self,
+        xyz: str,
+        xtb4stda_parameters: list = [],
+        stda_parameters: list = [],
+        fields: list = None,
+    ):
+        """Executes the stda pipeline with the given xyz data and parameters and returns the parsed output.
+
+        Arguments:
+            xyz (str): The xyz formatted data of the molecule.
+            xtb4stda_parameters (list[str]): The parameters to append to the xtb4stda call.
+            stda_parameters (list[str]): The parameters to append to the stda call.
+            fields (list[str]): The names of the fields to extract from the stda output. If None, all fields are
+             extracted.
+
+        Returns:
+            dict: The parsed stda output.
+
+        Raises:
+            SubprocessError: If stda job failed.
+        """
+
+        return await self.run_from_molecule_data(
+            xyz,
+            "xyz",
+            xtb4stda_parameters=xtb4stda_parameters,
+            stda_parameters=stda_parameters,
+            fields=fields,
+        )
+
+    def iter_batch(
+        self,
+        structures: list,
+        xtb4stda_parameters: list = [],
+        stda_parameters: list = [],
+        fields: list = None,
+    ):
+        """Executes the stda pipeline for each of the given xyz data concurrently and asynchronously yields the
+        results as they complete.
+
+        Arguments:
+            structures (list[str]): The xyz formatted data of the molecules.
+            xtb4stda_parameters (list[str]): The parameters to append to each xtb4stda call.
+            stda_parameters (list[str]): The parameters to append to each stda call.
+            fields (list[str]): The names of the fields to extract from the stda output. If None, all fields are
+             extracted.
+
+        Yields:
+            BatchResult: The result of each job holding either the parsed stda output or the raised exception.
+        """
+
+        return self._iter_batch(
+            self._batch_jobs(structures, xtb4stda_parameters, stda_parameters, fields)
+        )
+
+    async def run_batch(
+        self,
+        structures: list,
+        xtb4stda_parameters: list = [],
+        stda_parameters: list = [],
+        fields: list = None,
+    ):
+        """Executes the stda pipeline for each of the given xyz data concurrently and returns the results in
+        submission order.
+
+        Arguments:
+            structures (list[str]): The xyz formatted data of the molecules.
+            xtb4stda_parameters (list[str]): The parameters to append to each xtb4stda call.
+            stda_parameters (list[str]): The parameters to append to each stda call.
+            fields (list[str]): The names of the fields to extract from the stda output. If None, all fields are
+             extracted.
+
+        Returns:
+            list[BatchResult]: The results holding either the parsed stda output or the raised exception.
+        """
+
+        return await self._run_batch(
+            self._batch_jobs(structures, xtb4stda_parameters, stda_parameters, fields)
+        )
+
+    @staticmethod
+    def _batch_jobs(
+        structures: list,
+        xtb4stda_parameters: list,
+        stda_parameters: list,
+        fields: list,
+    ):
+
+        return [
+            (
+                "run_from_xyz",
+                (xyz,),
+                {
+                    "xtb4stda_parameters": xtb4stda_parameters,
+                    "stda_parameters": stda_parameters,
+                    "fields": fields,
+                },
+            )
+            for xyz in structures
+        ]
@@ -0,0 +1,240 @@
+import os
+import asyncio
+
+from .runner import Runner
+from .async_runner import AsyncRunner
+from .tools import split_parameters, resolve_paths
+from .file_handler import FileHandler
+from .scratch_directory import KEEP_ON_FAILURE
+from .xtb_output_parser import XtbOutputParser
+
+
+class AsyncXtbRunner(AsyncRunner):
+    """Adapter class for running xtb jobs from asyncio code."""
+
+    def __init__(
+        self,
+        working_directory: str = "./.temp/",
+        cleanup: str = KEEP_ON_FAILURE,
+        use_shared_memory: bool = False,
+        max_concurrency: int = None,
+        as_arrays: bool = False,
+        sparse_wiberg: bool = False,
+    ):
+        """Constructor.
+
+        Arguments:
+            working_directory (str): The path to the root directory in which each xtb job is launched in its own
+             new scratch directory. Relative paths in the parameters of run() are resolved against the current
+             directory.
+            cleanup (str): The cleanup policy for the per-job scratch directories. One of "keep", "delete"
+             and "keep_on_failure". With the default, the files written by successful jobs, e.g. xtbopt.xyz and
+             xtbrestart, are deleted together with their scratch directory.
+            use_shared_memory (bool): Flag indicating whether to create the scratch directories on /dev/shm. Takes
+             precedence over the location of the working directory, whose name is used for the root directory
+             /dev/shm/uxtbpy/<name>. Falls back to the working directory if /dev/shm is not available.
+            max_concurrency (int): The maximum number of concurrent xtb jobs. Defaults to the number of CPUs.
+            as_arrays (bool): Flag indicating whether to return array-valued fields as float64 NumPy arrays.
+            sparse_wiberg (bool): Flag indicating whether to return the Wiberg matrix as sparse WibergMatrix.
+        """
+
+        super().__init__(
+            working_directory,
+            cleanup=cleanup,
+            use_shared_memory=use_shared_memory,
+            max_concurrency=max_concurrency,
+        )
+
+        self._as_arrays = as_arrays
+        self._sparse_wiberg = sparse_wiberg
+
+    def check(self):
+        """Checks if xtb is available on the system.
+
+        Raises:
+            RunTimeError: If xtb is not available.
+        """
+
+        Runner.check_binary("xtb")
+
+    async def run(self, parameters: list = [], fields: list = None):
+        """Executes xtb with the given parameters and returns the parsed output.
+
+        Arguments:
+            parameters (list[str]): The parameters to append to the xtb call.
+            fields (list[str]): The names of the fields to extract from the xtb output. If None, all fields are
+             extracted.
+
+        Returns:
+            dict: The parsed xtb output.
+
+        Raises:
+            SubprocessError: If xtb job failed.
+        """
+
+        async with self._concurrency_limit():
+            with self._scratch_directory() as directory:
+                return await self._run_in_directory(
+                    directory,
+                    resolve_paths(split_parameters(parameters)),
+                    fields=fields,
+                )
+
+    async def _run_in_directory(
+        self, directory: str, arguments: list, fields: list = None
+    ):
+        """Executes xtb with the given arguments in the given directory and returns the parsed output.
+
+        Arguments:
+            directory (str): The path to the directory from which xtb will be launched.
+            arguments (list[str]): The arguments to pass verbatim to the xtb call.
+            fields (list[str]): The names of the fields to extract from the xtb output. If None, all fields are
+             extracted.
+
+        Returns:
+            dict: The parsed xtb output.
+
+        Raises:
+            SubprocessError: If xtb job failed.
+        """
+
+        await AsyncRunner.run_binary(
+            "xtb",
+            arguments,
+            working_directory=directory,
+            redirect_output=True,
+        )
+
+        # parsing is CPU bound and runs in a worker thread to keep the event loop responsive
+        return await asyncio.to_thread(
+            XtbOutputParser(
+                as_arrays=self._as_arrays, sparse_wiberg=self._sparse_wiberg
+            ).parse_file,
+            os.path.join(directory, "xtb.stdout"),
+            fields=fields,
+        )
+
+    async def run_from_file(
+        self, file_path: str, parameters: list = [], fields: list = None
+    ):
+        """Executes xtb with the given file and parameters and returns the parsed output.
+
+        Arguments:
+            file_path (str): The (relative/absolute) path to the molecule file.
+            parameters (list[str]): The parameters to append to the xtb call.
+            fields (list[str]): The names of the fields to extract from the xtb output. If None, all fields are
+             extracted.
+
+        Returns:
+            dict: The parsed xtb output.
+
+        Raises:
+            FileNotFoundError: If the specified file does not exist.
+            SubprocessError: If xtb job failed.
+        """
+
+        if os.path.exists(file_path):
+            file_path = os.path.abspath(file_path)
+        else:
+            raise FileNotFoundError("The specified file does not exist.")
+
+        async with self._concurrency_limit():
+            with self._scratch_directory() as directory:
+                return await self._run_in_directory(
+                    directory, [file_path] + split_parameters(parameters), fields=fields
+                )
+
+    async def run_from_molecule_data(
+        self,
+        molecule_data: str,
+        file_extension: str,
+        parameters: list = [],
+        fields: list = None,
+    ):
+        """Executes xtb with the given molecule data and parameters and returns the parsed output.
+
+        Arguments:
+            molecule_data (str): The contents of the molecule file.
+            file_extension (str): The file extension corresponding to the formatting of the molecule file.
+            parameters (list[str]): The parameters to append to the xtb call.
+            fields (list[str]): The names of the fields to extract from the xtb output. If None, all fields are
+             extracted.
+
+        Returns:
+            dict: The parsed xtb output.
+
+        Raises:
+            SubprocessError: If xtb job failed.
+        """
+
+        async with self._concurrency_limit():
+            with self._scratch_directory() as directory:
+                file_path = os.path.join(directory, "mol." + file_extension)
+                FileHandler.write_file(file_path, molecule_data)
+
+                return await self._run_in_directory(
+                    directory, [file_path] + split_parameters(parameters), fields=fields
+                )
+
+    async def run_from_xyz(self, xyz: str, parameters: list = [], fields: list = None):
+        """Executes xtb with the given xyz data and parameters and returns the parsed output.
+
+        Arguments:
+            xyz (str): The xyz formatted data of the molecule.
+            parameters (list[str]): The parameters to append to the xtb call.
+            fields (list[str]): The names of the fields to extract from the xtb output. If None, all fields are
+             extracted.
+
+        Returns:
+            dict: The parsed xtb output.
+
+        Raises:
+            SubprocessError: If xtb job failed.
+        """
+
+        return await self.run_from_molecule_data(
+            xyz, "xyz", parameters=parameters, fields=fields
+        )
+
+    def iter_batch(self, structures: list, parameters: list = [], fields: list = None):
+        """Executes xtb for each of the given xyz data concurrently and asynchronously yields the results as they
+        complete.
+
+        Arguments:
+            structures (list[str]): The xyz formatted data of the molecules.
+            parameters (list[str]): The parameters to append to each xtb call.
+            fields (list[str]): The names of the fields to extract from the xtb output. If None, all fields are
+             extracted.
+
+        Yields:
+            BatchResult: The result of each job holding either the parsed xtb output or the raised exception.
+        """
+
+        return self._iter_batch(
+            [
+                ("run_from_xyz", (xyz,), {"parameters": parameters, "fields": fields})
+                for xyz in structures
+            ]
+        )
+
+    async def run_batch(
+        self, structures: list, parameters: list = [], fields: list = None
+    ):
+        """Executes xtb for each of the given xyz data concurrently and returns the results in submission order.
+
+        Arguments:
+            structures (list[str]): The xyz formatted data of the molecules.
+            parameters (list[str]): The parameters to append to each xtb call.
+            fields (list[str]): The names of the fields to extract from the xtb output. If None, all fields are
+             extracted.
+
+        Returns:
+            list[BatchResult]: The results holding either the parsed xtb output or the raised exception.
+        """
+
+        return await self._run_batch(
+            [
+                ("run_from_xyz", (xyz,), {"parameters": parameters, "fields": fields})
+                for xyz in structures
+            ]
+        )
@@ -0,0 +1,37 @@
+class BatchResult:
+    """Class holding the outcome of a single job of a batch run."""
+
+    def __init__(self, index: int, output: dict = None, error: Exception = None):
+        """Constructor.
+
+        Arguments:
+            index (int): The position of the job in the submitted batch.
+            output (dict): The parsed output of the job.
+            error (Exception): The exception raised by the job, if any.
+        """
+
+        self.index = index
+        self.output = output
+        self.error = error
+
+    @property
+    def succeeded(self):
+        """Flag indicating whether the job finished without raising an exception."""
+
+        return self.error is None
+
+    def __repr__(self):
+        status = "succeeded" if self.succeeded else f"failed ({self.error!r})"
+        return f"BatchResult(index={self.index}, {status})"
+
+
+class BatchError(RuntimeError):
+    """Custom error for batches in which some jobs failed."""
+
+    def __init__(self, message, errors: dict):
+        super().__init__(message)
+        # exceptions raised by the failed jobs keyed by their position in the batch
+        self.errors = errors
+
+    def __reduce__(self):
+        return (self.__class__, (str(self), self.errors))
@@ -0,0 +1,97 @@
+import os
+import threading
+from contextlib import contextmanager
+
+from .tools import available_cores
+
+
+class CoreScheduler:
+    """Class for distributing a budget of CPU cores across concurrently running jobs.
+
+    Each job is granted a fixed number of OpenMP/MKL threads and is only admitted once that many cores
+    are free, so that concurrently running jobs do not oversubscribe the machine.
+    """
+
+    def __init__(
+        self,
+        total_cores: int = None,
+        threads_per_job: int = 1,
+        stack_size: str = "4G",
+    ):
+        """Constructor.
+
+        Arguments:
+            total_cores (int): The total number of cores to distribute. Defaults to the cores available to this
+             process (affinity mask and cgroup quota).
+            threads_per_job (int): The number of threads granted to each job.
+            stack_size (str): The OpenMP stack size per thread (OMP_STACKSIZE). If None, it is not set.
+
+        Raises:
+            ValueError: If the number of cores or threads is not positive.
+        """
+
+        self.total_cores = total_cores or available_cores()
+        if self.total_cores < 1 or threads_per_job < 1:
+            raise ValueError("The number of cores and threads has to be positive.")
+
+        self.threads_per_job = min(threads_per_job, self.total_cores)
+        self.stack_size = stack_size
+
+        self._free_cores = self.total_cores
+        self._condition = threading.Condition()
+
+    @property
+    def max_jobs(self):
+        """The maximum number of jobs that can run at the same time with the default thread count."""
+
+        return self.total_cores // self.threads_per_job
+
+    @property
+    def free_cores(self):
+        """The number of currently unoccupied cores."""
+
+        with self._condition:
+            return self._free_cores
+
+    def environment(self, threads: int):
+        """Builds the environment for a job running with a given number of threads.
+
+        Arguments:
+            threads (int): The number of threads granted to the job.
+
+        Returns:
+            dict: The environment variables of the job.
+        """
+
+        environment = dict(os.environ)
+        environment["OMP_NUM_THREADS"] = str(threads)
+        environment["MKL_NUM_THREADS"] = str(threads)
+        if self.stack_size is not None:
+            environment["OMP_STACKSIZE"] = self.stack_size
+
+        return environment
+
+    @contextmanager
+    def reserve(self, threads: int = None):
+        """Blocks until enough cores are free and occupies them for the duration of the context.
+
+        Arguments:
+            threads (int): The number of cores to occupy. Defaults to the scheduler's threads per job.
+
+        Yields:
+            dict: The environment variables to launch the job with.
+        """
+
+        threads = min(threads or self.threads_per_job, self.total_cores)
+
+        with self._condition:
+            while self._free_cores < threads:
+                self._condition.wait()
+            self._free_cores -= threads
+
+        try:
+            yield self.environment(threads)
+        finally:
+            with self._condition:
+                self._free_cores += threads
+                self._condition.notify_all()
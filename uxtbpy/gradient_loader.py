@@ -0,0 +1,157 @@
+import os
+import glob
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+GRADIENT_FIELDS = ["gradient"]
+
+
+class GradientLoader:
+    """Class for loading the energy and the Cartesian gradient xTB writes for --grad runs into NumPy arrays.
+
+    The gradient is read from the Turbomole-format gradient and energy files in the working directory, falling back
+    to an ORCA-format .engrad file.
+    """
+
+    def load(self, directory: str, fields: list = None):
+        """Loads the gradient and the corresponding energy available in the working directory of a job.
+
+        Arguments:
+            directory (str): The path to the working directory of the job.
+            fields (list[str]): The names of the fields to load. Of the remaining fields only the energy is loaded,
+             which is read with full precision from the gradient files. If None, the gradient and the energy are
+             loaded.
+
+        Returns:
+            dict: A dictionary containing the loaded fields or an empty dictionary if no gradient was written or
+             NumPy is not installed.
+        """
+
+        if np is None:
+            return {}
+
+        fields = GRADIENT_FIELDS + ["energy"] if fields is None else fields
+        if "gradient" not in fields and "energy" not in fields:
+            return {}
+
+        gradient_path = os.path.join(directory, "gradient")
+        engrad_paths = sorted(glob.glob(os.path.join(directory, "*.engrad")))
+
+        if os.path.isfile(gradient_path):
+            energy, gradient = self.load_gradient(gradient_path)
+
+            energy_path = os.path.join(directory, "energy")
+            if os.path.isfile(energy_path):
+                energy = self.load_energy(energy_path)
+        elif engrad_paths:
+            energy, gradient = self.load_engrad(engrad_paths[0])
+        else:
+            return {}
+
+        output_data = {}
+        if "gradient" in fields:
+            output_data["gradient"] = gradient
+        if "energy" in fields:
+            output_data["energy"] = energy
+
+        return output_data
+
+    @staticmethod
+    def load_gradient(file_path: str):
+        """Loads the energy and the gradient of the last cycle of a Turbomole-format gradient file.
+
+        Each cycle starts with a line holding the SCF energy, followed by n lines of coordinates and n lines of
+        gradient components.
+
+        Arguments:
+            file_path (str): The path to the gradient file.
+
+        Returns:
+            float: The energy in Eh.
+            ndarray: The float64 gradient of shape (n, 3) in Eh/bohr.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            ValueError: If the file holds no gradient.
+        """
+
+        if np is None:
+            raise ImportError("NumPy is required to load the gradient.")
+
+        with open(file_path, "r") as file:
+            lines = file.read().split("\n")
+
+        cycle_indices = [i for i, line in enumerate(lines) if "cycle =" in line]
+        if not cycle_indices:
+            raise ValueError("The gradient file holds no gradient.")
+
+        start = cycle_indices[-1]
+        energy = float(lines[start].split("SCF energy =")[1].split()[0])
+
+        end = start + 1
+        while end < len(lines) and not lines[end].lstrip().startswith("$"):
+            end += 1
+
+        n_atoms = (end - start - 1) // 2
+        gradient_start = start + 1 + n_atoms
+        # Fortran double precision exponents are written as D
+        values = " ".join(lines[gradient_start:end]).replace("D", "E")
+
+        return energy, np.array(values.split(), dtype=np.float64).reshape(n_atoms, 3)
+
+    @staticmethod
+    def load_energy(file_path: str):
+        """Loads the energy of the last cycle of a Turbomole-format energy file.
+
+        Arguments:
+            file_path (str): The path to the energy file.
+
+        Returns:
+            float: The energy in Eh.
+        """
+
+        with open(file_path, "r") as file:
+            lines = [
+                line.split()
+                for line in file
+                if line.strip() and not line.lstrip().startswith("$")
+            ]
+
+        return float(lines[-1][1])
+
+    @staticmethod
+    def load_engrad(file_path: str):
+        """Loads the energy and the gradient of an ORCA-format .engrad file.
+
+        Arguments:
+            file_path (str): The path to the .engrad file.
+
+        Returns:
+            float: The energy in Eh.
+            ndarray: The float64 gradient of shape (n, 3) in Eh/bohr.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+
+        if np is None:
+            raise ImportError("NumPy is required to load the gradient.")
+
+        with open(file_path, "r") as file:
+            # values are separated by comment lines: number of atoms, energy, gradient, coordinates
+            values = [
+                line.strip()
+                for line in file
+                if line.strip() and not line.startswith("#")
+            ]
+
+        n_atoms = int(values[0])
+        energy = float(values[1])
+        gradient_end = 2 + 3 * n_atoms
+        gradient = np.array(values[2:gradient_end], dtype=np.float64)
+
+        return energy, gradient.reshape(n_atoms, 3)
@@ -0,0 +1,167 @@
+import os
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+HESSIAN_FIELDS = ["hessian", "normal_modes", "normal_mode_frequencies"]
+
+
+class HessianLoader:
+    """Class for loading the Hessian and the normal modes xTB writes for --hess and --ohess runs into NumPy arrays.
+
+    The Hessian is read from the Turbomole-format hessian file and the normal modes from the Gaussian 98-format
+    g98.out file in the working directory.
+    """
+
+    def load(self, directory: str, fields: list = None):
+        """Loads the Hessian and the normal modes available in the working directory of a job.
+
+        Files that do not exist are skipped, as are all files if NumPy is not installed.
+
+        Arguments:
+            directory (str): The path to the working directory of the job.
+            fields (list[str]): The names of the fields to load. Fields that are not Hessian fields are ignored.
+             If None, all fields are loaded.
+
+        Returns:
+            dict: A dictionary containing the loaded fields.
+        """
+
+        if np is None:
+            return {}
+
+        fields = HESSIAN_FIELDS if fields is None else fields
+        output_data = {}
+
+        hessian_path = os.path.join(directory, "hessian")
+        if "hessian" in fields and os.path.isfile(hessian_path):
+            output_data["hessian"] = self.load_hessian(hessian_path)
+
+        normal_modes_path = os.path.join(directory, "g98.out")
+        if (
+            "normal_modes" in fields or "normal_mode_frequencies" in fields
+        ) and os.path.isfile(normal_modes_path):
+            frequencies, normal_modes = self.load_normal_modes(normal_modes_path)
+            if "normal_modes" in fields:
+                output_data["normal_modes"] = normal_modes
+            if "normal_mode_frequencies" in fields:
+                output_data["normal_mode_frequencies"] = frequencies
+
+        return output_data
+
+    @staticmethod
+    def load_hessian(file_path: str):
+        """Loads the Cartesian Hessian of a Turbomole-format hessian file.
+
+        The file is streamed line by line and the values between $hessian and $end are converted in a single pass
+        into the array, without holding a copy of the text in memory.
+
+        Arguments:
+            file_path (str): The path to the hessian file.
+
+        Returns:
+            ndarray: The float64 Hessian of shape (3n, 3n) in Eh/bohr².
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            ValueError: If the file does not hold a square matrix.
+        """
+
+        if np is None:
+            raise ImportError("NumPy is required to load the Hessian.")
+
+        with open(file_path, "rb") as file:
+            values = np.fromiter(
+                (
+                    float(token)
+                    for line in HessianLoader._value_lines(file)
+                    for token in line.split()
+                ),
+                dtype=np.float64,
+            )
+
+        dimension = int(round(np.sqrt(values.size)))
+        if dimension * dimension != values.size or dimension % 3 != 0:
+            raise ValueError(
+                f"The hessian file holds {values.size} values, which is no square 3n x 3n matrix."
+            )
+
+        return values.reshape(dimension, dimension)
+
+    @staticmethod
+    def _value_lines(file):
+        """Yields the lines of the $hessian data group of a Turbomole-format file.
+
+        Arguments:
+            file (BinaryIO): The opened file.
+
+        Yields:
+            bytes: The lines holding the values, including lines preceding the first data group.
+        """
+
+        in_hessian_group = True
+        for line in file:
+            stripped_line = line.lstrip()
+            if stripped_line.startswith(b"$"):
+                in_hessian_group = stripped_line.startswith(b"$hessian")
+            elif in_hessian_group:
+                yield line
+
+    @staticmethod
+    def load_normal_modes(file_path: str):
+        """Loads the vibrational frequencies and normal modes of a Gaussian 98-format g98.out file.
+
+        Arguments:
+            file_path (str): The path to the g98.out file.
+
+        Returns:
+            ndarray: The float64 frequencies in cm⁻¹ of shape (n_modes,).
+            ndarray: The float64 normal mode displacements of shape (n_modes, n_atoms, 3).
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+
+        if np is None:
+            raise ImportError("NumPy is required to load the normal modes.")
+
+        with open(file_path, "r") as file:
+            lines = file.read().split("\n")
+
+        frequencies = []
+        blocks = []
+
+        for i, line in enumerate(lines):
+
+            if not line.lstrip().startswith("Frequencies --"):
+                continue
+
+            block_frequencies = line.split("--")[1].split()
+            frequencies.extend(block_frequencies)
+
+            # the displacements follow the "Atom AN X Y Z ..." header with one row per atom
+            row_length = 2 + 3 * len(block_frequencies)
+            j = i + 1
+            while not lines[j].lstrip().startswith("Atom"):
+                j += 1
+
+            rows = []
+            row_split = lines[j + 1].split()
+            while len(row_split) == row_length:
+                rows.append(row_split[2:])
+                j += 1
+                row_split = lines[j + 1].split() if j + 1 < len(lines) else []
+
+            # (n_atoms, modes * 3) -> (modes, n_atoms, 3)
+            block = np.array(rows, dtype=np.float64)
+            blocks.append(
+                block.reshape(len(rows), len(block_frequencies), 3).transpose(1, 0, 2)
+            )
+
+        if not blocks:
+            return np.zeros(0), np.zeros((0, 0, 3))
+
+        return np.array(frequencies, dtype=np.float64), np.concatenate(blocks)
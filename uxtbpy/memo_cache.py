@@ -0,0 +1,198 @@
+import sys
+import threading
+from types import MappingProxyType
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class MemoCache:
+    """Class for memoizing parsed results in memory with least recently used eviction.
+
+    Results are stored as deeply immutable copies (read-only mappings and tuples) so that they can be
+    handed out repeatedly without being modified by the caller.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = None):
+        """Constructor.
+
+        Arguments:
+            max_entries (int): The maximum number of memoized results.
+            max_bytes (int): The maximum approximate memory footprint of the memoized results in bytes. If None,
+             only the number of entries is limited.
+        """
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # read-only mappings cannot be pickled, the entries are frozen again when unpickled
+        with self._lock:
+            state = self.__dict__.copy()
+            state["_entries"] = OrderedDict(
+                (key, (MemoCache.thaw(value), size))
+                for key, (value, size) in self._entries.items()
+            )
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict):
+        state["_entries"] = OrderedDict(
+            (key, (MemoCache.freeze(value), size))
+            for key, (value, size) in state["_entries"].items()
+        )
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def freeze(value):
+        """Builds a deeply immutable copy of a value.
+
+        Arguments:
+            value: The value consisting of dicts, lists, tuples, NumPy arrays and scalars.
+
+        Returns:
+            The immutable copy with dicts turned into read-only mappings, lists into tuples and arrays into
+            read-only arrays.
+        """
+
+        if isinstance(value, dict):
+            return MappingProxyType({k: MemoCache.freeze(v) for k, v in value.items()})
+        if isinstance(value, (list, tuple)):
+            return tuple(MemoCache.freeze(v) for v in value)
+        if np is not None and isinstance(value, np.ndarray):
+            value = value.copy()
+            value.setflags(write=False)
+
+        return value
+
+    @staticmethod
+    def thaw(value):
+        """Builds a picklable copy of a frozen value.
+
+        Arguments:
+            value: The value built by freeze.
+
+        Returns:
+            The copy with read-only mappings turned into dicts.
+        """
+
+        if isinstance(value, MappingProxyType):
+            return {k: MemoCache.thaw(v) for k, v in value.items()}
+        if isinstance(value, tuple):
+            return tuple(MemoCache.thaw(v) for v in value)
+
+        return value
+
+    @staticmethod
+    def _size_of(value):
+        """Estimates the memory footprint of a frozen value.
+
+        Arguments:
+            value: The value.
+
+        Returns:
+            int: The approximate size in bytes.
+        """
+
+        size = sys.getsizeof(value)
+        if isinstance(value, MappingProxyType):
+            size += sum(
+                sys.getsizeof(k) + MemoCache._size_of(v) for k, v in value.items()
+            )
+        elif isinstance(value, tuple):
+            size += sum(MemoCache._size_of(v) for v in value)
+
+        return size
+
+    def get(self, key):
+        """Retrieves a memoized result and marks it as recently used.
+
+        Arguments:
+            key: The hashable key.
+
+        Returns:
+            The immutable result or None if the key is not memoized.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Memoizes a result, evicting the least recently used results if necessary.
+
+        Arguments:
+            key: The hashable key.
+            value: The result.
+
+        Returns:
+            The immutable copy of the result that was memoized.
+        """
+
+        value = MemoCache.freeze(value)
+        size = MemoCache._size_of(value)
+
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+
+            self._entries[key] = (value, size)
+            self._size += size
+
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None
+                and self._size > self.max_bytes
+                and len(self._entries) > 1
+            ):
+                self._size -= self._entries.popitem(last=False)[1][1]
+
+        return value
+
+    def clear(self):
+        """Removes all memoized results and resets the statistics."""
+
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Summarizes the usage statistics.
+
+        Returns:
+            dict: The number of hits, misses, entries and the approximate size in bytes.
+        """
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._size,
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
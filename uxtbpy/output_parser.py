@@ -0,0 +1,396 @@
+import os
+import mmap
+
+
+def _line_at(data: str, position: int):
+    """Returns the line containing a given position of a string.
+
+    Arguments:
+        data (str): The string.
+        position (int): The position.
+
+    Returns:
+        str: The line.
+    """
+
+    start = data.rfind("\n", 0, position) + 1
+    end = data.find("\n", position)
+    if end == -1:
+        end = len(data)
+
+    return data[start:end]
+
+
+class _LineWindow:
+    """Class for lazily decoding the lines around a position of a memory-mapped output.
+
+    Index `context` corresponds to the line containing the position. Lines are only decoded when accessed.
+    """
+
+    def __init__(self, buffer: mmap.mmap, position: int, context: int):
+        """Constructor.
+
+        Arguments:
+            buffer (mmap): The memory-mapped output.
+            position (int): The byte position.
+            context (int): The index of the line containing the position.
+        """
+
+        self._buffer = buffer
+        self._context = context
+        # start offsets of the known lines relative to the line containing the position
+        self._starts = {0: buffer.rfind(b"\n", 0, position) + 1}
+        self._lines = {}
+
+    def _start(self, relative_index: int):
+
+        step = 1 if relative_index > 0 else -1
+
+        index = relative_index
+        while index not in self._starts:
+            index -= step
+        start = self._starts[index]
+
+        # walk line by line from the closest known line
+        while index != relative_index:
+            index += step
+            if start == -1:
+                pass
+            elif step > 0:
+                end = self._buffer.find(b"\n", start)
+                start = -1 if end == -1 else end + 1
+            else:
+                start = (
+                    -1 if start == 0 else self._buffer.rfind(b"\n", 0, start - 1) + 1
+                )
+            self._starts[index] = start
+
+        return start
+
+    def __getitem__(self, index: int):
+
+        if index in self._lines:
+            return self._lines[index]
+
+        start = self._start(index - self._context)
+        if start == -1:
+            raise IndexError("line index out of range")
+
+        end = self._buffer.find(b"\n", start)
+        if end == -1:
+            end = len(self._buffer)
+
+        line = self._buffer[start:end].decode("utf-8", errors="replace")
+        self._lines[index] = line
+
+        return line
+
+
+class OutputParser:
+    """Base class for parsers extracting fields from the output of a binary.
+
+    Fields are produced by extractors registered for keywords identifying the line at which the data is printed.
+    If a keyword occurs multiple times, the last occurrence determines the value of the field. The output is
+    therefore searched backwards for each keyword, such that the search terminates at the last occurrence and only
+    the lines from the earliest match onwards are processed.
+    """
+
+    # additional keywords located for the preparation of the extraction and the number of lines preceding them
+    # that are accessed
+    _keywords = []
+    _context = 0
+
+    def __init__(self):
+        """Constructor."""
+
+        self.lines = None
+
+        self._extractors = []
+
+    def _register(
+        self,
+        keyword: str,
+        fields: list,
+        extract,
+        offset: int = 0,
+        condition=None,
+    ):
+        """Registers an extractor for lines containing a given keyword.
+
+        Arguments:
+            keyword (str): The keyword identifying the line.
+            fields (list[str]): The names of the fields the extractor produces.
+            extract (callable): The function taking the line index and returning the value of the field or a tuple of
+             values if there are multiple fields.
+            offset (int): The offset from the keyword line to the line index passed to the extractor.
+            condition (callable): An optional predicate on the keyword line that has to be fulfilled.
+        """
+
+        self._extractors.append((keyword, tuple(fields), extract, offset, condition))
+
+    def register_extractor(
+        self, keyword: str, fields: list, extractor, offset: int = 0
+    ):
+        """Registers an additional extractor for the fields printed at a given keyword.
+
+        Arguments:
+            keyword (str): The keyword identifying the line.
+            fields (list[str]): The names of the fields the extractor produces.
+            extractor (callable): The function taking the list of output lines and a line index and returning
+             the value of the field or a tuple of values if there are multiple fields.
+            offset (int): The offset from the keyword line to the line index passed to the extractor.
+        """
+
+        self._register(
+            keyword,
+            fields,
+            lambda start_index: extractor(self.lines, start_index),
+            offset=offset,
+        )
+
+    @property
+    def fields(self):
+        """The names of all fields the parser can extract.
+
+        Returns:
+            list[str]: The field names.
+        """
+
+        return list(
+            dict.fromkeys(
+                field for extractor in self._extractors for field in extractor[1]
+            )
+        )
+
+    def _select_extractors(self, fields: list = None):
+        """Selects the extractors required to produce the given fields.
+
+        Arguments:
+            fields (list[str]): The names of the requested fields. If None, all extractors are selected.
+
+        Returns:
+            list[tuple]: The selected extractors.
+
+        Raises:
+            ValueError: If any of the fields is unknown.
+        """
+
+        if fields is None:
+            return list(self._extractors)
+
+        fields = set(fields)
+        unknown_fields = fields.difference(self.fields)
+        if unknown_fields:
+            raise ValueError(
+                f"Unknown fields {', '.join(sorted(unknown_fields))}. Choose from {', '.join(self.fields)}."
+            )
+
+        return [
+            extractor
+            for extractor in self._extractors
+            if fields.intersection(extractor[1])
+        ]
+
+    def _locate(self, data: str, extractors: list):
+        """Searches the output backwards for the last occurrence of the keyword of each extractor and splits the
+        output into lines starting at the earliest match.
+
+        Arguments:
+            data (str): The output.
+            extractors (list[tuple]): The extractors to locate.
+
+        Returns:
+            list[tuple]: The lines, line indices and extractors of all located extractors in order of appearance.
+            dict: The lines and line indices of the located additional keywords.
+        """
+
+        positions = []
+        for extractor in extractors:
+
+            keyword, condition = extractor[0], extractor[4]
+
+            position = data.rfind(keyword)
+            while (
+                position != -1
+                and condition is not None
+                and not condition(_line_at(data, position))
+            ):
+                position = data.rfind(keyword, 0, position)
+
+            if position != -1:
+                positions.append((position, extractor))
+
+        for keyword in self._keywords:
+            position = data.rfind(keyword)
+            if position != -1:
+                positions.append((position, keyword))
+
+        if not positions:
+            return [], {}
+
+        positions.sort(key=lambda match: match[0])
+
+        start = data.rfind("\n", 0, positions[0][0]) + 1
+        for _ in range(self._context):
+            if start > 0:
+                start = data.rfind("\n", 0, start - 1) + 1
+
+        lines = data[start:].split("\n")
+
+        located = []
+        located_keywords = {}
+
+        line_index = 0
+        for position, match in positions:
+            line_index += data.count("\n", start, position)
+            start = position
+            if isinstance(match, str):
+                located_keywords[match] = (lines, line_index)
+            else:
+                located.append((lines, line_index, match))
+
+        return located, located_keywords
+
+    def _locate_buffer(self, buffer: mmap.mmap, extractors: list):
+        """Searches a memory-mapped output backwards for the last occurrence of the keyword of each extractor.
+
+        Only the lines around the matches are decoded, when they are accessed by the extractors.
+
+        Arguments:
+            buffer (mmap): The memory-mapped output.
+            extractors (list[tuple]): The extractors to locate.
+
+        Returns:
+            list[tuple]: The line windows, line indices and extractors of all located extractors in order of
+             appearance.
+            dict: The line windows and line indices of the located additional keywords.
+        """
+
+        positions = []
+        for extractor in extractors:
+
+            keyword, condition = extractor[0].encode("utf-8"), extractor[4]
+
+            position = buffer.rfind(keyword)
+            while (
+                position != -1
+                and condition is not None
+                and not condition(_LineWindow(buffer, position, 0)[0])
+            ):
+                position = buffer.rfind(keyword, 0, position)
+
+            if position != -1:
+                positions.append((position, extractor))
+
+        located_keywords = {}
+        for keyword in self._keywords:
+            position = buffer.rfind(keyword.encode("utf-8"))
+            if position != -1:
+                located_keywords[keyword] = (
+                    _LineWindow(buffer, position, self._context),
+                    self._context,
+                )
+
+        positions.sort(key=lambda match: match[0])
+
+        located = [
+            (_LineWindow(buffer, position, 0), 0, extractor)
+            for position, extractor in positions
+        ]
+
+        return located, located_keywords
+
+    def _prepare(self, located_keywords: dict):
+        """Prepares the extraction from the located additional keywords.
+
+        Arguments:
+            located_keywords (dict): The lines and line indices of the located additional keywords.
+
+        Returns:
+            bool: Flag indicating whether the output can be parsed.
+        """
+
+        return True
+
+    def _extract(self, located: list, fields: list = None):
+        """Evaluates the located extractors.
+
+        Arguments:
+            located (list[tuple]): The lines, line indices and extractors in order of appearance.
+            fields (list[str]): The names of the requested fields. If None, all fields are returned.
+
+        Returns:
+            dict: A dictionary containing the extracted fields.
+        """
+
+        output_data: dict = {}
+
+        for lines, line_index, (_, extractor_fields, extract, offset, _) in located:
+
+            self.lines = lines
+
+            values = extract(line_index + offset)
+            if len(extractor_fields) == 1:
+                values = (values,)
+
+            for field, value in zip(extractor_fields, values):
+                if fields is None or field in fields:
+                    output_data[field] = value
+
+        return output_data
+
+    def parse(self, data: str, fields: list = None):
+        """Parses a given output to extract different properties.
+
+        Arguments:
+            data (str): The output.
+            fields (list[str]): The names of the fields to extract. If None, all fields are extracted.
+
+        Returns:
+            dict: A dictionary containing the different outputs.
+
+        Raises:
+            ValueError: If any of the fields is unknown.
+        """
+
+        located, located_keywords = self._locate(data, self._select_extractors(fields))
+
+        if not self._prepare(located_keywords):
+            return {}
+
+        return self._extract(located, fields)
+
+    def parse_file(self, file_path: str, fields: list = None):
+        """Parses a given output file to extract different properties.
+
+        The file is memory-mapped and searched as bytes, such that only the lines of the matched blocks are
+        decoded and the memory usage is independent of the size of the file.
+
+        Arguments:
+            file_path (str): The path to the output file.
+            fields (list[str]): The names of the fields to extract. If None, all fields are extracted.
+
+        Returns:
+            dict: A dictionary containing the different outputs.
+
+        Raises:
+            ValueError: If any of the fields is unknown.
+        """
+
+        extractors = self._select_extractors(fields)
+
+        if os.path.getsize(file_path) == 0:
+            return self.parse("", fields=fields)
+
+        with open(file_path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+
+                located, located_keywords = self._locate_buffer(buffer, extractors)
+
+                if not self._prepare(located_keywords):
+                    return {}
+
+                output_data = self._extract(located, fields)
+                self.lines = None
+
+                return output_data
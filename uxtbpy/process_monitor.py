@@ -0,0 +1,138 @@
+import os
+import time
+import signal
+import threading
+import subprocess
+
+# interval in seconds at which the limits of a monitored process are checked
+MONITOR_INTERVAL = 0.05
+
+
+def _cpu_time(pid: int):
+    """Reads the CPU time consumed by a process and its waited-for children from /proc.
+
+    Arguments:
+        pid (int): The process id.
+
+    Returns:
+        float: The user and system CPU time in seconds or None if it is not available.
+    """
+
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as stat_file:
+            stat = stat_file.read()
+    except OSError:
+        return None
+
+    # the command name may contain spaces, fields are counted from the closing parenthesis
+    start = stat.rfind(b")") + 2
+    fields = stat[start:].split()
+    utime, stime, cutime, cstime = (int(field) for field in fields[11:15])
+
+    return (utime + stime + cutime + cstime) / os.sysconf("SC_CLK_TCK")
+
+
+def signal_process_group(pid: int, signal_number: int):
+    """Sends a signal to all processes of the process group led by the given process.
+
+    Arguments:
+        pid (int): The process id of the group leader.
+        signal_number (int): The signal.
+    """
+
+    try:
+        os.killpg(pid, signal_number)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+class ProcessMonitor:
+    """Class for enforcing wall-clock and CPU time limits on a child process from a background thread.
+
+    The child has to be started in its own session, such that all processes it spawns share its process group. On
+    expiry the whole process group receives SIGTERM and, if it is still alive after the grace period, SIGKILL.
+    """
+
+    def __init__(
+        self,
+        process: subprocess.Popen,
+        timeout: float = None,
+        cpu_timeout: float = None,
+        grace_period: float = 5.0,
+    ):
+        """Constructor.
+
+        Arguments:
+            process (Popen): The child process started with start_new_session=True.
+            timeout (float): The wall-clock limit in seconds. If None, the wall-clock time is not limited.
+            cpu_timeout (float): The CPU time limit in seconds. If None, the CPU time is not limited.
+            grace_period (float): The time in seconds between SIGTERM and SIGKILL.
+        """
+
+        self.process = process
+        self.timeout = timeout
+        self.cpu_timeout = cpu_timeout
+        self.grace_period = grace_period
+
+        self.reason = None
+
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._monitor, daemon=True)
+
+    def start(self):
+        """Starts monitoring the process."""
+
+        self._thread.start()
+
+    def stop(self):
+        """Stops monitoring the process and waits for the monitor thread to finish."""
+
+        self._stopped.set()
+        self._thread.join()
+
+    @property
+    def expired(self):
+        """Flag indicating whether the process was killed because a limit expired."""
+
+        return self.reason is not None
+
+    def _monitor(self):
+
+        start_time = time.monotonic()
+
+        while not self._stopped.wait(MONITOR_INTERVAL):
+
+            if self.process.poll() is not None:
+                return
+
+            if self.timeout is not None:
+                elapsed_time = time.monotonic() - start_time
+                if elapsed_time > self.timeout:
+                    self.reason = f"Exceeded wall-clock time limit of {self.timeout} s."
+                    break
+
+            if self.cpu_timeout is not None:
+                cpu_time = _cpu_time(self.process.pid)
+                if cpu_time is not None and cpu_time > self.cpu_timeout:
+                    self.reason = f"Exceeded CPU time limit of {self.cpu_timeout} s."
+                    break
+        else:
+            return
+
+        self._kill()
+
+    def _kill(self):
+        """Terminates the process group of the process, escalating to SIGKILL after the grace period."""
+
+        self._signal(signal.SIGTERM)
+
+        deadline = time.monotonic() + self.grace_period
+        while self.process.poll() is None and time.monotonic() < deadline:
+            time.sleep(MONITOR_INTERVAL)
+
+        # remaining members of the process group are killed even if the process itself has exited
+        self._signal(signal.SIGKILL)
+
+    def _signal(self, signal_number: int):
+
+        signal_process_group(self.process.pid, signal_number)
@@ -0,0 +1,266 @@
+import os
+import math
+import time
+import uuid
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+class RestartStore:
+    """Class for keeping xtbrestart wavefunctions to warm-start the SCF of similar calculations.
+
+    Restart files are keyed by the molecule identity, i.e. the ordered element symbols, the charge and the number
+    of unpaired electrons, and matched by geometry: a stored file is used for a new calculation if the RMSD of the
+    centered positions is below the threshold. Files are evicted when they were least recently used or have not
+    been used for longer than the maximum age.
+    """
+
+    def __init__(
+        self,
+        directory: str = None,
+        max_entries: int = 64,
+        max_age: float = None,
+        rmsd_threshold: float = 0.3,
+    ):
+        """Constructor.
+
+        Arguments:
+            directory (str): The path to the directory holding the restart files. Defaults to a new temporary
+             directory.
+            max_entries (int): The maximum number of stored restart files.
+            max_age (float): The time in seconds after which unused restart files are evicted. If None, only the
+             number of entries is limited.
+            rmsd_threshold (float): The maximum RMSD in Å between the positions of a calculation and a stored
+             restart file for the file to be used.
+        """
+
+        self.directory = (
+            tempfile.mkdtemp(prefix="restart_") if directory is None else directory
+        )
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.rmsd_threshold = rmsd_threshold
+
+        self.hits = 0
+        self.misses = 0
+
+        # file name -> (identity, centered positions, time of last use)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # a copy in another process shares the directory but only evicts the restart files it stored itself
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_entries"] = OrderedDict()
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def identity(symbols: list, charge: int = 0, uhf: int = 0):
+        """Builds the identity of a molecule restart files are keyed by.
+
+        Arguments:
+            symbols (list[str]): The element symbols in input order.
+            charge (int): The molecular charge.
+            uhf (int): The number of unpaired electrons.
+
+        Returns:
+            tuple: The hashable identity.
+        """
+
+        return (tuple(symbols), int(charge), int(uhf))
+
+    @staticmethod
+    def rmsd(positions: list, other_positions: list):
+        """Computes the root-mean-square deviation of two sets of centered positions.
+
+        Arguments:
+            positions (list[tuple[float]]): The centered positions.
+            other_positions (list[tuple[float]]): The other centered positions in the same atom order.
+
+        Returns:
+            float: The RMSD.
+        """
+
+        squared_deviation = sum(
+            (a - b) ** 2
+            for position, other_position in zip(positions, other_positions)
+            for a, b in zip(position, other_position)
+        )
+
+        return math.sqrt(squared_deviation / max(len(positions), 1))
+
+    @staticmethod
+    def _center(positions: list):
+
+        n_atoms = max(len(positions), 1)
+        centroid = [
+            sum(position[i] for position in positions) / n_atoms for i in range(3)
+        ]
+
+        return [
+            tuple(position[i] - centroid[i] for i in range(3)) for position in positions
+        ]
+
+    def _match(self, identity: tuple, positions: list):
+        """Finds the stored restart file closest to the given positions within the threshold.
+
+        Arguments:
+            identity (tuple): The molecule identity.
+            positions (list[tuple[float]]): The centered positions.
+
+        Returns:
+            str: The file name or None if no stored file matches.
+        """
+
+        best_file_name, best_rmsd = None, self.rmsd_threshold
+        for file_name, (entry_identity, entry_positions, _) in self._entries.items():
+            if entry_identity != identity:
+                continue
+
+            rmsd = self.rmsd(positions, entry_positions)
+            if rmsd <= best_rmsd:
+                best_file_name, best_rmsd = file_name, rmsd
+
+        return best_file_name
+
+    def seed(
+        self,
+        directory: str,
+        symbols: list,
+        positions: list,
+        charge: int = 0,
+        uhf: int = 0,
+    ):
+        """Copies the matching restart file into the working directory of a calculation as xtbrestart.
+
+        Arguments:
+            directory (str): The path to the working directory of the calculation.
+            symbols (list[str]): The element symbols in input order.
+            positions (list[tuple[float]]): The positions in Å.
+            charge (int): The molecular charge.
+            uhf (int): The number of unpaired electrons.
+
+        Returns:
+            bool: Flag indicating whether a restart file was copied.
+        """
+
+        identity = self.identity(symbols, charge=charge, uhf=uhf)
+        positions = self._center(positions)
+
+        with self._lock:
+            self._evict()
+
+            file_name = self._match(identity, positions)
+            if file_name is None:
+                self.misses += 1
+                return False
+
+            entry_identity, entry_positions, _ = self._entries[file_name]
+            self._entries[file_name] = (
+                entry_identity,
+                entry_positions,
+                time.monotonic(),
+            )
+            self._entries.move_to_end(file_name)
+            self.hits += 1
+
+            shutil.copyfile(
+                os.path.join(self.directory, file_name),
+                os.path.join(directory, "xtbrestart"),
+            )
+
+        return True
+
+    def put(
+        self,
+        restart_path: str,
+        symbols: list,
+        positions: list,
+        charge: int = 0,
+        uhf: int = 0,
+    ):
+        """Stores the restart file written by a calculation.
+
+        A stored file matching the positions is replaced, such that a sequence of slowly changing structures,
+        e.g. an optimization or trajectory, occupies a single entry.
+
+        Arguments:
+            restart_path (str): The path to the xtbrestart file written by the calculation.
+            symbols (list[str]): The element symbols in input order.
+            positions (list[tuple[float]]): The positions in Å.
+            charge (int): The molecular charge.
+            uhf (int): The number of unpaired electrons.
+        """
+
+        identity = self.identity(symbols, charge=charge, uhf=uhf)
+        positions = self._center(positions)
+        file_name = uuid.uuid4().hex
+
+        shutil.copyfile(restart_path, os.path.join(self.directory, file_name))
+
+        with self._lock:
+            replaced_file_name = self._match(identity, positions)
+            if replaced_file_name is not None:
+                self._remove(replaced_file_name)
+
+            self._entries[file_name] = (identity, positions, time.monotonic())
+            self._evict()
+
+    def _evict(self):
+        """Removes expired entries and the least recently used entries exceeding the maximum number."""
+
+        if self.max_age is not None:
+            expiry_time = time.monotonic() - self.max_age
+            for file_name in [
+                file_name
+                for file_name, (_, __, last_used) in self._entries.items()
+                if last_used < expiry_time
+            ]:
+                self._remove(file_name)
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, file_name: str):
+
+        del self._entries[file_name]
+        try:
+            os.remove(os.path.join(self.directory, file_name))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        """Removes all restart files and resets the statistics."""
+
+        with self._lock:
+            for file_name in list(self._entries):
+                self._remove(file_name)
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Summarizes the usage statistics.
+
+        Returns:
+            dict: The number of hits, misses and entries.
+        """
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,232 @@
+import os
+import json
+import time
+import zlib
+import pickle
+import sqlite3
+import hashlib
+
+
+class ResultCache:
+    """Class for persistently caching parsed results in an SQLite database.
+
+    The database can be shared by several threads and processes. Entries are evicted once they are older
+    than the maximum age or, least recently used first, once the cache exceeds its maximum size.
+    """
+
+    def __init__(
+        self,
+        path: str = "./.cache/uxtbpy.sqlite",
+        max_size: int = None,
+        max_age: float = None,
+        store_stdout: bool = False,
+    ):
+        """Constructor.
+
+        Arguments:
+            path (str): The path to the SQLite database file.
+            max_size (int): The maximum size of the cached data in bytes. If None, the size is not limited.
+            max_age (float): The maximum age of entries in seconds. If None, entries do not expire.
+            store_stdout (bool): Flag indicating whether to also store the raw standard output of the binaries.
+        """
+
+        self.path = os.path.abspath(path)
+        self.max_size = max_size
+        self.max_age = max_age
+        self.store_stdout = store_stdout
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, stdout BLOB, "
+                "size INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)"
+            )
+
+    def _connect(self):
+        """Opens a new connection to the database.
+
+        Returns:
+            Connection: The connection.
+        """
+
+        connection = sqlite3.connect(self.path, timeout=60)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return _ClosingConnection(connection)
+
+    @staticmethod
+    def normalize_molecule_data(molecule_data: str):
+        """Normalizes molecule data so that insignificant whitespace differences map to the same cache entry.
+
+        Arguments:
+            molecule_data (str): The contents of the molecule file.
+
+        Returns:
+            str: The normalized molecule data.
+        """
+
+        lines = [line.rstrip() for line in molecule_data.splitlines()]
+        while len(lines) > 0 and lines[-1] == "":
+            lines.pop()
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def make_key(*parts):
+        """Builds a cache key from a set of JSON serializable parts.
+
+        Arguments:
+            *parts: The parts identifying a calculation, e.g. the binary version, molecule data and parameters.
+
+        Returns:
+            str: The cache key.
+        """
+
+        return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """Retrieves a cached result.
+
+        Arguments:
+            key (str): The cache key.
+
+        Returns:
+            The cached result or None if there is no valid entry for the key.
+        """
+
+        now = time.time()
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT value, created FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            if self.max_age is not None and now - row[1] > self.max_age:
+                connection.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+
+            connection.execute(
+                "UPDATE results SET accessed = ? WHERE key = ?", (now, key)
+            )
+
+        return pickle.loads(row[0])
+
+    def get_stdout(self, key: str):
+        """Retrieves the raw standard output stored alongside a cached result.
+
+        Arguments:
+            key (str): The cache key.
+
+        Returns:
+            str: The standard output or None if it was not stored.
+        """
+
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT stdout FROM results WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None or row[0] is None:
+            return None
+
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def put(self, key: str, value, stdout: str = None):
+        """Stores a result in the cache and evicts entries if necessary.
+
+        Arguments:
+            key (str): The cache key.
+            value: The picklable result to store.
+            stdout (str): The raw standard output to store alongside the result. Ignored if the cache is
+             not configured to store standard output.
+        """
+
+        value = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.store_stdout and stdout is not None:
+            stdout = zlib.compress(stdout.encode("utf-8"))
+        else:
+            stdout = None
+
+        size = len(value) + (len(stdout) if stdout is not None else 0)
+        now = time.time()
+
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO results (key, value, stdout, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, value, stdout, size, now, now),
+            )
+
+        self.evict()
+
+    def evict(self):
+        """Removes expired entries and, least recently used first, entries exceeding the maximum size."""
+
+        with self._connect() as connection:
+            if self.max_age is not None:
+                connection.execute(
+                    "DELETE FROM results WHERE created < ?",
+                    (time.time() - self.max_age,),
+                )
+
+            if self.max_size is not None:
+                total_size = connection.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM results"
+                ).fetchone()[0]
+
+                evicted_keys = []
+                for key, size in connection.execute(
+                    "SELECT key, size FROM results ORDER BY accessed ASC"
+                ):
+                    if total_size <= self.max_size:
+                        break
+                    evicted_keys.append((key,))
+                    total_size -= size
+
+                connection.executemany(
+                    "DELETE FROM results WHERE key = ?", evicted_keys
+                )
+
+    def clear(self):
+        """Removes all entries from the cache."""
+
+        with self._connect() as connection:
+            connection.execute("DELETE FROM results")
+
+    def __len__(self):
+        with self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def __contains__(self, key: str):
+        with self._connect() as connection:
+            return (
+                connection.execute(
+                    "SELECT 1 FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                is not None
+            )
+
+
+class _ClosingConnection:
+    """Context manager committing (or rolling back) and closing an SQLite connection."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self.connection
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.connection.commit()
+            else:
+                self.connection.rollback()
+        finally:
+            self.connection.close()
+
+        return False
@@ -1,29 +1,276 @@
 import os
+import re
 import shutil
+import signal
+import hashlib
+import tempfile
+import warnings
+import functools
 import subprocess
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from concurrent.futures import (
+    Executor,
+    ThreadPoolExecutor,
+    ProcessPoolExecutor,
+    as_completed,
+)
 
-from .tools import change_directory
+from .batch_result import BatchResult
 from .file_handler import FileHandler
-from .subprocess_error import SubprocessError
+from .subprocess_error import SubprocessError, SubprocessTimeoutError
+from .process_monitor import ProcessMonitor, signal_process_group
+from .memo_cache import MemoCache
+from .result_cache import ResultCache
+from .core_scheduler import CoreScheduler
+from .scratch_directory import ScratchDirectory, CLEANUP_POLICIES, KEEP_ON_FAILURE
+
+SHARED_MEMORY_DIRECTORY = "/dev/shm"
+STREAM_CHUNK_SIZE = 65536
+DEFAULT_GRACE_PERIOD = 5.0
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_binary(binary_name: str):
+    """Resolves the absolute path of a binary once per process.
+
+    Arguments:
+        binary_name (str): The binary.
+
+    Returns:
+        str: The absolute path to the binary.
+
+    Raises:
+        RunTimeError: If the binary is not available.
+    """
+
+    binary_path = shutil.which(binary_name)
+    if binary_path is None:
+        raise RuntimeError("No valid version of " + binary_name + " found.")
+
+    return os.path.abspath(binary_path)
+
+
+@functools.lru_cache(maxsize=None)
+def _binary_version(binary_name: str):
+    """Determines the version of a binary once per process.
+
+    The binary is called with --version in a temporary directory, such that files it writes are not left in the
+    working directory of the caller. If it prints no version, the version is derived from the hash of the binary.
+
+    Arguments:
+        binary_name (str): The binary.
+
+    Returns:
+        str: The version string or the "sha256:" prefixed hash of the binary.
+    """
+
+    binary_path = _resolve_binary(binary_name)
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="version_") as directory:
+            result = subprocess.run(
+                [binary_path, "--version"],
+                cwd=directory,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=30,
+            )
+    except (OSError, subprocess.TimeoutExpired):
+        result = None
+
+    if result is not None:
+        output = (result.stdout + result.stderr).decode("utf-8", errors="replace")
+        match = re.search(r"version\s+(\S+)", output)
+        if match is not None:
+            return match.group(1)
+
+    binary_hash = hashlib.sha256()
+    with open(binary_path, "rb") as binary_file:
+        for chunk in iter(lambda: binary_file.read(STREAM_CHUNK_SIZE), b""):
+            binary_hash.update(chunk)
+
+    return "sha256:" + binary_hash.hexdigest()
+
+
+def _run_batch_job(
+    runner, method_name: str, args: tuple, kwargs: dict, submitter_pid: int
+):
+    """Executes a single job of a batch inside a worker.
+
+    Arguments:
+        runner (Runner): The runner to execute the job with.
+        method_name (str): The name of the runner method to call.
+        args (tuple): The positional arguments of the call.
+        kwargs (dict): The keyword arguments of the call.
+        submitter_pid (int): The id of the process that submitted the job.
+
+    Returns:
+        dict: The parsed output of the job. Memoized outputs are returned as dicts if the worker runs in another
+        process, since read-only mappings cannot be pickled.
+    """
+
+    output = getattr(runner, method_name)(*args, **kwargs)
+    if os.getpid() != submitter_pid:
+        output = MemoCache.thaw(output)
+
+    return output
 
 
 class Runner(ABC):
     """Abstract adapter class for interfacing binaries."""
 
-    def __init__(self, working_directory: str = "./.temp/"):
+    def __init__(
+        self,
+        working_directory: str = "./.temp/",
+        cleanup: str = KEEP_ON_FAILURE,
+        use_shared_memory: bool = False,
+        scheduler: CoreScheduler = None,
+        cache: ResultCache = None,
+        memo: MemoCache = None,
+        timeout: float = None,
+        cpu_timeout: float = None,
+        grace_period: float = DEFAULT_GRACE_PERIOD,
+    ):
         """Constructor.
 
         Arguments:
-            working_directory (str): The path to the directory from which the interfaced binary will be launched.
+            working_directory (str): The path to the root directory in which the per-job scratch directories
+             are created.
+            cleanup (str): The cleanup policy for the scratch directories. One of "keep", "delete" and
+             "keep_on_failure".
+            use_shared_memory (bool): Flag indicating whether to create the scratch directories on /dev/shm. Takes
+             precedence over the location of the working directory, whose name is used for the root directory
+             /dev/shm/uxtbpy/<name>. Falls back to the working directory if /dev/shm is not available.
+            scheduler (CoreScheduler): The scheduler distributing CPU cores across concurrent jobs. If None, jobs
+             inherit the thread settings of the environment.
+            cache (ResultCache): The persistent cache for parsed results. If None, results are not cached.
+            memo (MemoCache): The in-memory cache for parsed results. If set, results are returned as immutable
+             mappings.
+            timeout (float): The default wall-clock time limit in seconds of each binary call.
+            cpu_timeout (float): The default CPU time limit in seconds of each binary call.
+            grace_period (float): The default time in seconds between SIGTERM and SIGKILL once a limit expired.
+
+        Raises:
+            ValueError: If the cleanup policy is unknown.
         """
 
         self.check()
 
+        if cleanup not in CLEANUP_POLICIES:
+            raise ValueError(
+                f"Unknown cleanup policy {cleanup}. Choose from {', '.join(CLEANUP_POLICIES)}."
+            )
+        self._cleanup = cleanup
+        self._scheduler = scheduler
+        self._cache = cache
+        self._memo = memo
+        self._limits = {
+            "timeout": timeout,
+            "cpu_timeout": cpu_timeout,
+            "grace_period": grace_period,
+        }
+
         self._working_directory = os.path.abspath(working_directory)
+        if use_shared_memory:
+            if os.path.isdir(SHARED_MEMORY_DIRECTORY):
+                self._working_directory = os.path.join(
+                    SHARED_MEMORY_DIRECTORY,
+                    "uxtbpy",
+                    os.path.basename(self._working_directory),
+                )
+            else:
+                warnings.warn(
+                    f"{SHARED_MEMORY_DIRECTORY} is not available. Falling back to {self._working_directory}."
+                )
+
         if not os.path.isdir(self._working_directory):
             os.makedirs(self._working_directory, exist_ok=True)
 
+    def _scratch_directory(self):
+        """Creates an isolated scratch directory for a single job in the working directory.
+
+        Returns:
+            ScratchDirectory: The scratch directory context manager.
+        """
+
+        return ScratchDirectory(self._working_directory, cleanup=self._cleanup)
+
+    def _run_job(self, cache_key: str, stdout_file: str, run):
+        """Runs a single job in its own scratch directory, serving it from the in-memory or persistent cache if
+        possible.
+
+        Arguments:
+            cache_key (str): The key of the job in the caches. If None, the caches are bypassed.
+            stdout_file (str): The name of the file in the scratch directory holding the relevant standard output.
+            run (callable): The function executing the job, taking the scratch directory path and returning the
+             parsed output.
+
+        Returns:
+            dict: The parsed output.
+        """
+
+        output = self._cached_output(cache_key)
+        if output is not None:
+            return output
+
+        scratch_directory = self._scratch_directory()
+        with scratch_directory as directory:
+            output = run(directory)
+
+            # results of jobs aborted by a watchdog are incomplete and never cached, their partial output is kept
+            # like the output of failed jobs
+            if output.get("aborted"):
+                scratch_directory.failed = True
+                return output
+
+            if cache_key is not None and self._cache is not None:
+                stdout = None
+                if self._cache.store_stdout:
+                    stdout = FileHandler.read_file(os.path.join(directory, stdout_file))
+                self._cache.put(cache_key, output, stdout=stdout)
+
+        return self._memoize(cache_key, output)
+
+    def _cached_output(self, cache_key: str):
+        """Looks a job up in the in-memory and the persistent cache.
+
+        Arguments:
+            cache_key (str): The key of the job in the caches. If None, the caches are bypassed.
+
+        Returns:
+            dict: The cached output or None if the job is not cached.
+        """
+
+        if cache_key is not None and self._memo is not None:
+            output = self._memo.get(cache_key)
+            if output is not None:
+                return output
+
+        if cache_key is not None and self._cache is not None:
+            output = self._cache.get(cache_key)
+            if output is not None:
+                return self._memoize(cache_key, output)
+
+        return None
+
+    def _memoize(self, cache_key: str, output: dict):
+        """Stores a parsed output in the in-memory cache if one is set.
+
+        Arguments:
+            cache_key (str): The key of the job in the caches.
+            output (dict): The parsed output.
+
+        Returns:
+            The immutable memoized output or the unchanged output if no in-memory cache is set.
+        """
+
+        if cache_key is None or self._memo is None:
+            return output
+
+        return self._memo.put(cache_key, output)
+
     @staticmethod
     def check_binary(binary_name: str):
         """Checks if a given binary is available on the system.
@@ -35,8 +282,36 @@ class Runner(ABC):
             RunTimeError: If the binary is not available.
         """
 
-        if shutil.which(binary_name) is None:
-            raise RuntimeError("No valid version of " + binary_name + " found.")
+        Runner.resolve_binary(binary_name)
+
+    @staticmethod
+    def resolve_binary(binary_name: str):
+        """Resolves the absolute path of a given binary. The lookup is cached for the lifetime of the process.
+
+        Arguments:
+            binary_name (str): The binary.
+
+        Returns:
+            str: The absolute path to the binary.
+
+        Raises:
+            RunTimeError: If the binary is not available.
+        """
+
+        return _resolve_binary(binary_name)
+
+    @staticmethod
+    def binary_version(binary_name: str):
+        """Determines the version of a given binary. The version is cached for the lifetime of the process.
+
+        Arguments:
+            binary_name (str): The binary.
+
+        Returns:
+            str: The version string or the "sha256:" prefixed hash of the binary if it prints no version.
+        """
+
+        return _binary_version(binary_name)
 
     @staticmethod
     def run_binary(
@@ -45,50 +320,379 @@ class Runner(ABC):
         working_directory: str = "./",
         write_stdout: bool = False,
         write_stderr: bool = False,
+        environment: dict = None,
+        redirect_output: bool = False,
+        stdout_callback=None,
+        timeout: float = None,
+        cpu_timeout: float = None,
+        grace_period: float = DEFAULT_GRACE_PERIOD,
     ):
         """Excutes a given binary with a given list of parameters in a given working directory.
 
+        The binary is launched directly without an intermediate shell, i.e. each parameter is passed
+        verbatim as a single argument.
+
         Arguments:
             binary_name (str): The binary.
-            parameters (list[str]): The list of parameters to append to the binary call.
+            parameters (list[str]): The list of arguments to append to the binary call.
             working_directory (str): The path to the directory from which the interfaced binary will be launched.
             write_stdout (bool): Flag indicating whether to write stdout to disk.
             write_stderr (bool): Flag indiating whether to write stderr to disk.
+            environment (dict): The environment variables of the process. Defaults to the current environment.
+            redirect_output (bool): Flag indicating whether to connect stdout and stderr of the process directly to
+             <binary>.stdout and <binary>.stderr in the working directory instead of capturing them in memory. The
+             returned stdout is None and the stderr is read back from disk. Overrides write_stdout and write_stderr.
+            stdout_callback (callable): The function called with each chunk of stdout as bytes while the binary is
+             running. Implies redirect_output, i.e. the chunks are also written to <binary>.stdout. If the callback
+             raises, the process is killed and the exception is propagated.
+            timeout (float): The wall-clock time limit in seconds. If None, the wall-clock time is not limited.
+            cpu_timeout (float): The CPU time limit in seconds, read from /proc. If None, the CPU time is not
+             limited.
+            grace_period (float): The time in seconds between SIGTERM and SIGKILL sent to the process group of the
+             binary once a time limit expired.
 
         Returns:
             CompletedProcess: The CompletedProcess object.
 
         Raises:
             SubprocessError: If the execution of the binary failed.
+            SubprocessTimeoutError: If the binary was killed after exceeding a time limit.
         """
 
-        with change_directory(working_directory):
-
-            result = subprocess.run(
-                [binary_name + " " + " ".join(parameters)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                shell=True,
-            )
+        working_directory = os.path.abspath(working_directory)
+        arguments = [Runner.resolve_binary(binary_name)] + list(parameters)
+        limits = {
+            "timeout": timeout,
+            "cpu_timeout": cpu_timeout,
+            "grace_period": grace_period,
+        }
 
-            if write_stdout:
-                FileHandler.write_file(
-                    f"{binary_name}.stdout", result.stdout.decode("utf-8")
+        if redirect_output or stdout_callback is not None:
+            with Runner._output_files(binary_name, working_directory) as (
+                stdout_file,
+                stderr_file,
+            ):
+                result, monitor = Runner._execute(
+                    arguments,
+                    working_directory,
+                    environment,
+                    stdout=stdout_file if stdout_callback is None else subprocess.PIPE,
+                    stderr=stderr_file,
+                    stdout_file=stdout_file,
+                    stdout_callback=stdout_callback,
+                    **limits,
                 )
 
-            if write_stderr:
-                FileHandler.write_file(
-                    f"{binary_name}.stderr", result.stderr.decode("utf-8")
+            if monitor is not None and monitor.expired:
+                # the output may have been cut off in the middle of a character
+                with open(
+                    os.path.join(working_directory, f"{binary_name}.stdout"), "rb"
+                ) as stdout_file:
+                    stdout = stdout_file.read().decode("utf-8", errors="replace")
+
+                raise SubprocessTimeoutError(
+                    f"{binary_name} was killed: {monitor.reason}", result, stdout=stdout
                 )
 
-            if result.returncode != 0:
-                raise SubprocessError(
-                    f"{binary_name} failed with standard error: {result.returncode}.",
-                    result,
+            return Runner._process_redirected_result(
+                binary_name, result, working_directory
+            )
+
+        result, monitor = Runner._execute(
+            arguments,
+            working_directory,
+            environment,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            **limits,
+        )
+
+        if monitor is not None and monitor.expired:
+            raise SubprocessTimeoutError(
+                f"{binary_name} was killed: {monitor.reason}",
+                result,
+                stdout=result.stdout.decode("utf-8", errors="replace"),
+            )
+
+        return Runner._process_result(
+            binary_name,
+            result,
+            working_directory,
+            write_stdout=write_stdout,
+            write_stderr=write_stderr,
+        )
+
+    def _run_binary(self, binary_name: str, parameters: list, **kwargs):
+        """Excutes a given binary like Runner.run_binary, waiting for free cores if a scheduler is set.
+
+        The time limits of the runner apply unless they are given explicitly.
+
+        Arguments:
+            binary_name (str): The binary.
+            parameters (list[str]): The list of arguments to append to the binary call.
+            **kwargs: The keyword arguments passed on to Runner.run_binary.
+
+        Returns:
+            CompletedProcess: The CompletedProcess object.
+
+        Raises:
+            SubprocessError: If the execution of the binary failed.
+            SubprocessTimeoutError: If the binary was killed after exceeding a time limit.
+        """
+
+        kwargs = {**self._limits, **kwargs}
+
+        if self._scheduler is None:
+            return Runner.run_binary(binary_name, parameters, **kwargs)
+
+        with self._scheduler.reserve() as environment:
+            return Runner.run_binary(
+                binary_name, parameters, environment=environment, **kwargs
+            )
+
+    @staticmethod
+    @contextmanager
+    def _output_files(binary_name: str, working_directory: str):
+        """Opens the files receiving stdout and stderr of a binary in its working directory.
+
+        Arguments:
+            binary_name (str): The binary.
+            working_directory (str): The absolute path to the directory from which the binary is launched.
+
+        Yields:
+            tuple: The open stdout and stderr files.
+        """
+
+        stdout_path = os.path.join(working_directory, f"{binary_name}.stdout")
+        stderr_path = os.path.join(working_directory, f"{binary_name}.stderr")
+
+        with open(stdout_path, "wb") as stdout_file, open(
+            stderr_path, "wb"
+        ) as stderr_file:
+            yield stdout_file, stderr_file
+
+    @staticmethod
+    def _execute(
+        arguments: list,
+        working_directory: str,
+        environment: dict,
+        stdout,
+        stderr,
+        stdout_file=None,
+        stdout_callback=None,
+        timeout: float = None,
+        cpu_timeout: float = None,
+        grace_period: float = DEFAULT_GRACE_PERIOD,
+    ):
+        """Runs a binary until it exits, optionally streaming its stdout and enforcing time limits.
+
+        Arguments:
+            arguments (list[str]): The binary and its arguments.
+            working_directory (str): The absolute path to the directory from which the binary is launched.
+            environment (dict): The environment variables of the process.
+            stdout: The stdout target passed to Popen.
+            stderr: The stderr target passed to Popen.
+            stdout_file (file): The open file receiving the streamed stdout.
+            stdout_callback (callable): The function called with each chunk of stdout as bytes. Requires stdout to
+             be a pipe.
+            timeout (float): The wall-clock time limit in seconds.
+            cpu_timeout (float): The CPU time limit in seconds.
+            grace_period (float): The time in seconds between SIGTERM and SIGKILL.
+
+        Returns:
+            CompletedProcess: The CompletedProcess object holding the captured output, if any.
+            ProcessMonitor: The monitor of the time limits or None if no limit is set.
+        """
+
+        # a separate session puts the binary and all processes it spawns in one process group
+        monitored = timeout is not None or cpu_timeout is not None
+
+        with subprocess.Popen(
+            arguments,
+            stdout=stdout,
+            stderr=stderr,
+            cwd=working_directory,
+            env=environment,
+            start_new_session=monitored,
+        ) as process:
+
+            monitor = None
+            if monitored:
+                monitor = ProcessMonitor(
+                    process,
+                    timeout=timeout,
+                    cpu_timeout=cpu_timeout,
+                    grace_period=grace_period,
                 )
+                monitor.start()
+
+            try:
+                if stdout_callback is not None:
+                    # read1 returns as soon as any output is available instead of waiting for a full chunk
+                    chunk = process.stdout.read1(STREAM_CHUNK_SIZE)
+                    while chunk:
+                        stdout_file.write(chunk)
+                        stdout_callback(chunk)
+                        chunk = process.stdout.read1(STREAM_CHUNK_SIZE)
+                    output = (None, None)
+                    process.wait()
+                else:
+                    output = process.communicate()
+            except BaseException:
+                # processes spawned by the binary share its process group if it runs in its own session
+                if monitored:
+                    signal_process_group(process.pid, signal.SIGKILL)
+                else:
+                    process.kill()
+                raise
+            finally:
+                if monitor is not None:
+                    monitor.stop()
+
+        return (
+            subprocess.CompletedProcess(arguments, process.returncode, *output),
+            monitor,
+        )
+
+    @staticmethod
+    def _process_redirected_result(
+        binary_name: str, result: subprocess.CompletedProcess, working_directory: str
+    ):
+        """Reads back the standard error of a finished binary whose output was redirected to disk and checks its
+        return code.
+
+        Arguments:
+            binary_name (str): The binary.
+            result (CompletedProcess): The CompletedProcess object.
+            working_directory (str): The absolute path to the directory from which the binary was launched.
+
+        Returns:
+            CompletedProcess: The CompletedProcess object.
+
+        Raises:
+            SubprocessError: If the execution of the binary failed.
+        """
+
+        with open(
+            os.path.join(working_directory, f"{binary_name}.stderr"), "rb"
+        ) as stderr_file:
+            result.stderr = stderr_file.read()
+
+        return Runner._process_result(binary_name, result, working_directory)
+
+    @staticmethod
+    def _process_result(
+        binary_name: str,
+        result: subprocess.CompletedProcess,
+        working_directory: str,
+        write_stdout: bool = False,
+        write_stderr: bool = False,
+    ):
+        """Writes the output streams of a finished binary to disk and checks its return code.
+
+        Arguments:
+            binary_name (str): The binary.
+            result (CompletedProcess): The CompletedProcess object.
+            working_directory (str): The absolute path to the directory from which the binary was launched.
+            write_stdout (bool): Flag indicating whether to write stdout to disk.
+            write_stderr (bool): Flag indiating whether to write stderr to disk.
+
+        Returns:
+            CompletedProcess: The CompletedProcess object.
+
+        Raises:
+            SubprocessError: If the execution of the binary failed.
+        """
+
+        if write_stdout:
+            FileHandler.write_file(
+                os.path.join(working_directory, f"{binary_name}.stdout"),
+                result.stdout.decode("utf-8"),
+            )
+
+        if write_stderr:
+            FileHandler.write_file(
+                os.path.join(working_directory, f"{binary_name}.stderr"),
+                result.stderr.decode("utf-8"),
+            )
+
+        if result.returncode != 0:
+            raise SubprocessError(
+                f"{binary_name} failed with standard error: {result.returncode}.",
+                result,
+            )
 
         return result
 
+    def _iter_batch(
+        self,
+        jobs: list,
+        max_workers: int = None,
+        executor: Executor = None,
+        ordered: bool = True,
+    ):
+        """Executes a list of jobs concurrently and yields their results.
+
+        Exceptions raised by individual jobs are collected in the corresponding results instead of
+        aborting the whole batch.
+
+        Arguments:
+            jobs (list[tuple]): The jobs given as (method name, args, kwargs) tuples.
+            max_workers (int): The maximum number of concurrently running jobs. Ignored if an executor is given.
+             Defaults to the number of jobs the scheduler can run at once if a scheduler is set.
+            executor (Executor): The executor to submit the jobs to. Defaults to a new thread pool. Process pools
+             work on copies of the runner, whose caches and restart store are independent of the original.
+            ordered (bool): Flag indicating whether to yield results in submission order or as they complete.
+
+        Returns:
+            Iterator[BatchResult]: The results of the jobs.
+
+        Raises:
+            ValueError: If a process pool is given while a scheduler is set, since the copies of the scheduler in
+             the worker processes would each distribute the whole core budget.
+        """
+
+        if isinstance(executor, ProcessPoolExecutor) and self._scheduler is not None:
+            raise ValueError(
+                "A CoreScheduler cannot be shared across the processes of a ProcessPoolExecutor. "
+                "Use a thread pool or a runner without scheduler."
+            )
+
+        return self._iter_batch_results(jobs, max_workers, executor, ordered)
+
+    def _iter_batch_results(
+        self, jobs: list, max_workers: int, executor: Executor, ordered: bool
+    ):
+        """Executes a list of jobs concurrently and yields their results, see _iter_batch.
+
+        Yields:
+            BatchResult: The result of each job.
+        """
+
+        owns_executor = executor is None
+        if owns_executor:
+            if max_workers is None and self._scheduler is not None:
+                max_workers = self._scheduler.max_jobs
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        try:
+            futures = {
+                executor.submit(
+                    _run_batch_job, self, method_name, args, kwargs, os.getpid()
+                ): index
+                for index, (method_name, args, kwargs) in enumerate(jobs)
+            }
+
+            for future in futures if ordered else as_completed(futures):
+                index = futures[future]
+                try:
+                    yield BatchResult(index, output=future.result())
+                except Exception as error:
+                    yield BatchResult(index, error=error)
+        finally:
+            if owns_executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+
     @abstractmethod
     def check(self):
         """Checks if required binaries are available on the system.
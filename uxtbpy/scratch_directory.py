@@ -0,0 +1,47 @@
+import shutil
+import tempfile
+
+
+KEEP = "keep"
+DELETE = "delete"
+KEEP_ON_FAILURE = "keep_on_failure"
+
+CLEANUP_POLICIES = [KEEP, DELETE, KEEP_ON_FAILURE]
+
+
+class ScratchDirectory:
+    """Context manager providing an isolated scratch directory for a single job."""
+
+    def __init__(self, root_directory: str, cleanup: str = KEEP_ON_FAILURE):
+        """Constructor.
+
+        Arguments:
+            root_directory (str): The path to the directory in which the scratch directory is created.
+            cleanup (str): The cleanup policy. One of "keep", "delete" and "keep_on_failure".
+
+        Raises:
+            ValueError: If the cleanup policy is unknown.
+        """
+
+        if cleanup not in CLEANUP_POLICIES:
+            raise ValueError(
+                f"Unknown cleanup policy {cleanup}. Choose from {', '.join(CLEANUP_POLICIES)}."
+            )
+
+        self.root_directory = root_directory
+        self.cleanup = cleanup
+        self.path = None
+        # set for jobs that end without an exception but whose output is incomplete, e.g. aborted jobs
+        self.failed = False
+
+    def __enter__(self):
+        self.path = tempfile.mkdtemp(prefix="job_", dir=self.root_directory)
+        return self.path
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.cleanup == DELETE or (
+            self.cleanup == KEEP_ON_FAILURE and exc_type is None and not self.failed
+        ):
+            shutil.rmtree(self.path, ignore_errors=True)
+
+        return False
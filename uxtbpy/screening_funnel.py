@@ -0,0 +1,393 @@
+from concurrent.futures import Executor
+
+from .xtb_runner import XtbRunner
+from .stda_runner import StdaRunner
+
+
+class CandidateFilter:
+    """Base class for selecting the candidates passed on to the next stage of a ScreeningFunnel.
+
+    A filter is called with the values of one output field of all candidates that completed a stage and returns
+    the indices of the candidates to keep. Any callable following this protocol can be used as filter, callables
+    without a field attribute are called with the total energies.
+    """
+
+    field = "energy"
+
+    def __call__(self, values: dict):
+        """Selects candidates.
+
+        Arguments:
+            values (dict): The values of the field keyed by candidate index.
+
+        Returns:
+            list[int]: The indices of the selected candidates.
+        """
+
+        return list(values)
+
+
+def _filter_field(candidate_filter):
+    """Determines the output field a filter is called with.
+
+    Arguments:
+        candidate_filter (callable): The filter.
+
+    Returns:
+        str: The field of the filter or "energy" if it has none.
+    """
+
+    return getattr(candidate_filter, "field", CandidateFilter.field)
+
+
+class EnergyWindow(CandidateFilter):
+    """Filter keeping the candidates within an energy window above the lowest energy."""
+
+    def __init__(self, window: float, field: str = "energy"):
+        """Constructor.
+
+        Arguments:
+            window (float): The width of the window in the unit of the field, e.g. Eh for the total energy.
+            field (str): The name of the output field to compare.
+        """
+
+        self.window = window
+        self.field = field
+
+    def __call__(self, values: dict):
+
+        if not values:
+            return []
+
+        threshold = min(values.values()) + self.window
+
+        return [index for index, value in values.items() if value <= threshold]
+
+
+class TopK(CandidateFilter):
+    """Filter keeping the k candidates with the lowest (or highest) values."""
+
+    def __init__(self, k: int, field: str = "energy", largest: bool = False):
+        """Constructor.
+
+        Arguments:
+            k (int): The number of candidates to keep.
+            field (str): The name of the output field to rank by.
+            largest (bool): Flag indicating whether to keep the highest instead of the lowest values.
+        """
+
+        self.k = k
+        self.field = field
+        self.largest = largest
+
+    def __call__(self, values: dict):
+
+        ranked = sorted(values, key=values.get, reverse=self.largest)
+
+        return ranked[: self.k]
+
+
+class XtbStage:
+    """Stage of a ScreeningFunnel running xtb on each candidate.
+
+    Optimized geometries are passed on to the following stages.
+    """
+
+    def __init__(
+        self,
+        parameters: list = [],
+        fields: list = None,
+        candidate_filter: CandidateFilter = None,
+        runner: XtbRunner = None,
+        watchdogs: list = None,
+    ):
+        """Constructor.
+
+        Arguments:
+            parameters (list[str]): The parameters to append to each xtb call, e.g. ["--gfnff", "--opt"].
+            fields (list[str]): The names of the fields to extract from the xtb output. The optimized geometry and
+             the field of the filter are always extracted. If None, all fields are extracted.
+            candidate_filter (CandidateFilter): The filter selecting the candidates passed on to the next stage. If
+             None, all candidates that completed the stage are passed on.
+            runner (XtbRunner): The runner executing the jobs. Defaults to the xtb runner of the funnel.
+            watchdogs (list[callable]): The watchdogs checking the progress of each job. Candidates whose job is
+             aborted are dropped from the funnel.
+        """
+
+        self.parameters = parameters
+        self.fields = fields
+        self.candidate_filter = candidate_filter
+        self.runner = runner
+        self.watchdogs = watchdogs
+
+    def run(
+        self,
+        runner: XtbRunner,
+        structures: list,
+        max_workers: int = None,
+        executor: Executor = None,
+    ):
+        """Executes the stage for the given structures concurrently.
+
+        Arguments:
+            runner (XtbRunner): The runner executing the jobs if the stage has none.
+            structures (list[str]): The xyz formatted data of the candidates.
+            max_workers (int): The maximum number of concurrent jobs. Ignored if an executor is given.
+            executor (Executor): The executor to submit the jobs to. Defaults to a new thread pool.
+
+        Returns:
+            list[BatchResult]: The results in submission order.
+        """
+
+        fields = self.fields
+        if fields is not None:
+            extra_fields = ["optimized_xyz"]
+            if self.candidate_filter is not None:
+                extra_fields.append(_filter_field(self.candidate_filter))
+            fields = list(dict.fromkeys(fields + extra_fields))
+
+        return (self.runner or runner).run_batch(
+            structures,
+            parameters=self.parameters,
+            fields=fields,
+            watchdogs=self.watchdogs,
+            max_workers=max_workers,
+            executor=executor,
+        )
+
+    @staticmethod
+    def next_structure(xyz: str, output: dict):
+        """Determines the geometry passed on to the next stage.
+
+        Arguments:
+            xyz (str): The xyz formatted data the stage was run with.
+            output (dict): The output of the stage.
+
+        Returns:
+            str: The optimized geometry if available, otherwise the input geometry.
+        """
+
+        return output.get("optimized_xyz") or xyz
+
+
+class StdaStage:
+    """Stage of a ScreeningFunnel running the xtb4stda and stda pipeline on each candidate."""
+
+    def __init__(
+        self,
+        xtb4stda_parameters: list = [],
+        stda_parameters: list = [],
+        fields: list = None,
+        candidate_filter: CandidateFilter = None,
+        runner: StdaRunner = None,
+    ):
+        """Constructor.
+
+        Arguments:
+            xtb4stda_parameters (list[str]): The parameters to append to each xtb4stda call.
+            stda_parameters (list[str]): The parameters to append to each stda call.
+            fields (list[str]): The names of the fields to extract from the stda output. The field of the filter is
+             always extracted. If None, all fields are extracted.
+            candidate_filter (CandidateFilter): The filter selecting the candidates passed on to the next stage. If
+             None, all candidates that completed the stage are passed on.
+            runner (StdaRunner): The runner executing the jobs. Defaults to the stda runner of the funnel.
+        """
+
+        self.xtb4stda_parameters = xtb4stda_parameters
+        self.stda_parameters = stda_parameters
+        self.fields = fields
+        self.candidate_filter = candidate_filter
+        self.runner = runner
+
+    def run(
+        self,
+        runner: StdaRunner,
+        structures: list,
+        max_workers: int = None,
+        executor: Executor = None,
+    ):
+        """Executes the stage for the given structures concurrently.
+
+        Arguments:
+            runner (StdaRunner): The runner executing the jobs if the stage has none.
+            structures (list[str]): The xyz formatted data of the candidates.
+            max_workers (int): The maximum number of concurrent jobs. Ignored if an executor is given.
+            executor (Executor): The executor to submit the jobs to. Defaults to a new thread pool.
+
+        Returns:
+            list[BatchResult]: The results in submission order.
+        """
+
+        fields = self.fields
+        if fields is not None and self.candidate_filter is not None:
+            fields = list(
+                dict.fromkeys(fields + [_filter_field(self.candidate_filter)])
+            )
+
+        return (self.runner or runner).run_batch(
+            structures,
+            xtb4stda_parameters=self.xtb4stda_parameters,
+            stda_parameters=self.stda_parameters,
+            fields=fields,
+            max_workers=max_workers,
+            executor=executor,
+        )
+
+    @staticmethod
+    def next_structure(xyz: str, output: dict):
+        """Determines the geometry passed on to the next stage.
+
+        Arguments:
+            xyz (str): The xyz formatted data the stage was run with.
+            output (dict): The output of the stage.
+
+        Returns:
+            str: The input geometry.
+        """
+
+        return xyz
+
+
+class ScreeningCandidate:
+    """Class holding the progress of a single candidate through a ScreeningFunnel."""
+
+    def __init__(self, index: int, xyz: str):
+        """Constructor.
+
+        Arguments:
+            index (int): The position of the candidate in the screened library.
+            xyz (str): The xyz formatted data of the candidate.
+        """
+
+        self.index = index
+        self.xyz = xyz
+        self.outputs = []
+        self.error = None
+        self.abort_reason = None
+
+    @property
+    def stages_completed(self):
+        """The number of stages the candidate completed."""
+
+        return len(self.outputs)
+
+    def __repr__(self):
+        return f"ScreeningCandidate(index={self.index}, stages_completed={self.stages_completed})"
+
+
+class ScreeningFunnel:
+    """Class for screening a library of molecules through a sequence of increasingly expensive stages.
+
+    Each stage runs concurrently on the candidates selected by the filter of the previous stage, such that the
+    expensive final stages only run on the most promising candidates, e.g. a GFN-FF optimization of all
+    candidates, GFN2 single points within an energy window and sTDA spectra of the top-k. Geometries are passed
+    from stage to stage in memory.
+    """
+
+    def __init__(
+        self,
+        stages: list,
+        xtb_runner: XtbRunner = None,
+        stda_runner: StdaRunner = None,
+        max_workers: int = None,
+        executor: Executor = None,
+    ):
+        """Constructor.
+
+        Arguments:
+            stages (list[XtbStage | StdaStage]): The stages in order of execution.
+            xtb_runner (XtbRunner): The runner of the xtb stages without own runner. Defaults to a new XtbRunner.
+            stda_runner (StdaRunner): The runner of the stda stages without own runner. Defaults to a new
+             StdaRunner.
+            max_workers (int): The maximum number of concurrent jobs of each stage. Ignored if an executor is
+             given.
+            executor (Executor): The executor to submit the jobs to. Defaults to a new thread pool per stage.
+        """
+
+        self.stages = stages
+        self._xtb_runner = xtb_runner
+        self._stda_runner = stda_runner
+        self._max_workers = max_workers
+        self._executor = executor
+
+    def _runner(self, stage):
+        """Provides the default runner of a stage, creating it on first use.
+
+        Arguments:
+            stage (XtbStage | StdaStage): The stage.
+
+        Returns:
+            Runner: The runner or None if the stage has its own runner.
+        """
+
+        if stage.runner is not None:
+            return None
+
+        if isinstance(stage, StdaStage):
+            if self._stda_runner is None:
+                self._stda_runner = StdaRunner()
+            return self._stda_runner
+
+        if self._xtb_runner is None:
+            self._xtb_runner = XtbRunner()
+        return self._xtb_runner
+
+    def run(self, structures: list):
+        """Screens the given structures through all stages.
+
+        Candidates are dropped after a stage if their job failed, was aborted or if the filter of the stage did not
+        select them. The error of failed jobs and the reason of aborted jobs are recorded on the candidate.
+
+        Arguments:
+            structures (list[str]): The xyz formatted data of the candidates.
+
+        Returns:
+            list[ScreeningCandidate]: The candidates in input order holding the outputs of the stages they
+             completed. The finalists completed all stages.
+        """
+
+        candidates = [
+            ScreeningCandidate(index, xyz) for index, xyz in enumerate(structures)
+        ]
+        survivors = candidates
+
+        for stage in self.stages:
+            if not survivors:
+                break
+
+            results = stage.run(
+                self._runner(stage),
+                [candidate.xyz for candidate in survivors],
+                max_workers=self._max_workers,
+                executor=self._executor,
+            )
+
+            completed = []
+            for candidate, result in zip(survivors, results):
+                if not result.succeeded:
+                    candidate.error = result.error
+                    continue
+                if result.output.get("aborted"):
+                    candidate.abort_reason = result.output.get("abort_reason")
+                    continue
+
+                candidate.outputs.append(result.output)
+                candidate.xyz = stage.next_structure(candidate.xyz, result.output)
+                completed.append(candidate)
+
+            if stage.candidate_filter is None:
+                survivors = completed
+                continue
+
+            field = _filter_field(stage.candidate_filter)
+            values = {
+                candidate.index: candidate.outputs[-1][field]
+                for candidate in completed
+                if candidate.outputs[-1].get(field) is not None
+            }
+            selected = set(stage.candidate_filter(values))
+            survivors = [
+                candidate for candidate in completed if candidate.index in selected
+            ]
+
+        return candidates
@@ -0,0 +1,316 @@
+import math
+from concurrent.futures import Executor
+
+from .tools import read_xyz
+from .xtb_runner import XtbRunner
+from .xtb_output_parser import element_identifiers
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+BOHR_TO_ANGSTROM = 0.529177210903
+
+# conversion of sqrt(Eh / (bohr² u)) to wavenumbers in cm⁻¹
+HARTREE = 4.3597447222071e-18
+BOHR = 5.29177210903e-11
+ATOMIC_MASS_UNIT = 1.66053906660e-27
+SPEED_OF_LIGHT = 2.99792458e10
+WAVENUMBER_FACTOR = math.sqrt(HARTREE / (ATOMIC_MASS_UNIT * BOHR**2)) / (
+    2.0 * math.pi * SPEED_OF_LIGHT
+)
+
+# standard atomic weights in u of the elements supported by xtb, indexed by atomic number - 1
+atomic_masses = [
+    1.008,
+    4.0026,
+    6.94,
+    9.0122,
+    10.81,
+    12.011,
+    14.007,
+    15.999,
+    18.998,
+    20.180,
+    22.990,
+    24.305,
+    26.982,
+    28.085,
+    30.974,
+    32.06,
+    35.45,
+    39.948,
+    39.098,
+    40.078,
+    44.956,
+    47.867,
+    50.942,
+    51.996,
+    54.938,
+    55.845,
+    58.933,
+    58.693,
+    63.546,
+    65.38,
+    69.723,
+    72.630,
+    74.922,
+    78.971,
+    79.904,
+    83.798,
+    85.468,
+    87.62,
+    88.906,
+    91.224,
+    92.906,
+    95.95,
+    98.0,
+    101.07,
+    102.91,
+    106.42,
+    107.87,
+    112.41,
+    114.82,
+    118.71,
+    121.76,
+    127.60,
+    126.90,
+    131.29,
+    132.91,
+    137.33,
+    138.91,
+    140.12,
+    140.91,
+    144.24,
+    145.0,
+    150.36,
+    151.96,
+    157.25,
+    158.93,
+    162.50,
+    164.93,
+    167.26,
+    168.93,
+    173.05,
+    174.97,
+    178.49,
+    180.95,
+    183.84,
+    186.21,
+    190.23,
+    192.22,
+    195.08,
+    196.97,
+    200.59,
+    204.38,
+    207.2,
+    208.98,
+    209.0,
+    210.0,
+    222.0,
+]
+
+
+class SeminumericalHessian:
+    """Class for computing Hessians by central differences of xTB gradients that are evaluated concurrently.
+
+    Each of the 6n displaced structures is a separate xtb --grad job, such that the jobs can be spread over a
+    thread pool or any other executor, e.g. one distributing them over several nodes.
+    """
+
+    def __init__(
+        self,
+        xtb_runner: XtbRunner = None,
+        step: float = 0.005,
+        max_workers: int = None,
+        executor: Executor = None,
+    ):
+        """Constructor.
+
+        Arguments:
+            xtb_runner (XtbRunner): The runner computing the gradients. Defaults to a new XtbRunner.
+            step (float): The Cartesian displacement in bohr.
+            max_workers (int): The maximum number of concurrent xtb jobs. Ignored if an executor is given.
+            executor (Executor): The executor to submit the jobs to. Defaults to a new thread pool.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+
+        if np is None:
+            raise ImportError("NumPy is required to compute Hessians.")
+
+        self._xtb_runner = XtbRunner() if xtb_runner is None else xtb_runner
+        self._step = step
+        self._max_workers = max_workers
+        self._executor = executor
+
+    def run_from_xyz(self, xyz: str, parameters: list = []):
+        """Computes the Hessian and the normal modes of the given xyz data.
+
+        Arguments:
+            xyz (str): The xyz formatted data of the molecule.
+            parameters (list[str]): The parameters to append to each xtb call, e.g. the method or the charge.
+
+        Returns:
+            dict: The Hessian in Eh/bohr² of shape (3n, 3n), the normal mode frequencies in cm⁻¹ of shape
+             (n_modes,), with imaginary frequencies as negative values, and the normal modes of shape
+             (n_modes, n, 3).
+
+        Raises:
+            BatchError: If any of the gradient calculations failed. Holds the exceptions of the failed jobs.
+            ValueError: If xtb returned gradients of a different number of atoms.
+        """
+
+        symbols, positions = self._read_xyz(xyz)
+        displaced_positions = self.displace(positions, self._step * BOHR_TO_ANGSTROM)
+
+        structures = [
+            self._write_xyz(symbols, structure_positions)
+            for structure_positions in displaced_positions
+        ]
+        _, gradients = self._xtb_runner.run_gradient_batch(
+            structures,
+            parameters=parameters,
+            max_workers=self._max_workers,
+            executor=self._executor,
+            raise_on_error=True,
+        )
+
+        if gradients.shape[1:] != positions.shape:
+            raise ValueError(
+                f"The gradients hold {gradients.shape[1]} atoms instead of {len(positions)}."
+            )
+
+        hessian = self.assemble(gradients, self._step)
+
+        atomic_numbers = [element_identifiers.index(symbol) + 1 for symbol in symbols]
+        frequencies, normal_modes = self.analyze(
+            hessian, atomic_numbers, positions / BOHR_TO_ANGSTROM
+        )
+
+        return {
+            "hessian": hessian,
+            "normal_mode_frequencies": frequencies,
+            "normal_modes": normal_modes,
+        }
+
+    @staticmethod
+    def displace(positions, step: float):
+        """Generates the structures displaced by ±step along each Cartesian coordinate.
+
+        Arguments:
+            positions (ndarray): The positions of shape (n, 3).
+            step (float): The displacement in the unit of the positions.
+
+        Returns:
+            ndarray: The displaced positions of shape (6n, n, 3), first all positive then all negative
+             displacements in the order of the flattened coordinates.
+        """
+
+        n_coordinates = positions.size
+        displacements = step * np.eye(n_coordinates)
+        displaced = positions.reshape(1, n_coordinates) + np.concatenate(
+            [displacements, -displacements]
+        )
+
+        return displaced.reshape(2 * n_coordinates, *positions.shape)
+
+    @staticmethod
+    def assemble(gradients, step: float):
+        """Assembles the symmetrized Hessian from the gradients of the displaced structures.
+
+        Arguments:
+            gradients (ndarray): The gradients in Eh/bohr of shape (6n, n, 3) in the order of displace.
+            step (float): The displacement in bohr.
+
+        Returns:
+            ndarray: The Hessian in Eh/bohr² of shape (3n, 3n).
+        """
+
+        n_coordinates = gradients.shape[0] // 2
+        gradients = gradients.reshape(2, n_coordinates, n_coordinates)
+        hessian = (gradients[0] - gradients[1]) / (2.0 * step)
+
+        return 0.5 * (hessian + hessian.T)
+
+    @staticmethod
+    def analyze(hessian, atomic_numbers: list, positions):
+        """Computes the harmonic frequencies and normal modes of a Hessian.
+
+        Translations and rotations are projected out of the mass-weighted Hessian, which leaves 3n - 6 modes, or
+        3n - 5 for linear molecules.
+
+        Arguments:
+            hessian (ndarray): The Hessian in Eh/bohr² of shape (3n, 3n).
+            atomic_numbers (list[int]): The atomic numbers.
+            positions (ndarray): The positions in bohr of shape (n, 3).
+
+        Returns:
+            ndarray: The frequencies in cm⁻¹ of shape (n_modes,), imaginary frequencies as negative values.
+            ndarray: The normalized Cartesian normal modes of shape (n_modes, n, 3).
+        """
+
+        masses = np.array([atomic_masses[number - 1] for number in atomic_numbers])
+        sqrt_masses = np.repeat(np.sqrt(masses), 3)
+
+        # translations and rotations around the center of mass in mass-weighted coordinates
+        centered = positions - masses @ positions / masses.sum()
+        axes = np.eye(3)
+        translations = np.tile(axes, (len(masses), 1))
+        rotations = np.cross(centered[:, None, :], axes[None, :, :], axis=2)
+        external = np.concatenate(
+            [translations.reshape(-1, 3), rotations.transpose(0, 2, 1).reshape(-1, 3)],
+            axis=1,
+        )
+        external = external * sqrt_masses[:, None]
+
+        basis, singular_values, _ = np.linalg.svd(external)
+        rank = int((singular_values > 1e-6 * singular_values[0]).sum())
+        internal = basis[:, rank:]
+
+        weighted_hessian = hessian / np.outer(sqrt_masses, sqrt_masses)
+        eigenvalues, eigenvectors = np.linalg.eigh(
+            internal.T @ weighted_hessian @ internal
+        )
+
+        frequencies = (
+            np.sign(eigenvalues) * np.sqrt(np.abs(eigenvalues)) * WAVENUMBER_FACTOR
+        )
+
+        normal_modes = (internal @ eigenvectors / sqrt_masses[:, None]).T
+        normal_modes /= np.linalg.norm(normal_modes, axis=1)[:, None]
+
+        return frequencies, normal_modes.reshape(len(frequencies), len(masses), 3)
+
+    @staticmethod
+    def _read_xyz(xyz: str):
+        """Reads the element symbols and positions of xyz data.
+
+        Arguments:
+            xyz (str): The xyz formatted data, optionally without the atom count and comment lines.
+
+        Returns:
+            list[str]: The element symbols.
+            ndarray: The positions in Å of shape (n, 3).
+        """
+
+        symbols, positions = read_xyz(xyz)
+        symbols = [
+            element_identifiers[int(symbol) - 1] if symbol.isdigit() else symbol
+            for symbol in symbols
+        ]
+
+        return symbols, np.array(positions, dtype=np.float64)
+
+    @staticmethod
+    def _write_xyz(symbols: list, positions):
+
+        atom_lines = [
+            f"{symbol} {x:.10f} {y:.10f} {z:.10f}"
+            for symbol, (x, y, z) in zip(symbols, positions)
+        ]
+
+        return "\n".join([str(len(symbols)), ""] + atom_lines)
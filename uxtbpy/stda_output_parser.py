@@ -1,58 +1,35 @@
-class StdaOutputParser:
+from .output_parser import OutputParser
+
+
+class StdaOutputParser(OutputParser):
     """Class for parsing sTDA output."""
 
     def __init__(self):
         """Constructor."""
 
-        self.lines = None
-
-    def parse(self, data: str):
-        """Parses a given sTDA output line by line to extract different properties.
-
-        Arguments:
-            data (str): The sTDA output.
-
-        Returns:
-            dict: A dictionary containing the different outputs.
-        """
-
-        self.lines = data.split("\n")
-
-        stda_output_data: dict = {}
-
-        # go through lines to find targets
-        for i in range(len(self.lines)):
-
-            if (
-                "excitation energies, transition moments and TDA amplitudes"
-                in self.lines[i]
-            ):
-                excitation_wavelenghts, excitation_oscillator_strengths = (
-                    self._extract_excitations(i + 2)
-                )
-                stda_output_data["excitation_wavelenghts"] = excitation_wavelenghts
-                stda_output_data["excitation_oscillator_strengths"] = (
-                    excitation_oscillator_strengths
-                )
-
-            if "alpha tensor" in self.lines[i]:
-                stda_output_data["polarizability_tensor"] = (
-                    self._extract_polarizability_tensor(i + 4)
-                )
-
-            if "SOS specific optical rotation" in self.lines[i]:
-                (
-                    specific_optical_rotation_wavelengths,
-                    specific_optical_rotation_angles,
-                ) = self._extract_specific_optical_rotations(i + 3)
-                stda_output_data["specific_optical_rotation_wavelengths"] = (
-                    specific_optical_rotation_wavelengths
-                )
-                stda_output_data["specific_optical_rotation_angles"] = (
-                    specific_optical_rotation_angles
-                )
-
-        return stda_output_data
+        super().__init__()
+
+        self._register(
+            "excitation energies, transition moments and TDA amplitudes",
+            ["excitation_wavelenghts", "excitation_oscillator_strengths"],
+            self._extract_excitations,
+            offset=2,
+        )
+        self._register(
+            "alpha tensor",
+            ["polarizability_tensor"],
+            self._extract_polarizability_tensor,
+            offset=4,
+        )
+        self._register(
+            "SOS specific optical rotation",
+            [
+                "specific_optical_rotation_wavelengths",
+                "specific_optical_rotation_angles",
+            ],
+            self._extract_specific_optical_rotations,
+            offset=3,
+        )
 
     def _extract_excitations(self, start_index: int):
 
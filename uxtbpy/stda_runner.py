@@ -1,23 +1,72 @@
 import os
+import shutil
+from concurrent.futures import Executor
 
-from .runner import Runner
+from .runner import Runner, DEFAULT_GRACE_PERIOD
+from .tools import split_parameters, resolve_paths
 from .file_handler import FileHandler
+from .batch_result import BatchResult
+from .memo_cache import MemoCache
+from .result_cache import ResultCache
 from .subprocess_error import SubprocessError
+from .core_scheduler import CoreScheduler
+from .scratch_directory import KEEP_ON_FAILURE
 from .stda_output_parser import StdaOutputParser
 
 
 class StdaRunner(Runner):
     """Adapter class for running stda jobs."""
 
-    def __init__(self, working_directory: str = "./.temp/"):
+    def __init__(
+        self,
+        working_directory: str = "./.temp/",
+        cleanup: str = KEEP_ON_FAILURE,
+        use_shared_memory: bool = False,
+        scheduler: CoreScheduler = None,
+        cache: ResultCache = None,
+        memo: MemoCache = None,
+        timeout: float = None,
+        cpu_timeout: float = None,
+        grace_period: float = DEFAULT_GRACE_PERIOD,
+        wavefunction_cache: ResultCache = None,
+    ):
         """Constructor.
 
         Arguments:
-            stda_directory (str): The path to the directory in which temporary files will be created
-             from the stda calculations.
+            working_directory (str): The path to the root directory in which each stda pipeline is launched in
+             its own new scratch directory. Relative paths in the parameters of run() are resolved against the
+             current directory.
+            cleanup (str): The cleanup policy for the per-job scratch directories. One of "keep", "delete"
+             and "keep_on_failure". With the default, the files written by successful jobs, e.g. xtbopt.xyz and
+             xtbrestart, are deleted together with their scratch directory.
+            use_shared_memory (bool): Flag indicating whether to create the scratch directories on /dev/shm. Takes
+             precedence over the location of the working directory, whose name is used for the root directory
+             /dev/shm/uxtbpy/<name>. Falls back to the working directory if /dev/shm is not available.
+            scheduler (CoreScheduler): The scheduler distributing CPU cores across concurrent jobs.
+            cache (ResultCache): The persistent cache for parsed results of molecule inputs.
+            memo (MemoCache): The in-memory cache for parsed results of molecule inputs. If set, results are
+             returned as immutable mappings.
+            timeout (float): The default wall-clock time limit in seconds of each binary call.
+            cpu_timeout (float): The default CPU time limit in seconds of each binary call.
+            grace_period (float): The time in seconds between SIGTERM and SIGKILL once a time limit expired.
+            wavefunction_cache (ResultCache): The persistent cache for the wfn.xtb files written by xtb4stda for
+             molecule inputs, such that runs differing only in the stda parameters skip xtb4stda. Should be
+             separate from the result cache, as the wavefunctions are much larger than the parsed results.
         """
 
-        super().__init__(working_directory)
+        super().__init__(
+            working_directory,
+            cleanup=cleanup,
+            use_shared_memory=use_shared_memory,
+            scheduler=scheduler,
+            cache=cache,
+            memo=memo,
+            timeout=timeout,
+            cpu_timeout=cpu_timeout,
+            grace_period=grace_period,
+        )
+
+        self._wavefunction_cache = wavefunction_cache
 
     def check(self):
         """Checks if xtb4stda and stda are available on the system.
@@ -29,12 +78,19 @@ class StdaRunner(Runner):
         Runner.check_binary("xtb4stda")
         Runner.check_binary("stda")
 
-    def run(self, xtb4stda_parameters: list = [], stda_parameters: list = []):
+    def run(
+        self,
+        xtb4stda_parameters: list = [],
+        stda_parameters: list = [],
+        fields: list = None,
+    ):
         """Executes the stda pipeline with the given parameters and returns the parsed output.
 
         Arguments:
             xtb4stda_parameters (list[str]): The parameters to append to the xtb4stda call.
             stda_parameters (list[str]): The parameters to append to the stda call.
+            fields (list[str]): The names of the fields to extract from the stda output. If None, all fields are
+             extracted.
 
         Returns:
             dict: The parsed stda output.
@@ -43,12 +99,117 @@ class StdaRunner(Runner):
             RuntimeError: If the stda job failed.
         """
 
-        result = Runner.run_binary(
+        with self._scratch_directory() as directory:
+            return self._run_in_directory(
+                directory,
+                resolve_paths(split_parameters(xtb4stda_parameters)),
+                resolve_paths(split_parameters(stda_parameters)),
+                fields=fields,
+            )
+
+    def _run_in_directory(
+        self,
+        directory: str,
+        xtb4stda_arguments: list,
+        stda_arguments: list,
+        fields: list = None,
+        wavefunction_key: str = None,
+    ):
+        """Executes the stda pipeline with the given arguments in the given directory and returns the parsed output.
+
+        Arguments:
+            directory (str): The path to the directory from which xtb4stda and stda will be launched.
+            xtb4stda_arguments (list[str]): The arguments to pass verbatim to the xtb4stda call.
+            stda_arguments (list[str]): The arguments to pass verbatim to the stda call.
+            fields (list[str]): The names of the fields to extract from the stda output. If None, all fields are
+             extracted.
+            wavefunction_key (str): The key of the wavefunction in the wavefunction cache. If None, xtb4stda is
+             always executed.
+
+        Returns:
+            dict: The parsed stda output.
+
+        Raises:
+            SubprocessError: If the stda job failed.
+        """
+
+        self._prepare_wavefunction(directory, xtb4stda_arguments, wavefunction_key)
+
+        return self._run_stda(directory, stda_arguments, fields=fields)
+
+    def _prepare_wavefunction(
+        self, directory: str, xtb4stda_arguments: list, wavefunction_key: str = None
+    ):
+        """Provides the wavefunction wfn.xtb in the given directory from the wavefunction cache or by executing
+        xtb4stda, storing newly computed wavefunctions in the cache.
+
+        Arguments:
+            directory (str): The path to the directory in which wfn.xtb is provided.
+            xtb4stda_arguments (list[str]): The arguments to pass verbatim to the xtb4stda call.
+            wavefunction_key (str): The key of the wavefunction in the wavefunction cache. If None, xtb4stda is
+             always executed.
+
+        Raises:
+            SubprocessError: If xtb4stda failed.
+        """
+
+        wavefunction_path = os.path.join(directory, "wfn.xtb")
+
+        if wavefunction_key is not None:
+            wavefunction = self._wavefunction_cache.get(wavefunction_key)
+            if wavefunction is not None:
+                with open(wavefunction_path, "wb") as file:
+                    file.write(wavefunction)
+                return
+
+        self._run_xtb4stda(directory, xtb4stda_arguments)
+
+        if wavefunction_key is not None and os.path.isfile(wavefunction_path):
+            with open(wavefunction_path, "rb") as file:
+                self._wavefunction_cache.put(wavefunction_key, file.read())
+
+    def _wavefunction_key(
+        self, molecule_data: str, file_extension: str, xtb4stda_parameters: list
+    ):
+        """Builds the wavefunction cache key of an xtb4stda call.
+
+        Arguments:
+            molecule_data (str): The contents of the molecule file.
+            file_extension (str): The file extension corresponding to the formatting of the molecule file.
+            xtb4stda_parameters (list[str]): The parameters to append to the xtb4stda call.
+
+        Returns:
+            str: The cache key or None if no wavefunction cache is set.
+        """
+
+        if self._wavefunction_cache is None:
+            return None
+
+        return ResultCache.make_key(
+            "xtb4stda",
+            Runner.binary_version("xtb4stda"),
+            "wfn.xtb",
+            file_extension,
+            ResultCache.normalize_molecule_data(molecule_data),
+            split_parameters(xtb4stda_parameters),
+        )
+
+    def _run_xtb4stda(self, directory: str, xtb4stda_arguments: list):
+        """Executes xtb4stda with the given arguments in the given directory, writing the wavefunction wfn.xtb.
+
+        Arguments:
+            directory (str): The path to the directory from which xtb4stda will be launched.
+            xtb4stda_arguments (list[str]): The arguments to pass verbatim to the xtb4stda call.
+
+        Raises:
+            SubprocessError: If xtb4stda failed.
+        """
+
+        result = self._run_binary(
             "xtb4stda",
-            xtb4stda_parameters,
-            working_directory=self._working_directory,
-            write_stdout=True,
-            write_stderr=False,
+            xtb4stda_arguments,
+            working_directory=directory,
+            redirect_output=True,
         )
 
         if result.stderr.decode("utf-8") != "":
@@ -56,18 +217,109 @@ class StdaRunner(Runner):
                 f"xtb4stda failed with standard error: {result.returncode}.",
                 result,
             )
-        result = Runner.run_binary(
+
+    def _run_stda(self, directory: str, stda_arguments: list, fields: list = None):
+        """Executes stda on the wavefunction wfn.xtb in the given directory and returns the parsed output.
+
+        Arguments:
+            directory (str): The path to the directory holding wfn.xtb from which stda will be launched.
+            stda_arguments (list[str]): The arguments to pass verbatim to the stda call.
+            fields (list[str]): The names of the fields to extract from the stda output. If None, all fields are
+             extracted.
+
+        Returns:
+            dict: The parsed stda output.
+
+        Raises:
+            SubprocessError: If stda failed.
+        """
+
+        self._run_binary(
             "stda",
-            ["-xtb"] + stda_parameters,
-            working_directory=self._working_directory,
-            write_stdout=True,
-            write_stderr=False,
+            ["-xtb"] + stda_arguments,
+            working_directory=directory,
+            redirect_output=True,
+        )
+
+        return StdaOutputParser().parse_file(
+            os.path.join(directory, "stda.stdout"), fields=fields
         )
 
-        return StdaOutputParser().parse(result.stdout.decode("utf-8"))
+    def _run_stda_variant(
+        self,
+        wavefunction_path: str,
+        cache_key: str,
+        stda_parameters: list,
+        fields: list = None,
+    ):
+        """Executes stda on a copy of a precomputed wavefunction in its own scratch directory.
+
+        Arguments:
+            wavefunction_path (str): The path to the wfn.xtb file written by xtb4stda.
+            cache_key (str): The key of the job in the caches. If None, the caches are bypassed.
+            stda_parameters (list[str]): The parameters to append to the stda call.
+            fields (list[str]): The names of the fields to extract from the stda output. If None, all fields are
+             extracted.
+
+        Returns:
+            dict: The parsed stda output.
+
+        Raises:
+            SubprocessError: If stda failed.
+        """
+
+        def run(directory):
+            shutil.copyfile(wavefunction_path, os.path.join(directory, "wfn.xtb"))
+
+            return self._run_stda(
+                directory, split_parameters(stda_parameters), fields=fields
+            )
+
+        return self._run_job(cache_key, "stda.stdout", run)
+
+    def _cache_key(
+        self,
+        molecule_data: str,
+        file_extension: str,
+        xtb4stda_parameters: list,
+        stda_parameters: list,
+        fields: list = None,
+    ):
+        """Builds the result cache key of an stda job.
+
+        Arguments:
+            molecule_data (str): The contents of the molecule file.
+            file_extension (str): The file extension corresponding to the formatting of the molecule file.
+            xtb4stda_parameters (list[str]): The parameters to append to the xtb4stda call.
+            stda_parameters (list[str]): The parameters to append to the stda call.
+            fields (list[str]): The names of the fields to extract from the stda output. If None, all fields are
+             extracted.
+
+        Returns:
+            str: The cache key or None if no cache is set.
+        """
+
+        if self._cache is None and self._memo is None:
+            return None
+
+        return ResultCache.make_key(
+            "xtb4stda",
+            Runner.binary_version("xtb4stda"),
+            "stda",
+            Runner.binary_version("stda"),
+            file_extension,
+            ResultCache.normalize_molecule_data(molecule_data),
+            split_parameters(xtb4stda_parameters),
+            split_parameters(stda_parameters),
+            None if fields is None else sorted(fields),
+        )
 
     def run_from_file(
-        self, file_path: str, xtb4stda_parameters: list = [], stda_parameters: list = []
+        self,
+        file_path: str,
+        xtb4stda_parameters: list = [],
+        stda_parameters: list = [],
+        fields: list = None,
     ):
         """Executes the stda pipeline with the given file and parameters and returns the parsed output.
 
@@ -75,6 +327,8 @@ class StdaRunner(Runner):
             file_path (str): The (relative/absolute) path to the molecule file.
             xtb4stda_parameters (list[str]): The parameters to append to the xtb4stda call.
             stda_parameters (list[str]): The parameters to append to the stda call.
+            fields (list[str]): The names of the fields to extract from the stda output. If None, all fields are
+             extracted.
 
         Returns:
             dict: The parsed stda output.
@@ -88,7 +342,35 @@ class StdaRunner(Runner):
         else:
             raise FileNotFoundError("The specified file does not exist.")
 
-        return self.run([file_path] + xtb4stda_parameters, stda_parameters)
+        file_extension = os.path.splitext(file_path)[1].lstrip(".")
+
+        cache_key = None
+        if self._cache is not None or self._memo is not None:
+            cache_key = self._cache_key(
+                FileHandler.read_file(file_path),
+                file_extension,
+                xtb4stda_parameters,
+                stda_parameters,
+                fields=fields,
+            )
+
+        wavefunction_key = None
+        if self._wavefunction_cache is not None:
+            wavefunction_key = self._wavefunction_key(
+                FileHandler.read_file(file_path), file_extension, xtb4stda_parameters
+            )
+
+        return self._run_job(
+            cache_key,
+            "stda.stdout",
+            lambda directory: self._run_in_directory(
+                directory,
+                [file_path] + split_parameters(xtb4stda_parameters),
+                split_parameters(stda_parameters),
+                fields=fields,
+                wavefunction_key=wavefunction_key,
+            ),
+        )
 
     def run_from_molecule_data(
         self,
@@ -96,6 +378,7 @@ class StdaRunner(Runner):
         file_extension: str,
         xtb4stda_parameters: list = [],
         stda_parameters: list = [],
+        fields: list = None,
     ):
         """Executes the stda pipeline with the given molecule data and parameters and returns the parsed output.
 
@@ -104,6 +387,8 @@ class StdaRunner(Runner):
             file_extension (str): The file extension corresponding to the formatting of the molecule file.
             xtb4stda_parameters (list[str]): The parameters to append to the xtb4stda call.
             stda_parameters (list[str]): The parameters to append to the stda call.
+            fields (list[str]): The names of the fields to extract from the stda output. If None, all fields are
+             extracted.
 
         Returns:
             dict: The parsed stda output.
@@ -112,17 +397,40 @@ class StdaRunner(Runner):
             SubprocessError: If stda job failed.
         """
 
-        file_path = os.path.join(self._working_directory, "mol." + file_extension)
-        FileHandler.write_file(file_path, molecule_data)
+        wavefunction_key = self._wavefunction_key(
+            molecule_data, file_extension, xtb4stda_parameters
+        )
 
-        return self.run_from_file(
-            file_path,
-            xtb4stda_parameters=xtb4stda_parameters,
-            stda_parameters=stda_parameters,
+        def run(directory):
+            file_path = os.path.join(directory, "mol." + file_extension)
+            FileHandler.write_file(file_path, molecule_data)
+
+            return self._run_in_directory(
+                directory,
+                [file_path] + split_parameters(xtb4stda_parameters),
+                split_parameters(stda_parameters),
+                fields=fields,
+                wavefunction_key=wavefunction_key,
+            )
+
+        return self._run_job(
+            self._cache_key(
+                molecule_data,
+                file_extension,
+                xtb4stda_parameters,
+                stda_parameters,
+                fields=fields,
+            ),
+            "stda.stdout",
+            run,
         )
 
     def run_from_xyz(
-        self, xyz: str, xtb4stda_parameters: list = [], stda_parameters: list = []
+        self,
+        xyz: str,
+        xtb4stda_parameters: list = [],
+        stda_parameters: list = [],
+        fields: list = None,
     ):
         """Executes the stda pipeline with the given xyz data and parameters and returns the parsed output.
 
@@ -130,6 +438,8 @@ class StdaRunner(Runner):
             xyz (str): The xyz formatted data of the molecule.
             xtb4stda_parameters (list[str]): The parameters to append to the xtb4stda call.
             stda_parameters (list[str]): The parameters to append to the stda call.
+            fields (list[str]): The names of the fields to extract from the stda output. If None, all fields are
+             extracted.
 
         Returns:
             dict: The parsed stda output.
@@ -143,4 +453,170 @@ class StdaRunner(Runner):
             "xyz",
             xtb4stda_parameters=xtb4stda_parameters,
             stda_parameters=stda_parameters,
+            fields=fields,
+        )
+
+    def iter_batch(
+        self,
+        structures: list,
+        xtb4stda_parameters: list = [],
+        stda_parameters: list = [],
+        fields: list = None,
+        max_workers: int = None,
+        executor: Executor = None,
+        ordered: bool = True,
+    ):
+        """Executes the stda pipeline for each of the given xyz data concurrently and yields the results.
+
+        Arguments:
+            structures (list[str]): The xyz formatted data of the molecules.
+            xtb4stda_parameters (list[str]): The parameters to append to each xtb4stda call.
+            stda_parameters (list[str]): The parameters to append to each stda call.
+            fields (list[str]): The names of the fields to extract from the stda output. If None, all fields are
+             extracted.
+            max_workers (int): The maximum number of concurrent stda pipelines. Ignored if an executor is given.
+             Defaults to the number of jobs the scheduler can run at once if a scheduler is set.
+            executor (Executor): The executor to submit the jobs to. Defaults to a new thread pool.
+            ordered (bool): Flag indicating whether to yield results in submission order or as they complete.
+
+        Yields:
+            BatchResult: The result of each job holding either the parsed stda output or the raised exception.
+        """
+
+        jobs = [
+            (
+                "run_from_xyz",
+                (xyz,),
+                {
+                    "xtb4stda_parameters": xtb4stda_parameters,
+                    "stda_parameters": stda_parameters,
+                    "fields": fields,
+                },
+            )
+            for xyz in structures
+        ]
+
+        return self._iter_batch(
+            jobs, max_workers=max_workers, executor=executor, ordered=ordered
+        )
+
+    def run_batch(
+        self,
+        structures: list,
+        xtb4stda_parameters: list = [],
+        stda_parameters: list = [],
+        fields: list = None,
+        max_workers: int = None,
+        executor: Executor = None,
+    ):
+        """Executes the stda pipeline for each of the given xyz data concurrently and returns the results in
+        submission order.
+
+        Arguments:
+            structures (list[str]): The xyz formatted data of the molecules.
+            xtb4stda_parameters (list[str]): The parameters to append to each xtb4stda call.
+            stda_parameters (list[str]): The parameters to append to each stda call.
+            fields (list[str]): The names of the fields to extract from the stda output. If None, all fields are
+             extracted.
+            max_workers (int): The maximum number of concurrent stda pipelines. Ignored if an executor is given.
+             Defaults to the number of jobs the scheduler can run at once if a scheduler is set.
+            executor (Executor): The executor to submit the jobs to. Defaults to a new thread pool.
+
+        Returns:
+            list[BatchResult]: The results holding either the parsed stda output or the raised exception.
+        """
+
+        return list(
+            self.iter_batch(
+                structures,
+                xtb4stda_parameters=xtb4stda_parameters,
+                stda_parameters=stda_parameters,
+                fields=fields,
+                max_workers=max_workers,
+                executor=executor,
+            )
         )
+
+    def run_variants_from_xyz(
+        self,
+        xyz: str,
+        xtb4stda_parameters: list = [],
+        stda_variants: list = [[]],
+        fields: list = None,
+        max_workers: int = None,
+        executor: Executor = None,
+    ):
+        """Executes xtb4stda once for the given xyz data and stda for each of the given parameter sets concurrently.
+
+        Each stda variant runs in its own scratch directory on a copy of the shared wavefunction, e.g. to compute
+        spectra with different energy windows or response properties of the same molecule. Variants are cached
+        like the equivalent run_from_xyz calls and the wavefunction is taken from the wavefunction cache if set.
+        xtb4stda is only run if any of the variants is not cached.
+
+        Arguments:
+            xyz (str): The xyz formatted data of the molecule.
+            xtb4stda_parameters (list[str]): The parameters to append to the xtb4stda call.
+            stda_variants (list[list[str]]): The parameters to append to each stda call, e.g.
+             [["-e 8"], ["-e 10"], ["-rpa"]].
+            fields (list[str]): The names of the fields to extract from the stda output. If None, all fields are
+             extracted.
+            max_workers (int): The maximum number of concurrent stda calls. Ignored if an executor is given.
+             Defaults to the number of jobs the scheduler can run at once if a scheduler is set.
+            executor (Executor): The executor to submit the stda calls to. Defaults to a new thread pool.
+
+        Returns:
+            list[BatchResult]: The results of the variants in order, holding either the parsed stda output or the
+             raised exception.
+
+        Raises:
+            SubprocessError: If xtb4stda failed.
+        """
+
+        cache_keys = [
+            self._cache_key(
+                xyz, "xyz", xtb4stda_parameters, stda_parameters, fields=fields
+            )
+            for stda_parameters in stda_variants
+        ]
+
+        # the wavefunction is only prepared if any of the variants is not cached
+        results = [
+            BatchResult(index, output=self._cached_output(cache_key))
+            for index, cache_key in enumerate(cache_keys)
+        ]
+        missing_indices = [result.index for result in results if result.output is None]
+        if not missing_indices:
+            return results
+
+        with self._scratch_directory() as directory:
+            file_path = os.path.join(directory, "mol.xyz")
+            FileHandler.write_file(file_path, xyz)
+
+            self._prepare_wavefunction(
+                directory,
+                [file_path] + split_parameters(xtb4stda_parameters),
+                self._wavefunction_key(xyz, "xyz", xtb4stda_parameters),
+            )
+
+            jobs = [
+                (
+                    "_run_stda_variant",
+                    (
+                        os.path.join(directory, "wfn.xtb"),
+                        cache_keys[index],
+                        stda_variants[index],
+                    ),
+                    {"fields": fields},
+                )
+                for index in missing_indices
+            ]
+
+            for result in self._iter_batch(
+                jobs, max_workers=max_workers, executor=executor
+            ):
+                index = missing_indices[result.index]
+                results[index] = BatchResult(
+                    index, output=result.output, error=result.error
+                )
+
+        return results
@@ -4,3 +4,19 @@ class SubprocessError(RuntimeError):
     def __init__(self, message, completed_process):
         super().__init__(message)
         self.completed_process = completed_process
+
+    def __reduce__(self):
+        # keep the error picklable so that it can be passed back from worker processes
+        return (self.__class__, (str(self), self.completed_process))
+
+
+class SubprocessTimeoutError(SubprocessError):
+    """Custom error for subprocesses killed after exceeding a time limit."""
+
+    def __init__(self, message, completed_process, stdout=None):
+        super().__init__(message, completed_process)
+        # partial standard output written before the process was killed
+        self.stdout = stdout
+
+    def __reduce__(self):
+        return (self.__class__, (str(self), self.completed_process, self.stdout))
@@ -1,12 +1,113 @@
 import os
-from contextlib import contextmanager
+import math
+import shlex
 
 
-@contextmanager
-def change_directory(destination: str):
+def split_parameters(parameters: list):
+    """Splits command line parameters given as strings into single arguments following shell syntax.
+
+    Arguments:
+        parameters (list[str]): The parameters, e.g. ["--opt", "--chrg 0"].
+
+    Returns:
+        list[str]: The arguments, e.g. ["--opt", "--chrg", "0"].
+    """
+
+    return [argument for parameter in parameters for argument in shlex.split(parameter)]
+
+
+def resolve_paths(arguments: list):
+    """Makes the arguments naming existing files or directories relative to the current directory absolute, such
+    that they remain valid when the binary is launched in a scratch directory.
+
+    Arguments:
+        arguments (list[str]): The arguments, e.g. ["input.xyz", "--opt"].
+
+    Returns:
+        list[str]: The arguments with absolute paths, e.g. ["/home/user/input.xyz", "--opt"].
+    """
+
+    return [
+        (
+            os.path.abspath(argument)
+            if not argument.startswith("-")
+            and not os.path.isabs(argument)
+            and os.path.exists(argument)
+            else argument
+        )
+        for argument in arguments
+    ]
+
+
+def _read_cgroup_cpu_limit():
+    """Reads the CPU quota of the current cgroup (v2 or v1).
+
+    Returns:
+        float: The number of CPUs granted by the quota or None if there is no quota.
+    """
+
+    try:
+        with open("/sys/fs/cgroup/cpu.max", "r") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+
     try:
-        cwd = os.getcwd()
-        os.chdir(destination)
-        yield
-    finally:
-        os.chdir(cwd)
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us", "r") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us", "r") as f:
+            period = int(f.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+
+    return None
+
+
+def available_cores():
+    """Determines the number of CPU cores this process may use, respecting the CPU affinity mask and cgroup
+    CPU quotas in containers.
+
+    Returns:
+        int: The number of usable cores.
+    """
+
+    if hasattr(os, "sched_getaffinity"):
+        n_cores = len(os.sched_getaffinity(0))
+    else:
+        n_cores = os.cpu_count() or 1
+
+    cgroup_limit = _read_cgroup_cpu_limit()
+    if cgroup_limit is not None:
+        n_cores = min(n_cores, math.ceil(cgroup_limit))
+
+    return max(1, n_cores)
+
+
+def read_xyz(xyz: str):
+    """Reads the element symbols and positions of xyz data.
+
+    Arguments:
+        xyz (str): The xyz formatted data, optionally without the atom count and comment lines. Elements may be
+         given as symbols or atomic numbers.
+
+    Returns:
+        list[str]: The capitalized element symbols or the atomic numbers as given.
+        list[tuple[float]]: The positions in Å.
+    """
+
+    lines = [line.split() for line in xyz.strip().split("\n")]
+    if len(lines[0]) == 1 and lines[0][0].isdigit():
+        lines = lines[2:]
+    lines = [line_split for line_split in lines if line_split]
+
+    symbols = [line_split[0].capitalize() for line_split in lines]
+    positions = [
+        tuple(float(token) for token in line_split[1:4]) for line_split in lines
+    ]
+
+    return symbols, positions
@@ -0,0 +1,156 @@
+import time
+
+from .xtb_stream_parser import SCF_ITERATION, OPTIMIZATION_CYCLE
+
+
+class WatchdogAbort(Exception):
+    """Error raised from the stream callback to abort a job on behalf of a watchdog."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class Watchdog:
+    """Base class for predicates checking the progress of a running xTB job.
+
+    A watchdog is called with each StreamEvent and returns the reason for aborting the job or None. Any callable
+    following this protocol can be used as watchdog. Watchdogs are copied for each job, such that their state is
+    never shared between jobs.
+    """
+
+    def start(self):
+        """Resets the state of the watchdog when the job is started."""
+
+        pass
+
+    def __call__(self, event):
+        """Checks a single event.
+
+        Arguments:
+            event (StreamEvent): The event.
+
+        Returns:
+            str: The reason for aborting the job or None.
+        """
+
+        return None
+
+
+class MaxOptimizationCycles(Watchdog):
+    """Watchdog aborting geometry optimizations exceeding a maximum number of cycles."""
+
+    def __init__(self, max_cycles: int):
+        """Constructor.
+
+        Arguments:
+            max_cycles (int): The maximum number of optimization cycles.
+        """
+
+        self.max_cycles = max_cycles
+
+    def __call__(self, event):
+
+        if event.kind != OPTIMIZATION_CYCLE:
+            return None
+
+        # the cycle is unknown if its header line was not recognized
+        cycle = event.data.get("cycle")
+        if cycle is not None and cycle > self.max_cycles:
+            return f"Exceeded {self.max_cycles} optimization cycles."
+
+        return None
+
+
+class MaxWallTime(Watchdog):
+    """Watchdog aborting jobs running longer than a maximum wall time.
+
+    The wall time is only checked when the job prints progress.
+    """
+
+    def __init__(self, max_seconds: float):
+        """Constructor.
+
+        Arguments:
+            max_seconds (float): The maximum wall time in seconds.
+        """
+
+        self.max_seconds = max_seconds
+        self._start_time = None
+
+    def start(self):
+
+        self._start_time = time.monotonic()
+
+    def __call__(self, event):
+
+        if self._start_time is None:
+            self._start_time = time.monotonic()
+
+        if time.monotonic() - self._start_time > self.max_seconds:
+            return f"Exceeded wall time of {self.max_seconds} s."
+
+        return None
+
+
+class NoEnergyDecrease(Watchdog):
+    """Watchdog aborting geometry optimizations whose energy has not decreased over a number of cycles."""
+
+    def __init__(self, cycles: int, threshold: float = 0.0):
+        """Constructor.
+
+        Arguments:
+            cycles (int): The number of consecutive optimization cycles without a new lowest energy after which
+             the job is aborted.
+            threshold (float): The minimum decrease in Eh below the lowest energy so far counted as decrease.
+        """
+
+        self.cycles = cycles
+        self.threshold = threshold
+        self._lowest_energy = None
+        self._stalled_cycles = 0
+
+    def start(self):
+
+        self._lowest_energy = None
+        self._stalled_cycles = 0
+
+    def __call__(self, event):
+
+        if event.kind != OPTIMIZATION_CYCLE:
+            return None
+
+        energy = event.data["energy"]
+        if self._lowest_energy is None or energy < self._lowest_energy - self.threshold:
+            self._lowest_energy = energy
+            self._stalled_cycles = 0
+            return None
+
+        self._stalled_cycles += 1
+        if self._stalled_cycles >= self.cycles:
+            return f"Energy did not decrease over {self.cycles} optimization cycles."
+
+        return None
+
+
+class ScfNotConverging(Watchdog):
+    """Watchdog aborting jobs whose SCF exceeds a maximum number of iterations."""
+
+    def __init__(self, max_iterations: int):
+        """Constructor.
+
+        Arguments:
+            max_iterations (int): The maximum number of iterations of a single SCF.
+        """
+
+        self.max_iterations = max_iterations
+
+    def __call__(self, event):
+
+        if (
+            event.kind == SCF_ITERATION
+            and event.data["iteration"] > self.max_iterations
+        ):
+            return f"SCF did not converge within {self.max_iterations} iterations."
+
+        return None
@@ -0,0 +1,190 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class WibergMatrix:
+    """Class for a sparse Wiberg bond index matrix in compressed sparse row (CSR) format.
+
+    Only the bond indices printed by xTB are stored. Row and column indices are zero-based atom indices, i.e. they
+    match the indices of the dense matrix.
+    """
+
+    def __init__(self, n_atoms: int, indptr: array, indices: array, data: array):
+        """Constructor.
+
+        Arguments:
+            n_atoms (int): The number of atoms.
+            indptr (array): The row pointers of length n_atoms + 1.
+            indices (array): The column indices of the stored bond indices.
+            data (array): The stored bond indices.
+        """
+
+        self.n_atoms = n_atoms
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+
+    @classmethod
+    def from_triplets(cls, n_atoms: int, rows: array, columns: array, values: array):
+        """Builds the CSR matrix from (row, column, value) triplets with a counting sort over the rows.
+
+        Duplicate entries are resolved in favour of the last one.
+
+        Arguments:
+            n_atoms (int): The number of atoms.
+            rows (array): The row indices.
+            columns (array): The column indices.
+            values (array): The bond indices.
+
+        Returns:
+            WibergMatrix: The sparse matrix.
+        """
+
+        entries = {}
+        for row, column, value in zip(rows, columns, values):
+            entries[(row, column)] = value
+
+        indptr = array("l", [0] * (n_atoms + 1))
+        for row, _ in entries:
+            indptr[row + 1] += 1
+        for i in range(n_atoms):
+            indptr[i + 1] += indptr[i]
+
+        indices = array("l", [0] * len(entries))
+        data = array("d", [0.0] * len(entries))
+        position = indptr[:-1]
+        for (row, column), value in entries.items():
+            indices[position[row]] = column
+            data[position[row]] = value
+            position[row] += 1
+
+        return cls(n_atoms, indptr, indices, data)
+
+    @property
+    def shape(self):
+        """The shape of the matrix.
+
+        Returns:
+            tuple[int]: The number of rows and columns.
+        """
+
+        return (self.n_atoms, self.n_atoms)
+
+    @property
+    def nnz(self):
+        """The number of stored bond indices.
+
+        Returns:
+            int: The number of stored bond indices.
+        """
+
+        return len(self.data)
+
+    def neighbours(self, atom_index: int):
+        """Looks up the bonded partners of a given atom.
+
+        Arguments:
+            atom_index (int): The zero-based index of the atom.
+
+        Returns:
+            dict: The bond indices keyed by the zero-based indices of the bonded atoms.
+        """
+
+        start, end = self.indptr[atom_index], self.indptr[atom_index + 1]
+        return dict(zip(self.indices[start:end], self.data[start:end]))
+
+    def __getitem__(self, key: tuple):
+        """Retrieves the bond index between two atoms.
+
+        Arguments:
+            key (tuple[int]): The zero-based indices of the two atoms.
+
+        Returns:
+            float: The bond index or 0.0 if no bond index is stored.
+        """
+
+        i, j = key
+        for k in range(self.indptr[i], self.indptr[i + 1]):
+            if self.indices[k] == j:
+                return self.data[k]
+
+        return 0.0
+
+    def __eq__(self, other):
+
+        if not isinstance(other, WibergMatrix):
+            return NotImplemented
+
+        return self.n_atoms == other.n_atoms and all(
+            self.neighbours(i) == other.neighbours(i) for i in range(self.n_atoms)
+        )
+
+    def __repr__(self):
+
+        return f"WibergMatrix(n_atoms={self.n_atoms}, nnz={self.nnz})"
+
+    def to_triplets(self):
+        """Converts the matrix to (row, column, value) triplets.
+
+        Returns:
+            list[tuple]: The triplets of all stored bond indices.
+        """
+
+        return [
+            (i, self.indices[k], self.data[k])
+            for i in range(self.n_atoms)
+            for k in range(self.indptr[i], self.indptr[i + 1])
+        ]
+
+    def to_dense(self):
+        """Builds the dense matrix.
+
+        Returns:
+            list[list[float]]: The dense n_atoms x n_atoms matrix.
+        """
+
+        matrix = [[0.0 for _ in range(self.n_atoms)] for __ in range(self.n_atoms)]
+        for i, j, value in self.to_triplets():
+            matrix[i][j] = value
+
+        return matrix
+
+    def to_numpy(self):
+        """Builds the dense matrix as NumPy array.
+
+        Returns:
+            ndarray: The dense float64 array of shape (n_atoms, n_atoms).
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+
+        if np is None:
+            raise ImportError("NumPy is required to build an array.")
+
+        matrix = np.zeros(self.shape)
+        rows = np.repeat(np.arange(self.n_atoms), np.diff(np.asarray(self.indptr)))
+        matrix[rows, np.asarray(self.indices)] = np.asarray(self.data)
+
+        return matrix
+
+    def to_scipy(self):
+        """Converts the matrix to a SciPy CSR matrix without copying the index structure through Python objects.
+
+        Returns:
+            csr_matrix: The SciPy sparse matrix.
+
+        Raises:
+            ImportError: If SciPy is not installed.
+        """
+
+        from scipy.sparse import csr_matrix
+
+        return csr_matrix(
+            (np.asarray(self.data), np.asarray(self.indices), np.asarray(self.indptr)),
+            shape=self.shape,
+        )
@@ -1,5 +1,14 @@
+import re
 import warnings
-from string import digits
+from array import array
+
+from .output_parser import OutputParser
+from .wiberg_matrix import WibergMatrix
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 element_identifiers = [
@@ -92,123 +101,127 @@ element_identifiers = [
 ]
 
 
-class XtbOutputParser:
+N_ATOMS_KEYWORD = "Mol. C6AA /au·bohr⁶"
+
+# lines of the reduced masses/intensities blocks only contain mode indices and values
+_MODE_VALUE_LINE = re.compile(r"[0-9:. ]*")
+
+
+class XtbOutputParser(OutputParser):
     """Class for parsing xTB output."""
 
-    def __init__(self):
-        """Constructor."""
+    _keywords = [N_ATOMS_KEYWORD]
+    _context = 2
+
+    def __init__(self, as_arrays: bool = False, sparse_wiberg: bool = False):
+        """Constructor.
+
+        Arguments:
+            as_arrays (bool): Flag indicating whether to return positions, per-atom properties, vibrational data and
+             the Wiberg matrix as float64 NumPy arrays instead of nested lists.
+            sparse_wiberg (bool): Flag indicating whether to return the Wiberg matrix as sparse WibergMatrix holding
+             only the printed bond indices.
+
+        Raises:
+            ImportError: If arrays are requested but NumPy is not installed.
+        """
+
+        super().__init__()
+
+        if as_arrays and np is None:
+            raise ImportError("NumPy is required to return arrays.")
+        self._as_arrays = as_arrays
+        self._sparse_wiberg = sparse_wiberg
 
-        self.lines = None
         self.n_atoms = None
 
-    def parse(self, data: str):
-        """Parses a given xTB output line by line to extract different properties.
+        self._register("HOMO-LUMO GAP", ["homo_lumo_gap"], self._extract_homo_lumo_gap)
+        self._register("(HOMO)", ["homo_energy"], self._extract_homo)
+        self._register("(LUMO)", ["lumo_energy"], self._extract_lumo)
+        self._register("TOTAL ENERGY", ["energy"], self._extract_energy)
+        self._register(
+            "TOTAL ENTHALPY", ["enthalpy_energy"], self._extract_enthalpy_energy
+        )
+        self._register("TOTAL FREE ENERGY", ["free_energy"], self._extract_free_energy)
+        self._register(
+            "partition function",
+            ["enthalpy", "heat_capacity", "entropy"],
+            self._extract_thermodynamic_functions,
+            offset=6,
+        )
+        self._register("zero point energy", ["zpve"], self._extract_zpve)
+        self._register(
+            "molecular dipole", ["dipole_moment"], self._extract_dipole_moment, offset=3
+        )
+        self._register(
+            "molecular mass/u", ["molecular_mass"], self._extract_molecular_mass
+        )
+        self._register(
+            "final structure",
+            ["atomic_numbers", "optimized_atomic_positions", "optimized_xyz"],
+            self._extract_final_structure,
+            offset=4,
+        )
+        self._register(
+            "projected vibrational frequencies",
+            ["vibrational_frequencies"],
+            self._extract_vibrational_frequencies,
+            offset=1,
+        )
+        self._register(
+            "reduced masses", ["reduced_masses"], self._extract_mode_values, offset=1
+        )
+        self._register(
+            "IR intensities", ["ir_intensities"], self._extract_mode_values, offset=1
+        )
+        self._register(
+            "Raman intensities",
+            ["raman_intensities"],
+            self._extract_mode_values,
+            offset=1,
+        )
+        self._register(
+            "covCN",
+            [
+                "atomic_coordination_numbers",
+                "atomic_partial_charges",
+                "atomic_dispersion_coefficients",
+                "atomic_polarizabilities",
+            ],
+            self._extract_atomic_properties,
+            offset=1,
+            condition=lambda line: "#" in line and "q" in line,
+        )
+        self._register(
+            "Mol. α(0) /au", ["polarizability"], self._extract_polarizability
+        )
+        self._register(
+            "Wiberg/Mayer (AO) data.",
+            ["wiberg_index_matrix"],
+            self._extract_wiberg_index_matrix,
+            offset=6,
+        )
+
+    def _prepare(self, located_keywords: dict):
+        """Retrieves the number of atoms required by the extractors of per-atom properties.
 
         Arguments:
-            data (str): The xTB output.
+            located_keywords (dict): The lines and line indices of the located additional keywords.
 
         Returns:
-            dict: A dictionary containing the different outputs.
+            bool: Flag indicating whether the number of atoms could be retrieved.
         """
 
-        self.lines = data.split("\n")
+        self.n_atoms = None
 
-        xtb_output_data: dict = {}
+        if N_ATOMS_KEYWORD not in located_keywords:
+            warnings.warn("Failed to retrieve number of atoms. Check input file.")
+            return False
 
-        for i, line in enumerate(self.lines):
-            if "Mol. C6AA /au·bohr⁶" in line:
-                self.n_atoms = int(self.lines[i - 2].split()[0])
-                break
+        lines, line_index = located_keywords[N_ATOMS_KEYWORD]
+        self.n_atoms = int(lines[line_index - 2].split()[0])
 
-        if self.n_atoms is None:
-            warnings.warn("Failed to retrieve number of atoms. Check input file.")
-            return xtb_output_data
-
-        # go through lines to find targets
-        for i in range(len(self.lines)):
-
-            if "HOMO-LUMO GAP" in self.lines[i]:
-                xtb_output_data["homo_lumo_gap"] = self._extract_homo_lumo_gap(i)
-
-            if "(HOMO)" in self.lines[i]:
-                xtb_output_data["homo_energy"] = self._extract_homo(i)
-
-            if "(LUMO)" in self.lines[i]:
-                xtb_output_data["lumo_energy"] = self._extract_lumo(i)
-
-            if "TOTAL ENERGY" in self.lines[i]:
-                xtb_output_data["energy"] = self._extract_energy(i)
-
-            if "TOTAL ENTHALPY" in self.lines[i]:
-                xtb_output_data["enthalpy_energy"] = self._extract_enthalpy_energy(i)
-
-            if "TOTAL FREE ENERGY" in self.lines[i]:
-                xtb_output_data["free_energy"] = self._extract_free_energy(i)
-
-            if "partition function" in self.lines[i]:
-                xtb_output_data["enthalpy"] = self._extract_enthalpy(i + 6)
-                xtb_output_data["heat_capacity"] = self._extract_heat_capacity(i + 6)
-                xtb_output_data["entropy"] = self._extract_entropy(i + 6)
-
-            if "zero point energy" in self.lines[i]:
-                xtb_output_data["zpve"] = self._extract_zpve(i)
-
-            if "molecular dipole" in self.lines[i]:
-                xtb_output_data["dipole_moment"] = self._extract_dipole_moment(i + 3)
-
-            if "molecular mass/u" in self.lines[i]:
-                xtb_output_data["molecular_mass"] = self._extract_molecular_mass(i)
-
-            if "final structure" in self.lines[i]:
-                xtb_output_data["atomic_numbers"] = self._extract_atomic_numbers(i + 4)
-                xtb_output_data["optimized_atomic_positions"] = (
-                    self._extract_optimized_atomic_positions(i + 4)
-                )
-                xtb_output_data["optimized_xyz"] = self._extract_optimized_xyz(i + 4)
-
-            if "projected vibrational frequencies" in self.lines[i]:
-                xtb_output_data["vibrational_frequencies"] = (
-                    self._extract_vibrational_frequencies(i + 1)
-                )
-
-            if "reduced masses" in self.lines[i]:
-                xtb_output_data["reduced_masses"] = self._extract_reduced_masses(i + 1)
-
-            if "IR intensities" in self.lines[i]:
-                xtb_output_data["ir_intensities"] = self._extract_ir_intensities(i + 1)
-
-            if "Raman intensities" in self.lines[i]:
-                xtb_output_data["raman_intensities"] = self._extract_raman_intensities(
-                    i + 1
-                )
-
-            if (
-                "#" in self.lines[i]
-                and "covCN" in self.lines[i]
-                and "q" in self.lines[i]
-            ):
-                xtb_output_data["atomic_coordination_numbers"] = (
-                    self._extract_atomic_coordination_numbers(i + 1)
-                )
-                xtb_output_data["atomic_partial_charges"] = (
-                    self._extract_atomic_partial_charges(i + 1)
-                )
-                xtb_output_data["atomic_dispersion_coefficients"] = (
-                    self._extract_atomic_dispersion_coefficients(i + 1)
-                )
-                xtb_output_data["atomic_polarizabilities"] = (
-                    self._extract_atomic_polarizabilities(i + 1)
-                )
-
-            if "Mol. α(0) /au" in self.lines[i]:
-                xtb_output_data["polarizability"] = self._extract_polarizability(i)
-
-            if "Wiberg/Mayer (AO) data." in self.lines[i]:
-                xtb_output_data["wiberg_index_matrix"] = (
-                    self._extract_wiberg_index_matrix(i + 6)
-                )
-
-        return xtb_output_data
+        return True
 
     def _extract_homo_lumo_gap(self, start_index: int):
 
@@ -235,20 +248,10 @@ class XtbOutputParser:
         line_split = self.lines[start_index].split()
         return float(line_split[4])
 
-    def _extract_enthalpy(self, start_index: int):
-
-        line_split = self.lines[start_index].split()
-        return float(line_split[1])
-
-    def _extract_heat_capacity(self, start_index: int):
-
-        line_split = self.lines[start_index].split()
-        return float(line_split[2])
-
-    def _extract_entropy(self, start_index: int):
+    def _extract_thermodynamic_functions(self, start_index: int):
 
         line_split = self.lines[start_index].split()
-        return float(line_split[3])
+        return float(line_split[1]), float(line_split[2]), float(line_split[3])
 
     def _extract_zpve(self, start_index: int):
 
@@ -275,167 +278,136 @@ class XtbOutputParser:
         line_split = self.lines[start_index].split()
         return float(line_split[4])
 
-    def _extract_atomic_numbers(self, start_index: int):
+    def _to_values(self, tokens: list):
+        """Converts a flat list of numeric tokens to floats in a single pass.
 
-        atomic_numbers = []
+        Arguments:
+            tokens (list[str]): The tokens.
 
-        while self.lines[start_index].strip() != "":
+        Returns:
+            list[float] | ndarray: The values as list or as float64 array of shape (len(tokens),).
+        """
 
-            line_split = self.lines[start_index].split()
-            atomic_numbers.append(element_identifiers.index(line_split[0]) + 1)
-            start_index += 1
+        if self._as_arrays:
+            return np.array(tokens, dtype=np.float64)
 
-        return atomic_numbers
+        return [float(token) for token in tokens]
 
-    def _extract_optimized_atomic_positions(self, start_index: int):
+    def _to_columns(self, rows: list):
+        """Converts rows of numeric tokens to one sequence of floats per column in a single pass.
 
-        optimized_atomic_positions = []
+        Arguments:
+            rows (list[list[str]]): The rows of tokens.
 
-        while self.lines[start_index].strip() != "":
+        Returns:
+            tuple: The columns as lists or as contiguous float64 arrays of shape (len(rows),).
+        """
 
-            line_split = self.lines[start_index].split()
-            optimized_atomic_positions.append(
-                [float(line_split[1]), float(line_split[2]), float(line_split[3])]
-            )
-            start_index += 1
+        if self._as_arrays:
+            return tuple(np.array(rows, dtype=np.float64).T.copy())
 
-        return optimized_atomic_positions
+        return tuple([float(token) for token in column] for column in zip(*rows))
 
-    def _extract_optimized_xyz(self, start_index: int):
+    def _extract_final_structure(self, start_index: int):
 
+        atomic_numbers = []
+        coordinates = []
         optimized_xyz_lines = []
 
         while self.lines[start_index].strip() != "":
 
-            optimized_xyz_lines.append(" ".join(self.lines[start_index].split()))
+            line_split = self.lines[start_index].split()
+            atomic_numbers.append(element_identifiers.index(line_split[0]) + 1)
+            coordinates.append(line_split[1:4])
+            optimized_xyz_lines.append(" ".join(line_split))
             start_index += 1
 
-        return "\n\n".join(
+        if self._as_arrays:
+            optimized_atomic_positions = np.array(coordinates, dtype=np.float64)
+        else:
+            optimized_atomic_positions = [
+                [float(token) for token in position] for position in coordinates
+            ]
+
+        optimized_xyz = "\n\n".join(
             [str(len(optimized_xyz_lines)), "\n".join(optimized_xyz_lines)]
         )
 
+        return atomic_numbers, optimized_atomic_positions, optimized_xyz
+
     def _extract_vibrational_frequencies(self, start_index: int):
 
-        vibrational_frequencies = []
+        tokens = []
         while "eigval" in self.lines[start_index]:
 
-            line_split = self.lines[start_index].split()
-            for i in range(2, len(line_split)):
-                vibrational_frequencies.append(float(line_split[i]))
-
-            start_index += 1
-
-        return vibrational_frequencies
-
-    def _extract_reduced_masses(self, start_index: int):
-
-        reduced_masses = []
-
-        allowed = set(digits).union(":. ")
-
-        while all(_ in allowed for _ in self.lines[start_index]):
-
-            line_split = self.lines[start_index].replace(":", "").split()
-            for i in range(1, len(line_split), 2):
-                reduced_masses.append(float(line_split[i]))
-
-            start_index += 1
-
-        return reduced_masses
-
-    def _extract_ir_intensities(self, start_index: int):
-
-        ir_intensities = []
-
-        allowed = set(digits).union(":. ")
-
-        while all(_ in allowed for _ in self.lines[start_index]):
-
-            line_split = self.lines[start_index].replace(":", "").split()
-            for i in range(1, len(line_split), 2):
-                ir_intensities.append(float(line_split[i]))
-
+            tokens.extend(self.lines[start_index].split()[2:])
             start_index += 1
 
-        return ir_intensities
+        return self._to_values(tokens)
 
-    def _extract_raman_intensities(self, start_index: int):
+    def _extract_mode_values(self, start_index: int):
 
-        raman_intensities = []
+        tokens = []
 
-        allowed = set(digits).union(":. ")
+        line = self.lines[start_index]
+        while _MODE_VALUE_LINE.fullmatch(line):
 
-        while all(_ in allowed for _ in self.lines[start_index]):
-
-            line_split = self.lines[start_index].replace(":", "").split()
-            for i in range(1, len(line_split), 2):
-                raman_intensities.append(float(line_split[i]))
+            # lines consist of "index: value" pairs
+            tokens.extend(line.replace(":", "").split()[1::2])
 
             start_index += 1
+            line = self.lines[start_index]
 
-        return raman_intensities
-
-    def _extract_atomic_coordination_numbers(self, start_index: int):
-
-        return [
-            float(self.lines[start_index + i].strip().split()[3])
-            for i in range(self.n_atoms)
-        ]
+        return self._to_values(tokens)
 
-    def _extract_atomic_partial_charges(self, start_index: int):
+    def _extract_atomic_properties(self, start_index: int):
 
-        return [
-            float(self.lines[start_index + i].strip().split()[4])
-            for i in range(self.n_atoms)
-        ]
-
-    def _extract_atomic_dispersion_coefficients(self, start_index: int):
-
-        return [
-            float(self.lines[start_index + i].strip().split()[5])
-            for i in range(self.n_atoms)
-        ]
-
-    def _extract_atomic_polarizabilities(self, start_index: int):
-
-        return [
-            float(self.lines[start_index + i].strip().split()[6])
-            for i in range(self.n_atoms)
-        ]
+        # columns: coordination numbers, partial charges, dispersion coefficients and polarizabilities
+        return self._to_columns(
+            [self.lines[start_index + i].split()[3:7] for i in range(self.n_atoms)]
+        )
 
     def _extract_wiberg_index_matrix(self, start_index: int):
 
-        # set up Wiberg matrix
-        wiberg_index_matrix = [
-            [0.0 for _ in range(self.n_atoms)] for __ in range(self.n_atoms)
-        ]
-
-        while "-------" not in self.lines[start_index]:
-
-            line_split = self.lines[start_index].split()
-            i_index = int(line_split[0]) - 1
-
-            for i in range(5, len(line_split), 3):
-
-                j_index = int(line_split[i]) - 1
-
-                wiberg_index_matrix[i_index][j_index] = float(line_split[i + 2])
-
-            while "--" not in self.lines[start_index + 1]:
-
-                start_index += 1
-                line_split = self.lines[start_index].split()
-                # break if next line corresponds to the next atom which has no
-                # associated Wiberg bond indices
+        rows = array("l")
+        columns = array("l")
+        values = array("d")
+
+        atom_index = None
+        line = self.lines[start_index]
+        while "-------" not in line:
+
+            if "--" in line:
+                # first line of an atom followed by its bonded atoms in (index, symbol, WBO) triples
+                atom, _, bonds = line.partition("--")
+                atom_index = int(atom.split()[0]) - 1
+                line_split = bonds.split()
+            else:
+                line_split = line.split()
+                # skip atoms which have no associated Wiberg bond indices
                 if len(line_split) % 3 != 0:
-                    break
+                    line_split = []
 
-                for i in range(0, len(line_split), 3):
+            for i in range(0, len(line_split), 3):
+                rows.append(atom_index)
+                columns.append(int(line_split[i]) - 1)
+                values.append(float(line_split[i + 2]))
 
-                    j_index = int(line_split[i]) - 1
+            start_index += 1
+            line = self.lines[start_index]
 
-                    wiberg_index_matrix[i_index][j_index] = float(line_split[i + 2])
+        if self._sparse_wiberg:
+            return WibergMatrix.from_triplets(self.n_atoms, rows, columns, values)
 
-            start_index += 1
+        # set up Wiberg matrix
+        if self._as_arrays:
+            wiberg_index_matrix = np.zeros((self.n_atoms, self.n_atoms))
+        else:
+            wiberg_index_matrix = [
+                [0.0 for _ in range(self.n_atoms)] for __ in range(self.n_atoms)
+            ]
+
+        for i, j, value in zip(rows, columns, values):
+            wiberg_index_matrix[i][j] = value
 
         return wiberg_index_matrix
@@ -1,22 +1,93 @@
 import os
+import copy
+from concurrent.futures import Executor
 
-from .runner import Runner
+from .runner import Runner, DEFAULT_GRACE_PERIOD
+from .tools import split_parameters, resolve_paths, read_xyz
 from .file_handler import FileHandler
+from .memo_cache import MemoCache
+from .result_cache import ResultCache
+from .core_scheduler import CoreScheduler
+from .restart_store import RestartStore
+from .scratch_directory import KEEP_ON_FAILURE
+from .batch_result import BatchError
 from .xtb_output_parser import XtbOutputParser
+from .xtb_stream_parser import XtbStreamParser
+from .xtb_sidecar_loader import XtbSidecarLoader
+from .hessian_loader import HessianLoader, HESSIAN_FIELDS
+from .gradient_loader import GradientLoader, GRADIENT_FIELDS
+from .watchdog import Watchdog, WatchdogAbort
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class XtbRunner(Runner):
     """Adapter class for running xtb jobs."""
 
-    def __init__(self, working_directory: str = "./.temp/"):
+    def __init__(
+        self,
+        working_directory: str = "./.temp/",
+        cleanup: str = KEEP_ON_FAILURE,
+        use_shared_memory: bool = False,
+        scheduler: CoreScheduler = None,
+        cache: ResultCache = None,
+        memo: MemoCache = None,
+        as_arrays: bool = False,
+        sparse_wiberg: bool = False,
+        use_sidecars: bool = False,
+        timeout: float = None,
+        cpu_timeout: float = None,
+        grace_period: float = DEFAULT_GRACE_PERIOD,
+        restart_store: RestartStore = None,
+    ):
         """Constructor.
 
         Arguments:
-            working_directory (str): The path to the directory from which xtb will be launched.
-            output_format (str): The format to output the result of xtb calculations.
+            working_directory (str): The path to the root directory in which each xtb job is launched in its own
+             new scratch directory. Relative paths in the parameters of run() are resolved against the current
+             directory.
+            cleanup (str): The cleanup policy for the per-job scratch directories. One of "keep", "delete"
+             and "keep_on_failure". With the default, the files written by successful jobs, e.g. xtbopt.xyz and
+             xtbrestart, are deleted together with their scratch directory.
+            use_shared_memory (bool): Flag indicating whether to create the scratch directories on /dev/shm. Takes
+             precedence over the location of the working directory, whose name is used for the root directory
+             /dev/shm/uxtbpy/<name>. Falls back to the working directory if /dev/shm is not available.
+            scheduler (CoreScheduler): The scheduler distributing CPU cores across concurrent jobs.
+            cache (ResultCache): The persistent cache for parsed results of molecule inputs.
+            memo (MemoCache): The in-memory cache for parsed results of molecule inputs. If set, results are
+             returned as immutable mappings.
+            as_arrays (bool): Flag indicating whether to return array-valued fields as float64 NumPy arrays.
+            sparse_wiberg (bool): Flag indicating whether to return the Wiberg matrix as sparse WibergMatrix.
+            use_sidecars (bool): Flag indicating whether to load the results from the machine-readable files xtb
+             writes to the working directory, falling back to the standard output for missing files. Adds --json
+             to the xtb call.
+            timeout (float): The default wall-clock time limit in seconds of each binary call.
+            cpu_timeout (float): The default CPU time limit in seconds of each binary call.
+            grace_period (float): The time in seconds between SIGTERM and SIGKILL once a time limit expired.
+            restart_store (RestartStore): The store seeding xyz inputs with the xtbrestart file of a previous
+             calculation of the same molecule at a similar geometry. If None, the SCF of each job starts from
+             scratch.
         """
 
-        super().__init__(working_directory)
+        super().__init__(
+            working_directory,
+            cleanup=cleanup,
+            use_shared_memory=use_shared_memory,
+            scheduler=scheduler,
+            cache=cache,
+            memo=memo,
+            timeout=timeout,
+            cpu_timeout=cpu_timeout,
+            grace_period=grace_period,
+        )
+
+        self._as_arrays = as_arrays
+        self._sparse_wiberg = sparse_wiberg
+        self._use_sidecars = use_sidecars
+        self._restart_store = restart_store
 
     def check(self):
         """Checks if xtb is available on the system.
@@ -27,11 +98,24 @@ class XtbRunner(Runner):
 
         Runner.check_binary("xtb")
 
-    def run(self, parameters: list = []):
+    def run(
+        self,
+        parameters: list = [],
+        fields: list = None,
+        on_event=None,
+        watchdogs: list = None,
+    ):
         """Executes xtb with the given parameters and returns the parsed output.
 
         Arguments:
             parameters (list[str]): The parameters to append to the xtb call.
+            fields (list[str]): The names of the fields to extract from the xtb output. If None, all fields are
+             extracted.
+            on_event (callable): The function called with each StreamEvent emitted while xtb is running. If None,
+             the output is not streamed.
+            watchdogs (list[callable]): The watchdogs called with each StreamEvent. If any of them returns a reason,
+             xtb is terminated and the fields parsed from the partial output are returned together with
+             "aborted" set to True and the "abort_reason".
 
         Returns:
             dict: The parsed xtb output.
@@ -40,22 +124,290 @@ class XtbRunner(Runner):
             SubprocessError: If xtb job failed.
         """
 
-        result = Runner.run_binary(
+        scratch_directory = self._scratch_directory()
+        with scratch_directory as directory:
+            output = self._run_in_directory(
+                directory,
+                resolve_paths(split_parameters(parameters)),
+                fields=fields,
+                on_event=on_event,
+                watchdogs=watchdogs,
+            )
+
+            # the partial output of aborted jobs is kept like the output of failed jobs
+            scratch_directory.failed = bool(output.get("aborted"))
+
+        return output
+
+    def _run_in_directory(
+        self,
+        directory: str,
+        arguments: list,
+        fields: list = None,
+        on_event=None,
+        watchdogs: list = None,
+        restart_molecule: dict = None,
+    ):
+        """Executes xtb with the given arguments in the given directory and returns the parsed output.
+
+        Arguments:
+            directory (str): The path to the directory from which xtb will be launched.
+            arguments (list[str]): The arguments to pass verbatim to the xtb call.
+            fields (list[str]): The names of the fields to extract from the xtb output. If None, all fields are
+             extracted.
+            on_event (callable): The function called with each StreamEvent emitted while xtb is running. If None,
+             the output is not streamed. The fields parsed from the stream are returned as they are, only the
+             fields missing from the stream are loaded once xtb finished.
+            watchdogs (list[callable]): The watchdogs called with each StreamEvent. If any of them returns a reason,
+             xtb is terminated and the fields parsed from the partial output are returned together with
+             "aborted" set to True and the "abort_reason".
+            restart_molecule (dict): The identity and positions of the molecule used to seed the job from and to
+             store its xtbrestart file in the restart store. If None, the restart store is not used.
+
+        Returns:
+            dict: The parsed xtb output, including the Hessian, the normal modes and the gradient as NumPy arrays
+             if xtb wrote them.
+
+        Raises:
+            SubprocessError: If xtb job failed.
+        """
+
+        if self._use_sidecars and "--json" not in arguments:
+            arguments = arguments + ["--json"]
+
+        stream = None
+        if on_event is not None or watchdogs:
+            stream = XtbStreamParser(
+                callback=self._event_handler(on_event, watchdogs),
+                parser=XtbOutputParser(
+                    as_arrays=self._as_arrays, sparse_wiberg=self._sparse_wiberg
+                ),
+            )
+
+        if restart_molecule is not None:
+            self._restart_store.seed(directory, **restart_molecule)
+
+        try:
+            self._run_binary(
+                "xtb",
+                arguments,
+                working_directory=directory,
+                redirect_output=True,
+                stdout_callback=None if stream is None else stream.feed,
+            )
+        except WatchdogAbort as abort:
+            stream.close()
+
+            output_data = {
+                field: value
+                for field, value in stream.result.items()
+                if fields is None or field in fields
+            }
+            output_data["aborted"] = True
+            output_data["abort_reason"] = abort.reason
+
+            return output_data
+
+        if stream is not None:
+            stream.close()
+
+        restart_path = os.path.join(directory, "xtbrestart")
+        if restart_molecule is not None and os.path.isfile(restart_path):
+            self._restart_store.put(restart_path, **restart_molecule)
+
+        # the Hessian, the normal modes and the gradient are only available from the files written by xtb
+        output_fields = fields
+        if fields is not None:
+            output_fields = [
+                field
+                for field in fields
+                if field not in HESSIAN_FIELDS and field not in GRADIENT_FIELDS
+            ]
+
+        output_data = {}
+        if stream is not None and output_fields != []:
+            # the fields were parsed while xtb was running, only the fields missing from the stream are loaded
+            output_data = {
+                field: value
+                for field, value in stream.result.items()
+                if output_fields is None or field in output_fields
+            }
+            output_fields = [
+                field
+                for field in (stream.fields if output_fields is None else output_fields)
+                if field not in output_data
+            ]
+
+        if output_fields != [] and self._use_sidecars:
+            output_data.update(
+                XtbSidecarLoader(
+                    as_arrays=self._as_arrays, sparse_wiberg=self._sparse_wiberg
+                ).load(directory, fields=output_fields)
+            )
+        elif output_fields != []:
+            output_data.update(
+                XtbOutputParser(
+                    as_arrays=self._as_arrays, sparse_wiberg=self._sparse_wiberg
+                ).parse_file(
+                    os.path.join(directory, "xtb.stdout"), fields=output_fields
+                )
+            )
+
+        output_data.update(HessianLoader().load(directory, fields=fields))
+        output_data.update(GradientLoader().load(directory, fields=fields))
+
+        return output_data
+
+    @staticmethod
+    def _event_handler(on_event, watchdogs: list = None):
+        """Builds the stream callback passing events on to the user callback and the watchdogs of a job.
+
+        Arguments:
+            on_event (callable): The function called with each StreamEvent.
+            watchdogs (list[callable]): The watchdogs called with each StreamEvent. They are copied, such that
+             their state is not shared between jobs.
+
+        Returns:
+            callable: The stream callback raising WatchdogAbort once a watchdog returns a reason.
+        """
+
+        watchdogs = [copy.deepcopy(watchdog) for watchdog in watchdogs or []]
+        for watchdog in watchdogs:
+            if isinstance(watchdog, Watchdog):
+                watchdog.start()
+
+        aborted = False
+
+        def handle(event):
+            nonlocal aborted
+
+            if on_event is not None:
+                on_event(event)
+
+            # events of the remaining output flushed after the abort are not checked again
+            if aborted:
+                return
+
+            for watchdog in watchdogs:
+                reason = watchdog(event)
+                if reason:
+                    aborted = True
+                    raise WatchdogAbort(str(reason))
+
+        return handle
+
+    def _restart_molecule(
+        self, molecule_data: str, file_extension: str, parameters: list
+    ):
+        """Builds the identity and positions of a molecule for the restart store.
+
+        Arguments:
+            molecule_data (str): The contents of the molecule file.
+            file_extension (str): The file extension corresponding to the formatting of the molecule file.
+            parameters (list[str]): The parameters to append to the xtb call.
+
+        Returns:
+            dict: The element symbols, positions, charge and number of unpaired electrons or None if no restart
+             store is set, the molecule is not given as xyz data or restarts are disabled.
+        """
+
+        if self._restart_store is None or file_extension != "xyz":
+            return None
+
+        arguments = split_parameters(parameters)
+        if "--norestart" in arguments:
+            return None
+
+        symbols, positions = read_xyz(molecule_data)
+
+        return {
+            "symbols": symbols,
+            "positions": positions,
+            "charge": int(self._argument_value(arguments, ["--chrg", "-c"], 0)),
+            "uhf": int(self._argument_value(arguments, ["--uhf", "-u"], 0)),
+        }
+
+    @staticmethod
+    def _argument_value(arguments: list, names: list, default):
+        """Finds the value of a command line option given either as separate argument or as name=value.
+
+        Arguments:
+            arguments (list[str]): The command line arguments.
+            names (list[str]): The alternative names of the option.
+            default: The value returned if the option is not given.
+
+        Returns:
+            str: The value of the last occurrence of the option or the default.
+        """
+
+        value = default
+        for i, argument in enumerate(arguments):
+            name, _, inline_value = argument.partition("=")
+            if name not in names:
+                continue
+
+            if inline_value:
+                value = inline_value
+            elif i + 1 < len(arguments):
+                value = arguments[i + 1]
+
+        return value
+
+    def _cache_key(
+        self,
+        molecule_data: str,
+        file_extension: str,
+        parameters: list,
+        fields: list = None,
+    ):
+        """Builds the result cache key of an xtb job.
+
+        Arguments:
+            molecule_data (str): The contents of the molecule file.
+            file_extension (str): The file extension corresponding to the formatting of the molecule file.
+            parameters (list[str]): The parameters to append to the xtb call.
+            fields (list[str]): The names of the fields to extract from the xtb output. If None, all fields are
+             extracted.
+
+        Returns:
+            str: The cache key or None if no cache is set.
+        """
+
+        if self._cache is None and self._memo is None:
+            return None
+
+        return ResultCache.make_key(
             "xtb",
-            parameters,
-            working_directory=self._working_directory,
-            write_stdout=True,
-            write_stderr=False,
+            Runner.binary_version("xtb"),
+            file_extension,
+            ResultCache.normalize_molecule_data(molecule_data),
+            split_parameters(parameters),
+            None if fields is None else sorted(fields),
+            self._as_arrays,
+            self._sparse_wiberg,
+            self._use_sidecars,
         )
 
-        return XtbOutputParser().parse(result.stdout.decode("utf-8"))
-
-    def run_from_file(self, file_path: str, parameters: list = []):
+    def run_from_file(
+        self,
+        file_path: str,
+        parameters: list = [],
+        fields: list = None,
+        on_event=None,
+        watchdogs: list = None,
+    ):
         """Executes xtb with the given file and parameters and returns the parsed output.
 
         Arguments:
             file_path (str): The (relative/absolute) path to the molecule file.
             parameters (list[str]): The parameters to append to the xtb call.
+            fields (list[str]): The names of the fields to extract from the xtb output. If None, all fields are
+             extracted.
+            on_event (callable): The function called with each StreamEvent emitted while xtb is running. If None,
+             the output is not streamed.
+            watchdogs (list[callable]): The watchdogs called with each StreamEvent. If any of them returns a reason,
+             xtb is terminated and the fields parsed from the partial output are returned together with
+             "aborted" set to True and the "abort_reason".
 
         Returns:
             dict: The parsed xtb output.
@@ -70,10 +422,44 @@ class XtbRunner(Runner):
         else:
             raise FileNotFoundError("The specified file does not exist.")
 
-        return self.run([file_path] + parameters)
+        file_extension = os.path.splitext(file_path)[1].lstrip(".")
+
+        cache_key = None
+        if self._cache is not None or self._memo is not None:
+            cache_key = self._cache_key(
+                FileHandler.read_file(file_path),
+                file_extension,
+                parameters,
+                fields=fields,
+            )
+
+        restart_molecule = None
+        if self._restart_store is not None:
+            restart_molecule = self._restart_molecule(
+                FileHandler.read_file(file_path), file_extension, parameters
+            )
+
+        return self._run_job(
+            cache_key,
+            "xtb.stdout",
+            lambda directory: self._run_in_directory(
+                directory,
+                [file_path] + split_parameters(parameters),
+                fields=fields,
+                on_event=on_event,
+                watchdogs=watchdogs,
+                restart_molecule=restart_molecule,
+            ),
+        )
 
     def run_from_molecule_data(
-        self, molecule_data: str, file_extension: str, parameters: list = []
+        self,
+        molecule_data: str,
+        file_extension: str,
+        parameters: list = [],
+        fields: list = None,
+        on_event=None,
+        watchdogs: list = None,
     ):
         """Executes xtb with the given molecule data and parameters and returns the parsed output.
 
@@ -81,6 +467,13 @@ class XtbRunner(Runner):
             molecule_data (str): The contents of the molecule file.
             file_extension (str): The file extension corresponding to the formatting of the molecule file.
             parameters (list[str]): The parameters to append to the xtb call.
+            fields (list[str]): The names of the fields to extract from the xtb output. If None, all fields are
+             extracted.
+            on_event (callable): The function called with each StreamEvent emitted while xtb is running. If None,
+             the output is not streamed.
+            watchdogs (list[callable]): The watchdogs called with each StreamEvent. If any of them returns a reason,
+             xtb is terminated and the fields parsed from the partial output are returned together with
+             "aborted" set to True and the "abort_reason".
 
         Returns:
             dict: The parsed xtb output.
@@ -89,17 +482,49 @@ class XtbRunner(Runner):
             SubprocessError: If xtb job failed.
         """
 
-        file_path = os.path.join(self._working_directory, "mol." + file_extension)
-        FileHandler.write_file(file_path, molecule_data)
+        restart_molecule = self._restart_molecule(
+            molecule_data, file_extension, parameters
+        )
 
-        return self.run_from_file(file_path, parameters=parameters)
+        def run(directory):
+            file_path = os.path.join(directory, "mol." + file_extension)
+            FileHandler.write_file(file_path, molecule_data)
+
+            return self._run_in_directory(
+                directory,
+                [file_path] + split_parameters(parameters),
+                fields=fields,
+                on_event=on_event,
+                watchdogs=watchdogs,
+                restart_molecule=restart_molecule,
+            )
+
+        return self._run_job(
+            self._cache_key(molecule_data, file_extension, parameters, fields=fields),
+            "xtb.stdout",
+            run,
+        )
 
-    def run_from_xyz(self, xyz: str, parameters: list = []):
+    def run_from_xyz(
+        self,
+        xyz: str,
+        parameters: list = [],
+        fields: list = None,
+        on_event=None,
+        watchdogs: list = None,
+    ):
         """Executes xtb with the given xyz data and parameters and returns the parsed output.
 
         Arguments:
             xyz (str): The xyz formatted data of the molecule.
             parameters (list[str]): The parameters to append to the xtb call.
+            fields (list[str]): The names of the fields to extract from the xtb output. If None, all fields are
+             extracted.
+            on_event (callable): The function called with each StreamEvent emitted while xtb is running. If None,
+             the output is not streamed.
+            watchdogs (list[callable]): The watchdogs called with each StreamEvent. If any of them returns a reason,
+             xtb is terminated and the fields parsed from the partial output are returned together with
+             "aborted" set to True and the "abort_reason".
 
         Returns:
             dict: The parsed xtb output.
@@ -108,4 +533,172 @@ class XtbRunner(Runner):
             SubprocessError: If xtb job failed.
         """
 
-        return self.run_from_molecule_data(xyz, "xyz", parameters=parameters)
+        return self.run_from_molecule_data(
+            xyz,
+            "xyz",
+            parameters=parameters,
+            fields=fields,
+            on_event=on_event,
+            watchdogs=watchdogs,
+        )
+
+    def iter_batch(
+        self,
+        structures: list,
+        parameters: list = [],
+        fields: list = None,
+        watchdogs: list = None,
+        max_workers: int = None,
+        executor: Executor = None,
+        ordered: bool = True,
+    ):
+        """Executes xtb for each of the given xyz data concurrently and yields the results.
+
+        Arguments:
+            structures (list[str]): The xyz formatted data of the molecules.
+            parameters (list[str]): The parameters to append to each xtb call.
+            fields (list[str]): The names of the fields to extract from the xtb output. If None, all fields are
+             extracted.
+            watchdogs (list[callable]): The watchdogs checking the progress of each job.
+            max_workers (int): The maximum number of concurrent xtb jobs. Ignored if an executor is given.
+             Defaults to the number of jobs the scheduler can run at once if a scheduler is set.
+            executor (Executor): The executor to submit the jobs to. Defaults to a new thread pool.
+            ordered (bool): Flag indicating whether to yield results in submission order or as they complete.
+
+        Yields:
+            BatchResult: The result of each job holding either the parsed xtb output or the raised exception.
+        """
+
+        jobs = [
+            (
+                "run_from_xyz",
+                (xyz,),
+                {"parameters": parameters, "fields": fields, "watchdogs": watchdogs},
+            )
+            for xyz in structures
+        ]
+
+        return self._iter_batch(
+            jobs, max_workers=max_workers, executor=executor, ordered=ordered
+        )
+
+    def run_batch(
+        self,
+        structures: list,
+        parameters: list = [],
+        fields: list = None,
+        watchdogs: list = None,
+        max_workers: int = None,
+        executor: Executor = None,
+    ):
+        """Executes xtb for each of the given xyz data concurrently and returns the results in submission order.
+
+        Arguments:
+            structures (list[str]): The xyz formatted data of the molecules.
+            parameters (list[str]): The parameters to append to each xtb call.
+            fields (list[str]): The names of the fields to extract from the xtb output. If None, all fields are
+             extracted.
+            watchdogs (list[callable]): The watchdogs checking the progress of each job.
+            max_workers (int): The maximum number of concurrent xtb jobs. Ignored if an executor is given.
+             Defaults to the number of jobs the scheduler can run at once if a scheduler is set.
+            executor (Executor): The executor to submit the jobs to. Defaults to a new thread pool.
+
+        Returns:
+            list[BatchResult]: The results holding either the parsed xtb output or the raised exception.
+        """
+
+        return list(
+            self.iter_batch(
+                structures,
+                parameters=parameters,
+                fields=fields,
+                watchdogs=watchdogs,
+                max_workers=max_workers,
+                executor=executor,
+            )
+        )
+
+    def run_gradient_batch(
+        self,
+        structures: list,
+        parameters: list = [],
+        max_workers: int = None,
+        executor: Executor = None,
+        raise_on_error: bool = False,
+    ):
+        """Computes the energies and gradients of the given xyz data concurrently with --grad and stacks them.
+
+        The gradients of all structures are written into one preallocated array as the jobs complete. The
+        structures have to share the same number of atoms, e.g. frames of a trajectory.
+
+        Arguments:
+            structures (list[str]): The xyz formatted data of the molecules.
+            parameters (list[str]): The parameters to append to each xtb call. --grad is added if missing.
+            max_workers (int): The maximum number of concurrent xtb jobs. Ignored if an executor is given.
+             Defaults to the number of jobs the scheduler can run at once if a scheduler is set.
+            executor (Executor): The executor to submit the jobs to. Defaults to a new thread pool.
+            raise_on_error (bool): Flag indicating whether to raise if any job failed instead of marking it by NaN.
+
+        Returns:
+            ndarray: The float64 energies in Eh of shape (m,), NaN for failed jobs.
+            ndarray: The float64 gradients in Eh/bohr of shape (m, n, 3), NaN for failed jobs.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            ValueError: If the structures differ in their number of atoms.
+            BatchError: If raise_on_error is set and any job failed or wrote no gradient. Holds the exceptions of
+             the failed jobs.
+        """
+
+        if np is None:
+            raise ImportError("NumPy is required to stack the gradients.")
+
+        parameters = split_parameters(parameters)
+        if "--grad" not in parameters:
+            parameters = parameters + ["--grad"]
+
+        energies = np.full(len(structures), np.nan)
+        gradients = None
+        errors = {}
+
+        for result in self.iter_batch(
+            structures,
+            parameters=parameters,
+            fields=["energy", "gradient"],
+            max_workers=max_workers,
+            executor=executor,
+            ordered=False,
+        ):
+            if not result.succeeded:
+                errors[result.index] = result.error
+                continue
+            if "gradient" not in result.output:
+                errors[result.index] = RuntimeError(
+                    f"xtb wrote no gradient for structure {result.index}."
+                )
+                continue
+
+            gradient = result.output["gradient"]
+            if gradients is None:
+                # allocated once the number of atoms is known from the first finished job
+                gradients = np.full((len(structures),) + gradient.shape, np.nan)
+            elif gradient.shape != gradients.shape[1:]:
+                raise ValueError(
+                    f"Structure {result.index} has {gradient.shape[0]} atoms instead of {gradients.shape[1]}."
+                )
+
+            energies[result.index] = result.output["energy"]
+            gradients[result.index] = gradient
+
+        if errors and raise_on_error:
+            index = min(errors)
+            raise BatchError(
+                f"The gradient calculations of {len(errors)} of {len(structures)} structures failed, "
+                f"structure {index}: {errors[index]}",
+                errors,
+            ) from errors[index]
+
+        if gradients is None:
+            gradients = np.full((len(structures), 0, 3), np.nan)
+
+        return energies, gradients
@@ -0,0 +1,309 @@
+import os
+import json
+import math
+from array import array
+
+from .wiberg_matrix import WibergMatrix
+from .xtb_output_parser import XtbOutputParser, element_identifiers
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+AU_TO_DEBYE = 2.541746
+
+
+class XtbSidecarLoader:
+    """Class for loading xTB results from the machine-readable files written to the working directory.
+
+    The files xtbout.json (--json), charges, wbo, vibspectrum (--hess) and xtbopt.xyz (--opt) are much smaller than
+    the formatted standard output. Fields whose file is missing are parsed from xtb.stdout instead.
+    """
+
+    def __init__(self, as_arrays: bool = False, sparse_wiberg: bool = False):
+        """Constructor.
+
+        Arguments:
+            as_arrays (bool): Flag indicating whether to return array-valued fields as float64 NumPy arrays.
+            sparse_wiberg (bool): Flag indicating whether to return the Wiberg matrix as sparse WibergMatrix.
+
+        Raises:
+            ImportError: If arrays are requested but NumPy is not installed.
+        """
+
+        if as_arrays and np is None:
+            raise ImportError("NumPy is required to return arrays.")
+        self._as_arrays = as_arrays
+        self._sparse_wiberg = sparse_wiberg
+
+        self._parser = XtbOutputParser(as_arrays=as_arrays, sparse_wiberg=sparse_wiberg)
+
+        # file name and loader of each group of fields, in order of precedence
+        self._loaders = [
+            ("xtbout.json", self._load_json),
+            ("charges", self._load_charges),
+            ("wbo", self._load_wbo),
+            ("vibspectrum", self._load_vibspectrum),
+            ("xtbopt.xyz", self._load_optimized_structure),
+        ]
+
+    @property
+    def fields(self):
+        """The names of all fields the loader can return.
+
+        Returns:
+            list[str]: The field names.
+        """
+
+        return self._parser.fields
+
+    def load(
+        self, directory: str, fields: list = None, stdout_file: str = "xtb.stdout"
+    ):
+        """Loads the results of an xTB job from its working directory.
+
+        Arguments:
+            directory (str): The path to the working directory of the job.
+            fields (list[str]): The names of the fields to load. If None, all fields are loaded.
+            stdout_file (str): The name of the file holding the standard output used as fallback.
+
+        Returns:
+            dict: A dictionary containing the different outputs.
+
+        Raises:
+            ValueError: If any of the fields is unknown.
+        """
+
+        # validates the requested fields
+        self._parser._select_extractors(fields)
+
+        output_data = {}
+        for file_name, load in self._loaders:
+
+            file_path = os.path.join(directory, file_name)
+            if not os.path.isfile(file_path):
+                continue
+
+            for field, value in load(file_path).items():
+                if field not in output_data and (fields is None or field in fields):
+                    output_data[field] = value
+
+        missing_fields = [
+            field
+            for field in (self.fields if fields is None else fields)
+            if field not in output_data
+        ]
+
+        stdout_path = os.path.join(directory, stdout_file)
+        if missing_fields and os.path.isfile(stdout_path):
+            output_data.update(
+                self._parser.parse_file(stdout_path, fields=missing_fields)
+            )
+
+        return output_data
+
+    def _to_values(self, values: list):
+        """Converts a list of floats to the configured output type.
+
+        Arguments:
+            values (list[float]): The values.
+
+        Returns:
+            list[float] | ndarray: The values as list or as float64 array.
+        """
+
+        if self._as_arrays:
+            return np.array(values, dtype=np.float64)
+
+        return values
+
+    def _load_json(self, file_path: str):
+        """Loads the fields of xtbout.json.
+
+        Arguments:
+            file_path (str): The path to the file.
+
+        Returns:
+            dict: The loaded fields.
+        """
+
+        with open(file_path, "r") as file:
+            # key spelling differs between xTB versions, e.g. "HOMO-LUMO gap/eV" and "HOMO-LUMO gap / eV"
+            data = {
+                key.replace(" ", "").lower(): value
+                for key, value in json.load(file).items()
+            }
+
+        output_data = {}
+
+        if "totalenergy" in data:
+            output_data["energy"] = data["totalenergy"]
+        if "homo-lumogap/ev" in data:
+            output_data["homo_lumo_gap"] = data["homo-lumogap/ev"]
+        if "dipole" in data:
+            output_data["dipole_moment"] = (
+                math.sqrt(sum(component**2 for component in data["dipole"]))
+                * AU_TO_DEBYE
+            )
+        if "partialcharges" in data:
+            output_data["atomic_partial_charges"] = self._to_values(
+                data["partialcharges"]
+            )
+
+        energies = data.get("orbitalenergies/ev")
+        occupations = data.get("fractionaloccupation")
+        if energies and occupations:
+            occupied = [
+                i for i, occupation in enumerate(occupations) if occupation > 0.0
+            ]
+            if occupied:
+                output_data["homo_energy"] = energies[occupied[-1]]
+                if occupied[-1] + 1 < len(energies):
+                    output_data["lumo_energy"] = energies[occupied[-1] + 1]
+
+        return output_data
+
+    def _load_charges(self, file_path: str):
+        """Loads the partial charges with one value per line.
+
+        Arguments:
+            file_path (str): The path to the file.
+
+        Returns:
+            dict: The loaded fields.
+        """
+
+        with open(file_path, "r") as file:
+            charges = [float(token) for token in file.read().split()]
+
+        return {"atomic_partial_charges": self._to_values(charges)}
+
+    def _load_wbo(self, file_path: str):
+        """Loads the Wiberg bond indices given as lines of one-based atom indices and the bond index.
+
+        The file lists each bond once, the matrix is symmetrized. The number of atoms is taken from the charges
+        file if available, otherwise from the highest atom index.
+
+        Arguments:
+            file_path (str): The path to the file.
+
+        Returns:
+            dict: The loaded fields.
+        """
+
+        rows = array("l")
+        columns = array("l")
+        values = array("d")
+
+        with open(file_path, "r") as file:
+            for line in file:
+                line_split = line.split()
+                if len(line_split) != 3:
+                    continue
+
+                i, j, value = (
+                    int(line_split[0]) - 1,
+                    int(line_split[1]) - 1,
+                    float(line_split[2]),
+                )
+                rows.extend((i, j))
+                columns.extend((j, i))
+                values.extend((value, value))
+
+        charges_path = os.path.join(os.path.dirname(file_path), "charges")
+        if os.path.isfile(charges_path):
+            with open(charges_path, "r") as file:
+                n_atoms = len(file.read().split())
+        else:
+            n_atoms = max(rows, default=-1) + 1
+
+        if self._sparse_wiberg:
+            return {
+                "wiberg_index_matrix": WibergMatrix.from_triplets(
+                    n_atoms, rows, columns, values
+                )
+            }
+
+        if self._as_arrays:
+            wiberg_index_matrix = np.zeros((n_atoms, n_atoms))
+        else:
+            wiberg_index_matrix = [
+                [0.0 for _ in range(n_atoms)] for __ in range(n_atoms)
+            ]
+
+        for i, j, value in zip(rows, columns, values):
+            wiberg_index_matrix[i][j] = value
+
+        return {"wiberg_index_matrix": wiberg_index_matrix}
+
+    def _load_vibspectrum(self, file_path: str):
+        """Loads the vibrational frequencies and IR intensities of the vibspectrum file in Turbomole format.
+
+        Arguments:
+            file_path (str): The path to the file.
+
+        Returns:
+            dict: The loaded fields.
+        """
+
+        frequencies = []
+        intensities = []
+
+        with open(file_path, "r") as file:
+            for line in file:
+                if line.startswith(("$", "#")):
+                    continue
+
+                # the symmetry column is empty for translations and rotations
+                line_split = line.split()
+                if len(line_split) < 5:
+                    continue
+
+                frequencies.append(float(line_split[-4]))
+                intensities.append(float(line_split[-3]))
+
+        return {
+            "vibrational_frequencies": self._to_values(frequencies),
+            "ir_intensities": self._to_values(intensities),
+        }
+
+    def _load_optimized_structure(self, file_path: str):
+        """Loads the optimized structure of the xtbopt.xyz file.
+
+        Arguments:
+            file_path (str): The path to the file.
+
+        Returns:
+            dict: The loaded fields.
+        """
+
+        with open(file_path, "r") as file:
+            lines = file.read().split("\n")
+
+        n_atoms = int(lines[0].split()[0])
+        atom_lines = [line.split() for line in lines[2:] if line.strip()][:n_atoms]
+
+        atomic_numbers = [
+            element_identifiers.index(line_split[0].capitalize()) + 1
+            for line_split in atom_lines
+        ]
+        coordinates = [line_split[1:4] for line_split in atom_lines]
+
+        if self._as_arrays:
+            optimized_atomic_positions = np.array(coordinates, dtype=np.float64)
+        else:
+            optimized_atomic_positions = [
+                [float(token) for token in position] for position in coordinates
+            ]
+
+        optimized_xyz = "\n\n".join(
+            [str(n_atoms), "\n".join(" ".join(line_split) for line_split in atom_lines)]
+        )
+
+        return {
+            "atomic_numbers": atomic_numbers,
+            "optimized_atomic_positions": optimized_atomic_positions,
+            "optimized_xyz": optimized_xyz,
+        }
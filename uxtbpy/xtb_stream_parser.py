@@ -0,0 +1,326 @@
+import re
+import codecs
+
+from .xtb_output_parser import XtbOutputParser
+
+SCF_ITERATION = "scf_iteration"
+OPTIMIZATION_CYCLE = "optimization_cycle"
+OPTIMIZATION_CONVERGED = "optimization_converged"
+PROPERTIES = "properties"
+
+_SCF_ITERATION_LINE = re.compile(
+    r"\s*(\d+)\s+(-?\d+\.\d+)\s+(-?\d\.\d+E[+-]\d+)\s+\d\.\d+E[+-]\d+\s+-?\d+\.\d+\s+\d+\.\d+\s+[A-Z]\s*"
+)
+_CYCLE_LINE = re.compile(r"\.+ CYCLE\s+(\d+) \.+")
+_CYCLE_ENERGY_LINE = re.compile(
+    r"\s*\* total energy\s+:\s+(-?\d+\.\d+) Eh\s+change\s+(-?\d\.\d+E[+-]\d+) Eh"
+)
+_CYCLE_GRADIENT_LINE = re.compile(r"\s*gradient norm :\s+(\d+\.\d+) Eh")
+_CONVERGED_LINE = re.compile(
+    r"\s*\*+ GEOMETRY OPTIMIZATION CONVERGED AFTER (\d+) ITERATIONS \*+"
+)
+_N_ATOMS_LINE = re.compile(r"\s*number of atoms\s+:\s+(\d+)")
+
+
+class _LineTail:
+    """Class holding the most recent lines of a stream, indexed by their position in the complete output.
+
+    Lines preceding the retained tail are discarded by trim(), such that the memory usage is bounded by the
+    largest block that is still being extracted instead of growing with the output.
+    """
+
+    def __init__(self):
+        """Constructor."""
+
+        self._lines = []
+        self._first_index = 0
+
+    def append(self, line: str):
+        self._lines.append(line)
+
+    def trim(self, first_index: int):
+        """Discards the lines preceding a given index.
+
+        Arguments:
+            first_index (int): The index of the first line to retain.
+        """
+
+        n_discarded = first_index - self._first_index
+        if n_discarded > 0:
+            del self._lines[:n_discarded]
+            self._first_index = first_index
+
+    def __len__(self):
+        return self._first_index + len(self._lines)
+
+    def __getitem__(self, index):
+
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if index < self._first_index:
+            raise IndexError("line was discarded")
+
+        return self._lines[index - self._first_index]
+
+
+class StreamEvent:
+    """Class holding a single event emitted while streaming xTB output."""
+
+    def __init__(self, kind: str, data: dict):
+        """Constructor.
+
+        Arguments:
+            kind (str): The kind of the event. One of "scf_iteration", "optimization_cycle",
+             "optimization_converged" and "properties".
+            data (dict): The data of the event.
+        """
+
+        self.kind = kind
+        self.data = data
+
+    def __repr__(self):
+        return f"StreamEvent({self.kind}, {self.data})"
+
+
+class XtbStreamParser:
+    """Class for incrementally parsing xTB output while it is being written.
+
+    Chunks of output are pushed with feed(). Complete lines are scanned for SCF iterations, optimization cycles and
+    the keywords of the extractors of XtbOutputParser, the latter with a single pattern matching all keywords.
+    Property blocks are extracted as soon as they are printed completely. Only the lines of blocks that are not
+    extracted yet and the lines within the largest extractor offset are retained.
+    """
+
+    def __init__(self, callback=None, parser: XtbOutputParser = None):
+        """Constructor.
+
+        Arguments:
+            callback (callable): The function called with each emitted StreamEvent.
+            parser (XtbOutputParser): The parser providing the property extractors. Defaults to a new parser.
+             Extractors registered after the construction of the stream parser are ignored.
+        """
+
+        self._callback = callback
+        self._parser = parser if parser is not None else XtbOutputParser()
+        self._parser.lines = _LineTail()
+        self._parser.n_atoms = None
+
+        self._extractors = list(self._parser._extractors)
+        self._keyword_pattern = re.compile(
+            "|".join(
+                re.escape(keyword)
+                for keyword in dict.fromkeys(
+                    extractor[0] for extractor in self._extractors
+                )
+            )
+        )
+        self._max_offset = max(
+            (extractor[3] for extractor in self._extractors), default=0
+        )
+
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._partial_line = ""
+        self._pending = []
+        self._cycle = None
+        self._cycle_energy = None
+
+        self.result = {}
+
+    @property
+    def fields(self):
+        """The names of all fields the stream parser can extract.
+
+        Returns:
+            list[str]: The field names.
+        """
+
+        return self._parser.fields
+
+    @property
+    def lines(self):
+        """The retained tail of the complete lines received so far, indexed by their position in the output.
+
+        Returns:
+            Sequence[str]: The lines. Accessing a discarded line raises an IndexError.
+        """
+
+        return self._parser.lines
+
+    def feed(self, chunk):
+        """Consumes a chunk of output.
+
+        Arguments:
+            chunk (bytes | str): The chunk of output.
+
+        Returns:
+            list[StreamEvent]: The events emitted for the complete lines of the chunk.
+        """
+
+        if isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk)
+
+        lines = (self._partial_line + chunk).split("\n")
+        self._partial_line = lines.pop()
+
+        return self._process(lines)
+
+    def close(self):
+        """Consumes the remaining incomplete line and extracts the remaining complete property blocks.
+
+        Returns:
+            list[StreamEvent]: The events emitted for the remaining output.
+        """
+
+        remaining = self._partial_line + self._decoder.decode(b"", final=True)
+        self._partial_line = ""
+
+        # terminating empty line, equivalent to splitting the complete output
+        events = self._process([remaining, ""] if remaining else [""])
+        self._pending = []
+
+        return events
+
+    def _process(self, lines: list):
+        """Scans new complete lines and extracts the property blocks that have become complete.
+
+        Arguments:
+            lines (list[str]): The new complete lines.
+
+        Returns:
+            list[StreamEvent]: The emitted events.
+        """
+
+        events = []
+
+        for line in lines:
+
+            line_index = len(self._parser.lines)
+            self._parser.lines.append(line)
+
+            event = self._scan_progress(line)
+            if event is not None:
+                events.append(event)
+
+            if self._keyword_pattern.search(line) is None:
+                continue
+
+            for extractor in self._extractors:
+                keyword, condition = extractor[0], extractor[4]
+                if keyword in line and (condition is None or condition(line)):
+                    self._pending.append((line_index, extractor))
+
+        if self._pending:
+            events.extend(self._extract_pending())
+
+        self._parser.lines.trim(
+            min(
+                [line_index for line_index, _ in self._pending]
+                + [len(self._parser.lines) - self._max_offset - 1]
+            )
+        )
+
+        if self._callback is not None:
+            for event in events:
+                self._callback(event)
+
+        return events
+
+    def _scan_progress(self, line: str):
+        """Checks a line for SCF iterations, optimization cycles and the number of atoms.
+
+        Arguments:
+            line (str): The line.
+
+        Returns:
+            StreamEvent: The emitted event or None.
+        """
+
+        # indentation and trailing whitespace differ between xtb versions
+        line = line.strip()
+
+        match = _SCF_ITERATION_LINE.fullmatch(line)
+        if match is not None:
+            return StreamEvent(
+                SCF_ITERATION,
+                {
+                    "iteration": int(match.group(1)),
+                    "energy": float(match.group(2)),
+                    "energy_change": float(match.group(3)),
+                    "optimization_cycle": self._cycle,
+                },
+            )
+
+        match = _CYCLE_LINE.fullmatch(line)
+        if match is not None:
+            self._cycle = int(match.group(1))
+            return None
+
+        match = _CYCLE_ENERGY_LINE.match(line)
+        if match is not None:
+            self._cycle_energy = (float(match.group(1)), float(match.group(2)))
+            return None
+
+        match = _CYCLE_GRADIENT_LINE.match(line)
+        if match is not None and self._cycle_energy is not None:
+            energy, energy_change = self._cycle_energy
+            self._cycle_energy = None
+            return StreamEvent(
+                OPTIMIZATION_CYCLE,
+                {
+                    "cycle": self._cycle,
+                    "energy": energy,
+                    "energy_change": energy_change,
+                    "gradient_norm": float(match.group(1)),
+                },
+            )
+
+        match = _CONVERGED_LINE.fullmatch(line)
+        if match is not None:
+            self._cycle = None
+            return StreamEvent(OPTIMIZATION_CONVERGED, {"cycles": int(match.group(1))})
+
+        match = _N_ATOMS_LINE.match(line)
+        if match is not None and self._parser.n_atoms is None:
+            self._parser.n_atoms = int(match.group(1))
+
+        return None
+
+    def _extract_pending(self):
+        """Evaluates the pending extractors whose blocks have been printed completely.
+
+        Extractors running past the lines received so far raise an IndexError and are retried with the next chunk.
+
+        Returns:
+            list[StreamEvent]: The emitted events.
+        """
+
+        events = []
+        pending = []
+
+        for line_index, extractor in self._pending:
+
+            _, fields, extract, offset, _ = extractor
+
+            if self._parser.n_atoms is None:
+                pending.append((line_index, extractor))
+                continue
+
+            try:
+                values = extract(line_index + offset)
+            except IndexError:
+                pending.append((line_index, extractor))
+                continue
+
+            if len(fields) == 1:
+                values = (values,)
+
+            data = dict(zip(fields, values))
+            self.result.update(data)
+            events.append(StreamEvent(PROPERTIES, data))
+
+        self._pending = pending
+
+        return events